@@ -0,0 +1,117 @@
+"""
+Incremental import of Discord's audit log into the case store.
+Kicks, bans, unbans and timeouts taken outside the bot (by hand in the client
+or by another bot) are read from each guild's audit log every ``interval``
+seconds, starting after the last entry imported, so a pass only fetches what
+is new. The cursor is stored with the cases it covers in one transaction, so a
+restart neither imports an entry twice nor skips one.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = {
+    discord.AuditLogAction.kick: 'kick',
+    discord.AuditLogAction.ban: 'ban',
+    discord.AuditLogAction.unban: 'unban',
+}
+_MISSING = object()
+
+
+def to_case(entry):
+    """``(user_id, moderator_id, action, reason, duration, created_at)`` for a moderation entry, or None."""
+    if entry.target is None or entry.user_id is None:
+        return None
+    action = ACTIONS.get(entry.action)
+    duration = None
+    if entry.action is discord.AuditLogAction.member_update:
+        # Timeouts are member updates that change timed_out_until
+        until = getattr(entry.after, 'timed_out_until', _MISSING)
+        if until is _MISSING:
+            return None
+        if until is None:
+            action = 'untimeout'
+        else:
+            action = 'timeout'
+            duration = max(0, int((until - entry.created_at).total_seconds()))
+    if action is None:
+        return None
+    return entry.target.id, entry.user_id, action, entry.reason, duration, entry.created_at.timestamp()
+
+
+class AuditLogSync:
+    """Background task importing each guild's new audit log entries as cases.
+
+    The bot's own actions are skipped, since the commands already recorded
+    them. A guild's first pass starts ``backfill_days`` back rather than at the
+    beginning of its audit log.
+    """
+
+    def __init__(self, bot, case_store, interval=900, backfill_days=30, batch_size=100):
+        self.bot = bot
+        self.case_store = case_store
+        self.interval = interval
+        self.backfill_days = backfill_days
+        self.batch_size = batch_size
+        self.imported = 0
+        self._task = None
+
+    def start(self):
+        """Start the sync loop (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        while True:
+            imported = 0
+            for guild in list(self.bot.guilds):
+                try:
+                    imported += await self.sync_guild(guild)
+                except (discord.HTTPException, sqlite3.Error) as e:
+                    logger.warning(f"Audit log sync failed for {guild.name}: {e}")
+                except Exception as e:
+                    # Anything else (a dropped connection, an unexpected entry) must not end the loop
+                    logger.error(f"Audit log sync error for {guild.name}: {e}")
+            if imported:
+                logger.info(f"Imported {imported} moderation actions from audit logs")
+            await asyncio.sleep(self.interval)
+
+    async def sync_guild(self, guild) -> int:
+        """Import a guild's entries since its cursor; returns the number of cases added."""
+        if guild.me is None or not guild.me.guild_permissions.view_audit_log:
+            return 0
+        cursor = await self.case_store.audit_cursor(guild.id)
+        if cursor is None:
+            cursor = discord.utils.time_snowflake(datetime.now(timezone.utc) - timedelta(days=self.backfill_days))
+
+        rows = []
+        seen = 0
+        imported = 0
+        async for entry in guild.audit_logs(limit=None, after=discord.Object(id=cursor), oldest_first=True):
+            last = entry.id
+            seen += 1
+            if entry.user_id != self.bot.user.id:
+                case = to_case(entry)
+                if case is not None:
+                    rows.append(case)
+            # The cursor also moves past entries that are not moderation actions
+            if seen >= self.batch_size:
+                await self.case_store.record_audit(guild.id, rows, last)
+                imported += len(rows)
+                rows = []
+                seen = 0
+        if seen:
+            await self.case_store.record_audit(guild.id, rows, last)
+            imported += len(rows)
+        self.imported += imported
+        return imported
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
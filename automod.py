@@ -0,0 +1,158 @@
+"""
+Word filter for auto-moderation.
+Each guild's banned terms are compiled into one Aho-Corasick automaton so a
+message is scanned in time linear in its length, however many terms exist.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Common character substitutions used to dodge filters
+LEET_TABLE = str.maketrans({
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '9': 'g',
+    '@': 'a', '$': 's', '€': 'e',
+})
+
+ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u2060\ufeff\u00ad'))
+
+
+def normalize(text: str) -> str:
+    """Fold case, strip accents and zero-width characters and undo leetspeak."""
+    if text.isascii():
+        return text.lower().translate(LEET_TABLE)
+    text = unicodedata.normalize('NFKD', text.translate(ZERO_WIDTH))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return text.casefold().translate(LEET_TABLE)
+
+
+class WordFilter:
+    """Aho-Corasick automaton over a set of normalised terms."""
+
+    __slots__ = ('terms', 'whole_words', '_goto', '_fail', '_out')
+
+    def __init__(self, terms, whole_words=True):
+        self.terms = sorted({normalize(term).strip() for term in terms if term.strip()})
+        self.whole_words = whole_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for term in self.terms:
+            self._insert(term)
+        self._link()
+
+    def _insert(self, term):
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (len(term),)
+
+    def _link(self):
+        """Breadth-first pass computing failure links and merged outputs."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str):
+        """Return the first banned term found in ``text``, or None."""
+        if not self.terms:
+            return None
+        text = normalize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length in out[state]:
+                start = end - length
+                if not self.whole_words or self._is_word(text, start, end):
+                    return text[start:end]
+        return None
+
+    @staticmethod
+    def _is_word(text, start, end):
+        return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+class WordFilterStore:
+    """Per-guild banned-term lists persisted to JSON, with compiled filters cached.
+
+    A guild's automaton is rebuilt lazily on the first message after its list
+    changes; other guilds keep their cached filters.
+    """
+
+    def __init__(self, path, whole_words=True):
+        self.path = path
+        self.whole_words = whole_words
+        self._terms = {}
+        self._compiled = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._terms = {int(guild_id): set(terms) for guild_id, terms in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load word filter terms from {self.path}: {e}")
+
+    def _dump(self, snapshot):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+
+    async def _save(self):
+        snapshot = {str(guild_id): sorted(terms) for guild_id, terms in self._terms.items()}
+        await asyncio.get_running_loop().run_in_executor(None, self._dump, snapshot)
+
+    def terms(self, guild_id) -> list:
+        return sorted(self._terms.get(guild_id, ()))
+
+    def get(self, guild_id):
+        """Return the compiled filter for a guild, building it if needed."""
+        compiled = self._compiled.get(guild_id)
+        if compiled is None:
+            compiled = WordFilter(self._terms.get(guild_id, ()), self.whole_words)
+            self._compiled[guild_id] = compiled
+        return compiled
+
+    async def add(self, guild_id, terms) -> int:
+        """Add terms to a guild's list and return how many were new."""
+        current = self._terms.setdefault(guild_id, set())
+        before = len(current)
+        current.update(term.strip() for term in terms if term.strip())
+        added = len(current) - before
+        if added:
+            self._compiled.pop(guild_id, None)
+            await self._save()
+        return added
+
+    async def remove(self, guild_id, terms) -> int:
+        """Remove terms from a guild's list and return how many were removed."""
+        current = self._terms.get(guild_id, set())
+        before = len(current)
+        current.difference_update(term.strip() for term in terms)
+        removed = before - len(current)
+        if removed:
+            self._compiled.pop(guild_id, None)
+            await self._save()
+        return removed
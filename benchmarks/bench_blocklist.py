@@ -0,0 +1,100 @@
+"""
+Link blocklist benchmark.
+Builds a blocklist from a synthetic list of domains, then measures the
+conversion time, file size, how long opening the mapped file takes compared
+with loading the same list into a Python set, lookups per second and
+messages scanned per second.
+
+Usage: python benchmarks/bench_blocklist.py [domains] [lookups]
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import blocklist  # noqa: E402
+
+TLDS = ('com', 'net', 'org', 'xyz', 'gift', 'ru', 'io', 'co.uk')
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def domain(rng, i):
+    return f"{rng.choice(('free', 'nitro', 'steam', 'login', 'gift', 'claim'))}-{i:x}.{rng.choice(TLDS)}"
+
+
+def rate(count, elapsed):
+    return f"{count / elapsed:,.0f}/s"
+
+
+def main(domains=2_000_000, lookups=500_000):
+    rng = random.Random(1)
+    scratch = tempfile.mkdtemp(prefix='blocklist-')
+    source = os.path.join(scratch, 'domains.txt')
+    output = os.path.join(scratch, 'blocklist.bin')
+    blocked = [domain(rng, i) for i in range(domains)]
+    with open(source, 'w') as f:
+        f.write('\n'.join(blocked))
+    size_txt = os.path.getsize(source)
+
+    start = time.perf_counter()
+    blocklist.build([source], output)
+    build_s = time.perf_counter() - start
+
+    before = rss_mb()
+    start = time.perf_counter()
+    mapped = blocklist.Blocklist(output)
+    open_ms = (time.perf_counter() - start) * 1000
+    open_mb = rss_mb() - before
+
+    hits = rng.sample(blocked, min(lookups, domains))
+    misses = [f"safe-{i}.example{i % 97}.com" for i in range(lookups)]
+    start = time.perf_counter()
+    found = sum(1 for d in hits if d in mapped)
+    hit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    false_hits = sum(1 for d in misses if d in mapped)
+    miss_s = time.perf_counter() - start
+
+    messages = [
+        "gg everyone, see you tomorrow",
+        "check https://github.com/Rapptz/discord.py/issues/1 and docs.python.org",
+        f"FREE NITRO https://cdn.{hits[0]}/claim?id=1",
+        "lol that's so true",
+    ] * 25_000
+    start = time.perf_counter()
+    flagged = sum(1 for m in messages if mapped.find(m) is not None)
+    scan_s = time.perf_counter() - start
+
+    # The alternative: read the text list into a set at startup
+    before = rss_mb()
+    start = time.perf_counter()
+    with open(source) as f:
+        as_set = {line.strip() for line in f}
+    set_ms = (time.perf_counter() - start) * 1000
+    set_mb = rss_mb() - before
+    del as_set
+    mapped.close()
+
+    print(f"{domains:,} domains: text {size_txt / 1e6:.1f} MB -> blocklist {os.path.getsize(output) / 1e6:.1f} MB "
+          f"in {build_s:.1f}s")
+    print(f"open (mmap):     {open_ms:8.2f} ms, {open_mb:6.1f} MB resident")
+    print(f"open (set):      {set_ms:8.2f} ms, {set_mb:6.1f} MB resident")
+    print(f"lookups (hit):   {rate(len(hits), hit_s)} ({found}/{len(hits)} found)")
+    print(f"lookups (miss):  {rate(len(misses), miss_s)} ({false_hits} false positives)")
+    print(f"messages:        {rate(len(messages), scan_s)} ({flagged} flagged)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
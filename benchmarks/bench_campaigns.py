@@ -0,0 +1,100 @@
+"""
+Spam campaign detector benchmark.
+Fills a guild's index with ordinary chatter, then measures fingerprinting and
+banded lookups against a linear scan of the same window, the memory one
+guild's index takes, how many edited copies of a spam message are found
+(recall) and how often unrelated messages match (false positives).
+
+Usage: python benchmarks/bench_campaigns.py [window] [lookups]
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from campaigns import CampaignDetector, distance, normalize, simhash  # noqa: E402
+from config import Config  # noqa: E402
+
+# A few thousand made-up words stand in for a server's vocabulary
+_SYLLABLES = [c + v for c in 'bcdfghjklmnprstvwz' for v in 'aeiou']
+WORDS = [''.join(random.Random(i).choices(_SYLLABLES, k=1 + i % 3)) for i in range(3000)]
+SPAM = ("FREE NITRO for everyone!! Steam gift giveaway, claim before it expires: "
+        "https://dlscord-gift.com/claim?c={code} {tail}")
+
+
+# Zipf's law: the n-th most common word turns up about 1/n as often as the first
+_CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+
+
+def chatter(rng):
+    return ' '.join(rng.choices(WORDS, cum_weights=_CUM_WEIGHTS, k=rng.randrange(6, 14)))
+
+
+def spam_copy(rng):
+    """A copy with a new code, a random trailing word and sometimes a swapped or shouted word."""
+    text = SPAM.format(code=rng.randrange(10 ** 8), tail=rng.choice(['', 'hurry', 'lol', 'legit', '100%']))
+    words = text.split()
+    if rng.random() < 0.3:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    text = ' '.join(words)
+    return text.upper() if rng.random() < 0.3 else text
+
+
+def rate(count, elapsed):
+    return f"{count / elapsed:,.0f}/s"
+
+
+def main(window=Config.CAMPAIGN_WINDOW, lookups=20_000):
+    rng = random.Random(21)
+    # accounts is unreachable so nothing is ever claimed and every lookup sees a full window
+    detector = CampaignDetector(accounts=10 ** 9, seconds=10 ** 9, max_distance=Config.CAMPAIGN_MAX_DISTANCE,
+                                min_length=0, window=window)
+    texts = [normalize(chatter(rng)) for _ in range(window)]
+    fingerprints = [simhash(text) for text in texts]
+
+    tracemalloc.start()
+    for i, text in enumerate(texts):
+        detector.check(1, 1, i, i, text, now=0.0)
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    queries = [normalize(spam_copy(rng) if i % 2 else chatter(rng)) for i in range(lookups)]
+    start = time.perf_counter()
+    query_prints = [simhash(text) for text in queries]
+    hash_s = time.perf_counter() - start
+
+    state = detector._guilds[1]
+    start = time.perf_counter()
+    banded = [len(detector._matches(state, fingerprint, 0.0)) for fingerprint in query_prints]
+    banded_s = time.perf_counter() - start
+    start = time.perf_counter()
+    linear = [sum(1 for other in fingerprints if distance(other, fingerprint) <= detector.max_distance)
+              for fingerprint in query_prints]
+    linear_s = time.perf_counter() - start
+
+    # Recall: pairs of spam copies that match; false positives: chatter pairs that match
+    copies = [simhash(normalize(spam_copy(rng))) for _ in range(300)]
+    copy_pairs = [(a, b) for i, a in enumerate(copies) for b in copies[i + 1:]]
+    recall = sum(1 for a, b in copy_pairs if distance(a, b) <= detector.max_distance) / len(copy_pairs)
+    unrelated = fingerprints[:1000]
+    unrelated_pairs = [(a, b) for i, a in enumerate(unrelated) for b in unrelated[i + 1:]]
+    false_positives = sum(1 for a, b in unrelated_pairs if distance(a, b) <= detector.max_distance)
+
+    print(f"window {window:,} messages, max distance {detector.max_distance} "
+          f"({len(detector.band_layout)} bands), index {index_bytes / 1024:.0f} KiB "
+          f"({index_bytes / window:.0f} bytes/message)")
+    print(f"fingerprint:     {rate(lookups, hash_s)} ({hash_s / lookups * 1e6:.1f} us each)")
+    print(f"lookup (banded): {rate(lookups, banded_s)}")
+    print(f"lookup (linear): {rate(lookups, linear_s)}")
+    print(f"same matches:    {banded == linear}")
+    print(f"copy pairs matched:      {recall:.1%} of {len(copy_pairs):,}")
+    print(f"unrelated pairs matched: {false_positives} of {len(unrelated_pairs):,}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
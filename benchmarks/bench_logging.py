@@ -0,0 +1,90 @@
+"""
+Logging call overhead benchmark.
+Measures how long a logger.info call spends in the calling thread (the event
+loop, in the bot) with a direct FileHandler versus the queue pipeline, on a
+normal disk and on a disk that stalls for a few milliseconds per write. The
+queued runs also report records dropped because the queue filled up.
+
+Usage: python benchmarks/bench_logging.py [calls] [rate]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+import log_setup  # noqa: E402
+
+STALL_SECONDS = 0.002
+
+
+class StallingFileHandler(logging.FileHandler):
+    """FileHandler that simulates a slow or contended disk."""
+
+    def emit(self, record):
+        time.sleep(STALL_SECONDS)
+        super().emit(record)
+
+
+def measure(logger, calls, rate):
+    """Log ``calls`` records at roughly ``rate`` per second and return per-call percentiles in us."""
+    samples = []
+    interval = 1.0 / rate
+    next_call = time.perf_counter()
+    for i in range(calls):
+        # Sleep between calls like an idle event loop, which releases the GIL to the listener
+        delay = next_call - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        next_call += interval
+        start = time.perf_counter_ns()
+        logger.info(f"user#{i} banned member#{i}", extra={'guild': 1, 'command': 'ban', 'latency_ms': 12.5})
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    return samples[len(samples) // 2] / 1000, samples[int(len(samples) * 0.99)] / 1000, samples[-1] / 1000
+
+
+def report(name, result, dropped=None):
+    p50, p99, worst = result
+    print(f"{name:<28} p50 {p50:8.2f}us  p99 {p99:8.2f}us  max {worst:9.0f}us"
+          + (f"  dropped {dropped}" if dropped is not None else ""))
+
+
+def run(calls=5000, rate=1000):
+    directory = tempfile.mkdtemp()
+    logger = logging.getLogger('bench')
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter(log_setup.TEXT_FORMAT)
+
+    for name, handler_class in (('direct, normal disk', logging.FileHandler),
+                                ('direct, stalling disk', StallingFileHandler)):
+        handler = handler_class(os.path.join(directory, 'direct.log'))
+        handler.setFormatter(formatter)
+        logger.handlers = [handler]
+        logger.propagate = False
+        report(name, measure(logger, min(calls, 1000) if handler_class is StallingFileHandler else calls, rate))
+        handler.close()
+
+    logger.handlers = []
+    logger.propagate = True
+    Config.LOG_FILE = os.path.join(directory, 'queued.log')
+    Config.LOG_JSON = True
+    for name, handler_class in (('queued, normal disk', logging.FileHandler),
+                                ('queued, stalling disk', StallingFileHandler)):
+        listener = log_setup.setup_logging()
+        # Swap in the benchmark handler and drop the console output
+        handler = handler_class(Config.LOG_FILE)
+        handler.setFormatter(log_setup.JsonFormatter())
+        listener.handlers = (handler,)
+        result = measure(logger, calls, rate)
+        report(name, result, log_setup.dropped_records())
+        log_setup.shutdown_logging()
+        handler.close()
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:]))
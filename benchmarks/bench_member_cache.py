@@ -0,0 +1,152 @@
+"""
+Member cache policy benchmark.
+Feeds synthetic GUILD_MEMBERS_CHUNK payloads through discord.py's real
+connection state for each cache policy and reports the time spent building
+member objects and the memory they retain. Each mode runs in a fresh process.
+Network time for chunking (one chunk of 1000 members per gateway message) is
+not included and comes on top of the parse time.
+
+Usage: python benchmarks/bench_member_cache.py [guilds] [members_per_guild]
+"""
+
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+from discord.state import ChunkRequest  # noqa: E402
+
+from config import Config  # noqa: E402
+from members import MemberCache, cache_flags  # noqa: E402
+
+CHUNK_SIZE = 1000
+ACTIVE_GUILD_SHARE = 0.1  # Share of guilds that see a command (and so get chunked) in lazy mode
+
+# mode -> (MEMBER_CACHE_FLAGS, MEMBER_CHUNKING)
+MODES = {
+    'startup': ('all', 'startup'),
+    'lazy': ('all', 'lazy'),
+    'off': ('none', 'off'),
+}
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def guild_payload(guild_id, members):
+    return {
+        'id': str(guild_id), 'name': f'guild{guild_id}', 'owner_id': '1', 'member_count': members,
+        'roles': [{'id': str(guild_id), 'name': '@everyone', 'position': 0, 'permissions': '0', 'color': 0,
+                   'hoist': False, 'managed': False, 'mentionable': False}]
+                 + [{'id': str(guild_id * 100 + i), 'name': f'role{i}', 'position': i, 'permissions': '0', 'color': 0,
+                     'hoist': False, 'managed': False, 'mentionable': False} for i in range(1, 20)],
+        'channels': [], 'emojis': [], 'stickers': [], 'features': [], 'members': [], 'presences': [],
+        'voice_states': [], 'threads': [], 'large': True, 'premium_tier': 0,
+    }
+
+
+def member_payloads(guild_id, start, count):
+    return [{
+        'user': {'id': str(guild_id * 10 ** 8 + i), 'username': f'user{i}', 'discriminator': '0',
+                 'global_name': f'User {i}', 'avatar': None},
+        'roles': [str(guild_id * 100 + 1 + i % 19)],
+        'joined_at': '2024-01-01T00:00:00+00:00', 'deaf': False, 'mute': False, 'flags': 0,
+    } for i in range(start, start + count)]
+
+
+def chunk(state, guild, members):
+    """Deliver a full guild chunk sequence the way the gateway would."""
+    request = ChunkRequest(guild.id, 0, state.loop, state._get_guild, cache=True)
+    state._chunk_requests[guild.id] = request
+    count = -(-members // CHUNK_SIZE)
+    for index in range(count):
+        state.parse_guild_members_chunk({
+            'guild_id': str(guild.id), 'chunk_index': index, 'chunk_count': count, 'nonce': request.nonce,
+            'members': member_payloads(guild.id, index * CHUNK_SIZE, min(CHUNK_SIZE, members - index * CHUNK_SIZE)),
+        })
+
+
+async def run_mode(mode, guilds, members):
+    flags, chunking = MODES[mode]
+    intents = discord.Intents.default()
+    intents.members = True
+    client = discord.Client(intents=intents, member_cache_flags=cache_flags(flags),
+                            chunk_guilds_at_startup=chunking == 'startup')
+    state = client._connection
+    state.loop = asyncio.get_running_loop()
+    cache = MemberCache(client, chunking, Config.MEMBER_LRU_SIZE, Config.MEMBER_LRU_TTL)
+
+    all_guilds = []
+    for i in range(guilds):
+        guild = discord.Guild(data=guild_payload(i + 1, members), state=state)
+        state._add_guild(guild)
+        all_guilds.append(guild)
+
+    gc.collect()
+    before = rss_mb()
+    start = time.perf_counter()
+    if chunking == 'startup':
+        to_chunk = all_guilds
+    elif chunking == 'lazy':
+        to_chunk = all_guilds[:max(1, int(guilds * ACTIVE_GUILD_SHARE))]
+    else:
+        to_chunk = []
+    for guild in to_chunk:
+        chunk(state, guild, members)
+
+    if chunking == 'off':
+        # Members resolved on demand fill the LRU up to its bound
+        per_guild = -(-cache.size // guilds)
+        for guild in all_guilds:
+            for data in member_payloads(guild.id, 0, min(per_guild, members)):
+                cache.remember(discord.Member(data=data, guild=guild, state=state))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+
+    return {
+        'mode': mode,
+        'member_cache_flags': flags,
+        'chunking': chunking,
+        'guilds_chunked': len(to_chunk),
+        'cached_members': sum(len(g.members) for g in all_guilds),
+        'lru_members': len(cache),
+        'build_s': round(elapsed, 3),
+        'retained_mb': round(rss_mb() - before, 1),
+    }
+
+
+def main(guilds=20, members=50_000):
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode, str(guilds), str(members)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{guilds} guilds x {members} members, LRU size {Config.MEMBER_LRU_SIZE}")
+    print(f"{'mode':<8} {'flags':<5} {'chunked':>7} {'cached':>10} {'lru':>7} {'build s':>8} {'MB':>8}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['member_cache_flags']:<5} {r['guilds_chunked']:>7} {r['cached_members']:>10} "
+              f"{r['lru_members']:>7} {r['build_s']:>8} {r['retained_mb']:>8}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == '--mode':
+        mode, guilds, members = args[1], int(args[2]), int(args[3])
+        print(json.dumps(asyncio.run(run_mode(mode, guilds, members))))
+    else:
+        main(*(int(a) for a in args))
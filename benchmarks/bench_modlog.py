@@ -0,0 +1,83 @@
+"""
+Mod-log dispatcher benchmark.
+Logs a raid's worth of ban entries to one mod-log channel, once with a message
+per entry and once through the batching dispatcher, against a fake channel
+limited to 5 messages per ``window`` seconds (Discord allows 5 per 5s; the
+window is shortened so the run finishes quickly). Reports API calls and how
+long the channel takes to catch up.
+
+Usage: python benchmarks/bench_modlog.py [entries] [window]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config  # noqa: E402
+from fakes import FakeGuild, FakeRest  # noqa: E402
+from modlog import ModLogDispatcher, ModLogStore, action_embed  # noqa: E402
+
+
+class FakeBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == self.channel.id else None
+
+
+def fixture(window):
+    rest = FakeRest(latency=0.05, jitter=0.01, bucket_size=5, bucket_window=window)
+    guild = FakeGuild(1, rest, channels=1)
+    return rest, guild, guild.text_channels[0]
+
+
+def entries(guild, count):
+    return [action_embed("🔨 Member Banned", 10 ** 12 + i, guild.moderator, "Raid", Config.COLORS['ERROR'],
+                         "**Via:** /massban") for i in range(count)]
+
+
+async def per_entry(count, window):
+    rest, guild, channel = fixture(window)
+    start = time.perf_counter()
+    for embed in entries(guild, count):
+        await channel.send(embed=embed)
+    return sum(rest.calls.values()), time.perf_counter() - start
+
+
+async def batched(count, window):
+    rest, guild, channel = fixture(window)
+    store = ModLogStore(os.path.join(tempfile.mkdtemp(prefix='modlog-'), 'modlog.json'))
+    await store.set(guild.id, channel.id)
+    dispatcher = ModLogDispatcher(FakeBot(channel), store, flush_interval=Config.MODLOG_FLUSH_INTERVAL,
+                                  max_queue=Config.MODLOG_MAX_QUEUE, max_wait=Config.MODLOG_MAX_WAIT)
+    start = time.perf_counter()
+    for embed in entries(guild, count):
+        await dispatcher.log(guild.id, embed)
+    enqueued = time.perf_counter() - start
+    while dispatcher.queued() or dispatcher.sent_embeds + dispatcher.failed < count:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    await dispatcher.close()
+    return sum(rest.calls.values()), elapsed, enqueued, dispatcher
+
+
+async def run(count=500, window=0.5):
+    calls, elapsed = await per_entry(count, window)
+    print(f"{count} entries, channel limit 5 messages per {window}s")
+    print(f"per entry:  {calls:>4} API calls, {elapsed:6.2f}s until the channel caught up")
+    calls, elapsed, enqueued, dispatcher = await batched(count, window)
+    print(f"batched:    {calls:>4} API calls, {elapsed:6.2f}s until the channel caught up "
+          f"(callers done after {enqueued * 1000:.1f}ms, {dispatcher.dropped} dropped)")
+    print(f"            {dispatcher.sent_embeds / max(1, dispatcher.sent_messages):.1f} embeds per message")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(int(args[0]) if args else 500, float(args[1]) if len(args) > 1 else 0.5))
@@ -0,0 +1,120 @@
+"""
+Message snapshot benchmark.
+Compares the memory one cached message takes in discord.py's message cache
+(a full ``discord.Message`` parsed from a gateway payload) with a snapshot in
+the audit log's SnapshotCache, for text-only messages and ones with an
+attachment, and measures the cache's add and pop rates. Memory is measured
+with tracemalloc and set against the cache's own per-snapshot estimate.
+
+Usage: python benchmarks/bench_snapshots.py [messages]
+"""
+
+import asyncio
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+from discord.http import HTTPClient  # noqa: E402
+from discord.state import ConnectionState  # noqa: E402
+
+from snapshots import MessageSnapshot, SnapshotCache  # noqa: E402
+
+GUILD_ID = 1
+CHANNEL_ID = 2
+AUTHORS = 500
+WORDS = ['game', 'server', 'tonight', 'stream', 'patch', 'build', 'ranked', 'match', 'lobby', 'update',
+         'anyone', 'playing', 'weekend', 'event', 'music', 'boss', 'loot', 'quest', 'coffee', 'movie']
+
+
+def payloads(count, attachments, seed=22):
+    """MESSAGE_CREATE payloads as the gateway sends them."""
+    rng = random.Random(seed)
+    first = discord.utils.time_snowflake(datetime.now(timezone.utc)) - count
+    for i in range(count):
+        message_id = str(first + i)
+        author = AUTHORS * 10 ** 12 + i % AUTHORS
+        yield {
+            'id': message_id, 'channel_id': str(CHANNEL_ID), 'guild_id': str(GUILD_ID), 'type': 0,
+            'content': ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(4, 20))),
+            'author': {'id': str(author), 'username': f'user{author}', 'discriminator': '0', 'avatar': None},
+            'member': {'roles': [], 'joined_at': '2024-01-01T00:00:00+00:00', 'deaf': False, 'mute': False},
+            'attachments': [{
+                'id': message_id, 'filename': 'image.png', 'size': 48213,
+                'url': f'https://cdn.discordapp.com/attachments/{CHANNEL_ID}/{message_id}/image.png',
+                'proxy_url': f'https://media.discordapp.net/attachments/{CHANNEL_ID}/{message_id}/image.png',
+                'width': 800, 'height': 600, 'content_type': 'image/png',
+            }] if attachments else [],
+            'embeds': [], 'mentions': [], 'mention_roles': [], 'pinned': False, 'mention_everyone': False,
+            'tts': False, 'timestamp': '2024-01-01T00:00:00+00:00', 'edited_timestamp': None, 'components': [],
+        }
+
+
+def traced(build):
+    """Return what ``build()`` returns and the bytes it still holds once built."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held
+
+
+def rate(count, elapsed):
+    return f"{count / elapsed:,.0f}/s"
+
+
+async def main(count=20_000):
+    http = HTTPClient(asyncio.get_running_loop())
+    state = ConnectionState(dispatch=lambda *args, **kwargs: None, handlers={}, hooks={}, http=http,
+                            intents=discord.Intents.default(), max_messages=None)
+    guild = discord.Guild(data={
+        'id': str(GUILD_ID), 'name': 'bench', 'roles': [], 'emojis': [], 'stickers': [], 'member_count': AUTHORS,
+        'channels': [{'id': str(CHANNEL_ID), 'type': 0, 'name': 'general', 'position': 0}],
+    }, state=state)
+    channel = guild.get_channel(CHANNEL_ID)
+
+    print(f"{count:,} messages per mode, {AUTHORS} authors")
+    print(f"{'mode':<28}{'bytes/message':>15}{'estimate':>10}")
+    for attachments in (False, True):
+        label = 'with attachment' if attachments else 'text only'
+        # Payloads are generated while tracing and then dropped, so each mode owns the strings it keeps
+        messages, message_bytes = traced(lambda: [discord.Message(state=state, channel=channel, data=d)
+                                                  for d in payloads(count, attachments)])
+        print(f"{'discord.Message, ' + label:<28}{message_bytes / count:>15,.0f}{'':>10}")
+
+        del messages
+        cache = SnapshotCache(guild_budget=1 << 40, ttl=86400)
+
+        def fill():
+            # As in the bot: each message is parsed, snapshotted and then dropped
+            for d in payloads(count, attachments):
+                cache.add(GUILD_ID, MessageSnapshot.from_message(discord.Message(state=state, channel=channel, data=d)))
+            return cache
+
+        _, snapshot_bytes = traced(fill)
+        print(f"{'snapshot, ' + label:<28}{snapshot_bytes / count:>15,.0f}{cache.bytes / count:>10,.0f}")
+
+    snapshots = list(cache._guilds[GUILD_ID].messages.values())
+    ids = [snapshot.id for snapshot in snapshots]
+    cache = SnapshotCache(guild_budget=1 << 40, ttl=86400)
+    start = time.perf_counter()
+    for snapshot in snapshots:
+        cache.add(GUILD_ID, snapshot)
+    add_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for message_id in ids:
+        cache.pop(GUILD_ID, message_id)
+    pop_s = time.perf_counter() - start
+    print(f"add: {rate(count, add_s)}, pop: {rate(count, pop_s)}")
+    await http.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,376 @@
+"""
+Offline stand-ins for Discord used by the load tests.
+FakeRest simulates REST latency, per-route rate limit buckets and injected 429s;
+the fake models expose just enough of discord.py's surface for the cogs.
+"""
+
+import asyncio
+import functools
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeRest:
+    """Simulated HTTP API.
+
+    Every call sleeps for a sampled latency. Each bucket (the route, unless the
+    caller names one) allows ``bucket_size`` calls per ``bucket_window``; callers
+    wait for an exhausted bucket to reset, as discord.py does. Injected 429s
+    (``rate_limit_chance``) wait out ``retry_after`` and retry. Interaction
+    callbacks and webhooks are limited per token, so each interaction passes
+    its own bucket.
+    """
+
+    def __init__(self, latency=0.05, jitter=0.02, rate_limit_chance=0.0, bucket_size=50, bucket_window=1.0,
+                 retry_after=0.5, seed=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_chance = rate_limit_chance
+        self.bucket_size = bucket_size
+        self.bucket_window = bucket_window
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.calls = {}
+        self.rate_limited = {}
+        self._buckets = {}
+
+    async def request(self, route, bucket=None):
+        self.calls[route] = self.calls.get(route, 0) + 1
+        bucket = bucket or route
+        while True:
+            # Like discord.py, wait out an exhausted bucket instead of hitting the API
+            wait = self._take(bucket)
+            if wait:
+                await asyncio.sleep(wait)
+                continue
+            await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.jitter)))
+            if self.random.random() >= self.rate_limit_chance:
+                return
+            self.rate_limited[route] = self.rate_limited.get(route, 0) + 1
+            await asyncio.sleep(self.retry_after)
+
+    def _take(self, bucket) -> float:
+        """Take a token; return 0, or how long until the bucket resets."""
+        now = time.monotonic()
+        tokens, reset = self._buckets.get(bucket, (self.bucket_size, now + self.bucket_window))
+        if now >= reset:
+            tokens, reset = self.bucket_size, now + self.bucket_window
+        if tokens <= 0:
+            self._buckets[bucket] = (tokens, reset)
+            return reset - now
+        self._buckets[bucket] = (tokens - 1, reset)
+        return 0.0
+
+
+class FakeHTTPResponse:
+    """Enough of aiohttp's response for discord.HTTPException."""
+
+    def __init__(self, status, reason='error'):
+        self.status = status
+        self.reason = reason
+
+
+@functools.total_ordering
+class FakeRole:
+    def __init__(self, role_id, position, name='role'):
+        self.id = role_id
+        self.position = position
+        self.name = name
+        self.mention = f'<@&{role_id}>'
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRole) and self.position == other.position
+
+    def __lt__(self, other):
+        return self.position < other.position
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class AllPermissions:
+    """Every permission attribute reads as granted."""
+
+    def __getattr__(self, name):
+        return True
+
+
+class NoPermissions:
+    def __getattr__(self, name):
+        return False
+
+
+class FakeAsset:
+    url = 'https://cdn.discordapp.com/embed/avatars/0.png'
+
+
+class FakeMember:
+    def __init__(self, member_id, guild, rest, top_role, status=discord.Status.offline, bot=False,
+                 joined_at=None, created_at=None, permissions=None):
+        self.id = member_id
+        self.guild = guild
+        self.rest = rest
+        self.name = f'user{member_id}'
+        self.display_name = self.name
+        self.discriminator = '0'
+        self.mention = f'<@{member_id}>'
+        self.top_role = top_role
+        self.roles = [guild.default_role, top_role]
+        self.status = status
+        self.bot = bot
+        self.joined_at = joined_at or EPOCH
+        self.created_at = created_at or EPOCH
+        self._roles = [guild.default_role.id, top_role.id]
+        self.guild_permissions = permissions or NoPermissions()
+        self.avatar = None
+        self.default_avatar = FakeAsset()
+        self.color = discord.Color.default()
+        self.timed_out_until = None
+
+    def __eq__(self, other):
+        return getattr(other, 'id', None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        return self.name
+
+    async def kick(self, reason=None):
+        await self.rest.request('DELETE /guilds/{id}/members/{id}')
+        self.guild.remove_member(self)
+
+    async def ban(self, reason=None):
+        await self.guild.ban(self, reason=reason)
+
+    async def timeout(self, until, reason=None):
+        await self.rest.request('PATCH /guilds/{id}/members/{id}')
+        self.timed_out_until = until
+
+
+class FakeAttachment:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeMessage:
+    def __init__(self, message_id, channel, author, content='', attachments=(), mentions=(), created_at=None):
+        self.id = message_id
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.attachments = list(attachments)
+        self.raw_mentions = list(mentions)
+        self.raw_role_mentions = []
+        self.mention_everyone = False
+        self.created_at = created_at or datetime.now(timezone.utc)
+
+    @property
+    def jump_url(self):
+        return f'https://discord.com/channels/{self.guild.id}/{self.channel.id}/{self.id}'
+
+    async def delete(self):
+        await self.channel.rest.request('DELETE /channels/{id}/messages/{id}')
+        self.channel.messages.pop(self.id, None)
+        self.guild.dispatch('raw_message_delete', discord.RawMessageDeleteEvent(
+            {'id': self.id, 'channel_id': self.channel.id, 'guild_id': self.guild.id}))
+
+
+class FakeChannel:
+    def __init__(self, channel_id, guild, rest, name='general'):
+        self.id = channel_id
+        self.guild = guild
+        self.rest = rest
+        self.name = name
+        self.mention = f'<#{channel_id}>'
+        self.messages = {}
+        self.sent = 0
+        self.embeds = []
+
+    def __str__(self):
+        return self.name
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.request('POST /channels/{id}/messages')
+        self.sent += 1
+        self.embeds.extend(kwargs.get('embeds') or ())
+
+    async def history(self, limit=100, before=None, after=None, **kwargs):
+        ids = sorted(self.messages, reverse=True)
+        count = 0
+        for page in range(0, len(ids), 100):
+            await self.rest.request('GET /channels/{id}/messages')
+            for message_id in ids[page:page + 100]:
+                if before is not None and message_id >= before.id:
+                    continue
+                if after is not None and message_id <= after.id:
+                    continue
+                message = self.messages.get(message_id)
+                if message is None:
+                    continue
+                yield message
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+
+    async def delete_messages(self, messages, reason=None):
+        await self.rest.request('POST /channels/{id}/messages/bulk-delete')
+        for message in messages:
+            self.messages.pop(message.id, None)
+        self.guild.dispatch('raw_bulk_message_delete', discord.RawBulkMessageDeleteEvent(
+            {'ids': [message.id for message in messages], 'channel_id': self.id, 'guild_id': self.guild.id}))
+
+
+class FakeGuild:
+    def __init__(self, guild_id, rest, members=0, online_ratio=0.3, channels=20, roles=30, seed=1):
+        rng = random.Random(seed)
+        self.id = guild_id
+        self.rest = rest
+        self.name = f'guild{guild_id}'
+        self.icon = None
+        self.premium_tier = 0
+        self.created_at = EPOCH
+        self.emojis = []
+        self.default_role = FakeRole(guild_id, 0, '@everyone')
+        self.roles = [self.default_role] + [FakeRole(guild_id * 1000 + i, i) for i in range(1, roles)]
+        self.text_channels = [FakeChannel(guild_id * 10000 + i, self, rest, f'text{i}') for i in range(channels)]
+        self.voice_channels = []
+        self.system_channel = self.text_channels[0] if self.text_channels else None
+        self.verification_level = discord.VerificationLevel.low
+        self.filesize_limit = 10 * 1024 * 1024
+        self._members = {}
+        self.banned = set()
+        self.chunked = True
+        self.listeners = {}  # Raw gateway event name -> handlers, fed by the fakes' deletes
+
+        self.owner_id = guild_id + 1
+        self.owner = self._add(self.owner_id, self.roles[-1], AllPermissions())
+        self.me = self._add(guild_id + 2, self.roles[-2], AllPermissions(), bot=True)
+        self.moderator = self._add(guild_id + 3, self.roles[-3], AllPermissions())
+        for i in range(members):
+            status = discord.Status.online if rng.random() < online_ratio else discord.Status.offline
+            self._add(guild_id * 10 ** 6 + i, self.roles[rng.randrange(1, roles // 2)], status=status)
+
+    def _add(self, member_id, role, permissions=None, bot=False, status=discord.Status.online, joined_at=None,
+             created_at=None):
+        member = FakeMember(member_id, self, self.rest, role, status=status, bot=bot, joined_at=joined_at,
+                            created_at=created_at, permissions=permissions)
+        self._members[member_id] = member
+        return member
+
+    def add_member(self, member_id, joined_at=None, created_at=None):
+        return self._add(member_id, self.default_role, status=discord.Status.online, joined_at=joined_at,
+                         created_at=created_at)
+
+    def remove_member(self, member):
+        self._members.pop(member.id, None)
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    @property
+    def member_count(self):
+        return len(self._members)
+
+    def get_member(self, member_id):
+        return self._members.get(member_id)
+
+    def dispatch(self, event, payload):
+        # Like the client, each handler runs as its own task
+        for handler in self.listeners.get(event, ()):
+            asyncio.ensure_future(handler(payload))
+
+    def get_channel_or_thread(self, channel_id):
+        return next((channel for channel in self.text_channels if channel.id == channel_id), None)
+
+    async def edit(self, reason=None, **fields):
+        await self.rest.request('PATCH /guilds/{id}')
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    async def ban(self, user, reason=None, **kwargs):
+        await self.rest.request('PUT /guilds/{id}/bans/{id}')
+        self.banned.add(user.id)
+        self._members.pop(user.id, None)
+
+    async def unban(self, user, reason=None):
+        await self.rest.request('DELETE /guilds/{id}/bans/{id}')
+        if user.id not in self.banned:
+            raise discord.NotFound(FakeHTTPResponse(404), 'Unknown Ban')
+        self.banned.discard(user.id)
+
+    async def bulk_ban(self, users, reason=None, **kwargs):
+        await self.rest.request('POST /guilds/{id}/bulk-ban')
+        users = list(users)
+        for user in users:
+            self.banned.add(user.id)
+            self._members.pop(user.id, None)
+        return type('BulkBanResult', (), {'banned': users, 'failed': []})()
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def _ack(self):
+        await self.interaction.rest.request('POST /interactions/{id}/{token}/callback', self.interaction.token)
+        self._done = True
+        self.interaction.acked_at = time.perf_counter()
+
+    async def defer(self, **kwargs):
+        await self._ack()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._ack()
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.files = []  # (filename, bytes, lines) of each uploaded file
+
+    async def send(self, content=None, **kwargs):
+        await self.interaction.rest.request('POST /webhooks/{id}/{token}', self.interaction.token)
+        file = kwargs.get('file')
+        if file is not None:
+            data = file.fp.read()
+            self.files.append((file.filename, len(data), data.count(b'\n')))
+
+
+class FakeInteraction:
+    _tokens = itertools.count(1)
+
+    def __init__(self, guild, user, channel, rest, client_user):
+        self.token = f'token{next(self._tokens)}'
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = channel
+        self.rest = rest
+        self.client = type('Client', (), {'user': client_user})()
+        self.extras = {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = time.perf_counter()
+        self.acked_at = None
+
+    async def edit_original_response(self, **kwargs):
+        await self.rest.request('PATCH /webhooks/{id}/{token}/messages/@original', self.token)
+
+
+def recent(seconds):
+    """Timestamp ``seconds`` ago, for joined_at / created_at fields."""
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
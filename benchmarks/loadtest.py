@@ -0,0 +1,624 @@
+"""
+Offline load tests for the bot's cogs.
+Drives the real Moderation, Information, Help and AutoModeration handlers with
+a synthetic event stream against FakeRest, and prints a JSON report with
+throughput, p50/p99 latency and memory for each scenario.
+
+Usage: python benchmarks/loadtest.py [scenario ...] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the bot's log and case database out of the working tree
+_scratch = tempfile.mkdtemp(prefix='loadtest-')
+os.environ.setdefault('LOG_FILE', os.path.join(_scratch, 'bot.log'))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(_scratch, 'bot.db')}")
+os.environ.setdefault('AUTOMOD_TERMS_FILE', os.path.join(_scratch, 'terms.json'))
+os.environ.setdefault('POLICY_FILE', os.path.join(_scratch, 'policies.json'))
+os.environ.setdefault('MODLOG_FILE', os.path.join(_scratch, 'modlog.json'))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import discord  # noqa: E402
+
+import core  # noqa: E402
+from cogs.audit import MessageAudit  # noqa: E402
+from cogs.automod import AutoModeration  # noqa: E402
+from cogs.cases import Cases  # noqa: E402
+from cogs.help import Help  # noqa: E402
+from cogs.information import Information  # noqa: E402
+from cogs.moderation import Moderation  # noqa: E402
+from cogs.raid import RaidProtection  # noqa: E402
+from config import Config  # noqa: E402
+from fakes import FakeAttachment, FakeGuild, FakeInteraction, FakeMessage, FakeRest, recent  # noqa: E402
+
+
+class FakeBot:
+    """What the cogs and the mod-log dispatcher read from ``self.bot``."""
+
+    def __init__(self, user, guild=None):
+        self.user = user
+        self.guild = guild
+
+    def get_channel(self, channel_id):
+        return self.guild.get_channel_or_thread(channel_id) if self.guild is not None else None
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latency_summary(samples):
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3) if samples else None,
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3) if samples else None,
+        'max_ms': round(max(samples) * 1000, 3) if samples else None,
+    }
+
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+async def invoke(command, cog, interaction, **params):
+    """Run a slash command callback and return (ack latency, total latency)."""
+    await command.callback(cog, interaction, **params)
+    total = time.perf_counter() - interaction.started_at
+    ack = (interaction.acked_at or time.perf_counter()) - interaction.started_at
+    return ack, total
+
+
+async def scenario_serverinfo(members=500_000, calls=2000):
+    """/serverinfo on a very large guild: the GUILD_CREATE recount, the first call, then steady state."""
+    rest = FakeRest(latency=0.0, jitter=0.0)
+    guild = FakeGuild(1, rest, members=members)
+    cog = Information(FakeBot(guild.me))
+    channel = guild.text_channels[0]
+
+    start = time.perf_counter()
+    await cog.on_guild_available(guild)
+    available = time.perf_counter() - start
+    interaction = FakeInteraction(guild, guild.moderator, channel, rest, guild.me)
+    _, cold = await invoke(Information.serverinfo, cog, interaction)
+
+    samples = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        interaction = FakeInteraction(guild, guild.moderator, channel, rest, guild.me)
+        samples.append((await invoke(Information.serverinfo, cog, interaction))[1])
+    elapsed = time.perf_counter() - start
+
+    # Keep the counters honest while members churn
+    for i in range(1000):
+        cog.stats.member_join(guild.add_member(10 ** 12 + i))
+
+    return {
+        'members': members,
+        'guild_available_ms': round(available * 1000, 3),
+        'cold_call_ms': round(cold * 1000, 3),
+        'throughput_per_s': round(calls / elapsed, 1),
+        'latency': latency_summary(samples),
+    }
+
+
+async def scenario_moderation_mix(actions=600, latency=0.08, rate_limit_chance=0.05):
+    """Concurrent kick/ban/timeout with slow REST and injected 429s."""
+    rest = FakeRest(latency=latency, jitter=latency / 4, rate_limit_chance=rate_limit_chance)
+    guild = FakeGuild(2, rest, members=actions)
+    # One moderator account drives every action, so lift its cooldowns
+    for name in ('kick', 'ban', 'timeout'):
+        await core.policy_store.set_cooldown(guild.id, name, 0)
+    cog = Moderation(FakeBot(guild.me))
+    channel = guild.text_channels[0]
+    targets = [m for m in guild.members if m.guild_permissions.__class__.__name__ == 'NoPermissions'][:actions]
+
+    async def one(i, member):
+        interaction = FakeInteraction(guild, guild.moderator, channel, rest, guild.me)
+        if i % 3 == 0:
+            return await invoke(Moderation.kick, cog, interaction, member=member, reason='load test')
+        if i % 3 == 1:
+            return await invoke(Moderation.ban, cog, interaction, member=member, reason='load test')
+        return await invoke(Moderation.timeout, cog, interaction, member=member, minutes=10, reason='load test')
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i, member) for i, member in enumerate(targets)))
+    elapsed = time.perf_counter() - start
+    await core.case_store.flush()
+
+    acks = [ack for ack, _ in results]
+    return {
+        'actions': len(targets),
+        'rest_latency_ms': latency * 1000,
+        'throughput_per_s': round(len(targets) / elapsed, 1),
+        'ack_latency': latency_summary(acks),
+        'total_latency': latency_summary([total for _, total in results]),
+        'missed_3s_deadline': sum(1 for ack in acks if ack > 3.0),
+        'rest_calls': sum(rest.calls.values()),
+        'rest_429s': rest.rate_limited,
+    }
+
+
+async def scenario_raid_burst(joins=800, messages_per_raider=6, members=50_000):
+    """Join burst plus link spam from the raiders, then /massban of recent joins.
+
+    ``joins`` stays under ``Config.MASS_ACTION_MAX_TARGETS`` so a single /massban
+    covers the raid, and each raider posts enough links to trip the spam detector.
+    """
+    Config.FEATURES['spam_protection'] = True
+    rest = FakeRest(latency=0.02, jitter=0.005, rate_limit_chance=0.02)
+    guild = FakeGuild(3, rest, members=members)
+    fake_bot = FakeBot(guild.me)
+    info = Information(fake_bot)
+    automod = AutoModeration(fake_bot)
+    moderation = Moderation(fake_bot)
+    info.stats.get(guild)
+    channel = guild.text_channels[0]
+
+    join_samples = []
+    start = time.perf_counter()
+    raiders = []
+    for i in range(joins):
+        t = time.perf_counter()
+        member = guild.add_member(9 * 10 ** 12 + i, joined_at=recent(1), created_at=recent(3600))
+        raiders.append(member)
+        await info.on_member_join(member)
+        join_samples.append(time.perf_counter() - t)
+    join_elapsed = time.perf_counter() - start
+
+    # Handlers run as separate tasks, as the gateway dispatches them; each one times itself
+    message_samples = []
+
+    async def handle(message):
+        t = time.perf_counter()
+        await automod.on_message(message)
+        message_samples.append(time.perf_counter() - t)
+
+    message_id = 10 ** 15
+    start = time.perf_counter()
+    pending = []
+    for _ in range(messages_per_raider):
+        for member in raiders:
+            message_id += 1
+            message = FakeMessage(message_id, channel, member, content='join my server https://spam.example')
+            pending.append(asyncio.ensure_future(handle(message)))
+    await asyncio.gather(*pending)
+    message_elapsed = time.perf_counter() - start
+    timed_out = sum(1 for member in raiders if member.timed_out_until is not None)
+
+    interaction = FakeInteraction(guild, guild.moderator, channel, rest, guild.me)
+    ack, massban = await invoke(Moderation.massban, moderation, interaction,
+                                targets=None, file=None, joined_within=10, reason='raid')
+    await core.case_store.flush()
+    Config.FEATURES['spam_protection'] = False
+
+    return {
+        'joins': joins,
+        'messages': joins * messages_per_raider,
+        'join_events_per_s': round(joins / join_elapsed, 1),
+        'message_events_per_s': round(joins * messages_per_raider / message_elapsed, 1),
+        'join_handler_latency': latency_summary(join_samples),
+        'message_handler_latency': latency_summary(message_samples),
+        'timed_out_for_spam': timed_out,
+        'massban_ack_ms': round(ack * 1000, 3),
+        'massban_total_ms': round(massban * 1000, 3),
+        'banned': len(guild.banned),
+        'rest_calls': sum(rest.calls.values()),
+        'rest_429s': rest.rate_limited,
+    }
+
+
+async def scenario_spam_campaign(spammers=40, copies=3, chatters=500, chatter_messages=5000):
+    """Spam accounts post variants of one message across channels, hidden in ordinary chatter.
+
+    Each copy changes its invite code, case and a trailing word. Chatter is
+    built from random words, so any chatter message removed is a false positive.
+    """
+    Config.FEATURES['campaign_protection'] = True
+    rest = FakeRest(latency=0.03, jitter=0.01)
+    guild = FakeGuild(8, rest, channels=20)
+    automod = AutoModeration(FakeBot(guild.me))
+    rng = random.Random(8)
+    words = ['game', 'server', 'tonight', 'stream', 'patch', 'build', 'ranked', 'match', 'lobby', 'update',
+             'anyone', 'playing', 'weekend', 'event', 'music', 'raid', 'boss', 'loot', 'guild', 'quest',
+             'coffee', 'school', 'homework', 'movie', 'trailer', 'season', 'episode', 'ending', 'theory', 'meme']
+    spam = "FREE NITRO for everyone!! Steam gift giveaway, claim before it expires: https://dlscord-gift.com/claim?c={code} {tail}"
+
+    events = []
+    for i in range(chatters):
+        member = guild.add_member(8 * 10 ** 12 + i)
+        for _ in range(chatter_messages // chatters):
+            events.append(('chatter', member, ' '.join(rng.choice(words) for _ in range(rng.randrange(6, 14)))))
+    for i in range(spammers):
+        member = guild.add_member(9 * 10 ** 12 + i, created_at=recent(3600))
+        for _ in range(copies):
+            text = spam.format(code=rng.randrange(10 ** 8), tail=rng.choice(['', 'hurry', 'lol', 'legit', '100%']))
+            events.append(('spam', member, text.upper() if rng.random() < 0.3 else text))
+    rng.shuffle(events)
+
+    samples = []
+
+    async def handle(message):
+        t = time.perf_counter()
+        await automod.on_message(message)
+        samples.append(time.perf_counter() - t)
+
+    message_id = 10 ** 16
+    posted = {'chatter': [], 'spam': []}
+    pending = []
+    start = time.perf_counter()
+    for kind, member, text in events:
+        message_id += 1
+        channel = guild.text_channels[rng.randrange(len(guild.text_channels))]
+        message = FakeMessage(message_id, channel, member, content=text)
+        channel.messages[message_id] = message
+        posted[kind].append(message)
+        pending.append(asyncio.ensure_future(handle(message)))
+        # Let handlers run between gateway events, as the client does
+        if len(pending) % 50 == 0:
+            await asyncio.sleep(0)
+    await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - start
+    await core.case_store.flush()
+    Config.FEATURES['campaign_protection'] = False
+
+    removed = {kind: sum(1 for m in messages if m.id not in m.channel.messages) for kind, messages in posted.items()}
+    timed_out = {kind: len({m.author.id for m in messages if m.author.timed_out_until is not None})
+                 for kind, messages in posted.items()}
+    return {
+        'messages': len(events),
+        'spam_messages': len(posted['spam']),
+        'message_events_per_s': round(len(events) / elapsed, 1),
+        'message_handler_latency': latency_summary(samples),
+        'campaigns': automod.campaigns.flagged,
+        'spam_removed': removed['spam'],
+        'spammers_timed_out': timed_out['spam'],
+        'chatter_removed': removed['chatter'],
+        'chatters_timed_out': timed_out['chatter'],
+        'rest_calls': rest.calls,
+    }
+
+
+async def scenario_raid_lockdown(joins=5000, members=50_000):
+    """A 5000-join raid of fresh, avatarless accounts against the raid detector.
+
+    Joins are dispatched back to back, yielding to the loop every 50 like a busy
+    gateway; a ticker measures how far the event loop falls behind meanwhile.
+    The lockdown is ended once every raider has been actioned.
+    """
+    Config.FEATURES['raid_protection'] = True
+    # Generous buckets so the run measures the bot rather than a simulated member-edit limit
+    rest = FakeRest(latency=0.03, jitter=0.01, bucket_size=1000)
+    guild = FakeGuild(7, rest, members=members)
+    cog = RaidProtection(FakeBot(guild.me))
+    guard = cog.guard
+
+    lag = []
+    ticking = True
+
+    async def ticker(interval=0.01):
+        while ticking:
+            t = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag.append(time.perf_counter() - t - interval)
+
+    tick_task = asyncio.ensure_future(ticker())
+    join_samples = []
+    raiders = []
+    start = time.perf_counter()
+    for i in range(joins):
+        member = guild.add_member(7 * 10 ** 12 + i, joined_at=recent(1), created_at=recent(3600))
+        member.name = f'raider{i}'
+        raiders.append(member)
+        t = time.perf_counter()
+        await cog.on_member_join(member)
+        join_samples.append(time.perf_counter() - t)
+        if i % 50 == 49:
+            await asyncio.sleep(0)
+    join_elapsed = time.perf_counter() - start
+    lockdown = guard.lockdowns.get(guild.id)
+    tripped = lockdown is not None
+
+    while tripped and lockdown.actioned + lockdown.failed < joins:
+        await asyncio.sleep(0.05)
+    actioned_s = time.perf_counter() - start
+    if tripped:
+        guard.end(guild.id)
+        await lockdown.task
+    ticking = False
+    await tick_task
+    await core.case_store.flush()
+    Config.FEATURES['raid_protection'] = False
+
+    return {
+        'joins': joins,
+        'join_events_per_s': round(joins / join_elapsed, 1),
+        'join_handler_latency': latency_summary(join_samples),
+        'loop_lag': latency_summary(lag),
+        'lockdown_tripped': tripped,
+        'timed_out': sum(1 for member in raiders if member.timed_out_until is not None),
+        'failed': lockdown.failed if tripped else None,
+        'all_actioned_s': round(actioned_s, 3),
+        'verification_level': str(guild.verification_level),
+        'rest_calls': rest.calls,
+    }
+
+
+async def scenario_cooldown_burst(attempts=300, latency=0.08):
+    """One moderator fires /ban as fast as possible; the cooldown should stop it before any API call."""
+    rest = FakeRest(latency=latency, jitter=latency / 4)
+    guild = FakeGuild(6, rest, members=attempts)
+    cog = Moderation(FakeBot(guild.me))
+    channel = guild.text_channels[0]
+    targets = [m for m in guild.members if m.guild_permissions.__class__.__name__ == 'NoPermissions'][:attempts]
+
+    async def one(member):
+        interaction = FakeInteraction(guild, guild.moderator, channel, rest, guild.me)
+        return await invoke(Moderation.ban, cog, interaction, member=member, reason='load test')
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(member) for member in targets))
+    elapsed = time.perf_counter() - start
+    await core.case_store.flush()
+
+    return {
+        'attempts': len(targets),
+        'banned': len(guild.banned),
+        'rejected': cog.runner.cooldowns.rejected,
+        'ban_calls': rest.calls.get('PUT /guilds/{id}/bans/{id}', 0),
+        'throughput_per_s': round(len(targets) / elapsed, 1),
+        'total_latency': latency_summary([total for _, total in results]),
+        'buckets': len(cog.runner.cooldowns),
+    }
+
+
+async def scenario_clear(recent_messages=9500, old_messages=500):
+    """/clear of 10k messages split between the bulk and single-delete lanes."""
+    Config.PURGE_SINGLE_DELETE_DELAY = 0.001
+    rest = FakeRest(latency=0.03, jitter=0.01)
+    guild = FakeGuild(4, rest)
+    cog = Moderation(FakeBot(guild.me))
+    channel = guild.text_channels[0]
+    author = guild.add_member(4 * 10 ** 12)
+    for i in range(old_messages):
+        channel.messages[10 ** 15 + i] = FakeMessage(10 ** 15 + i, channel, author, 'old', created_at=recent(30 * 86400))
+    for i in range(recent_messages):
+        message_id = 2 * 10 ** 15 + i
+        channel.messages[message_id] = FakeMessage(message_id, channel, author, 'new')
+
+    total = recent_messages + old_messages
+    interaction = FakeInteraction(guild, guild.moderator, channel, rest, guild.me)
+    ack, elapsed = await invoke(Moderation.clear, cog, interaction, amount=total)
+    return {
+        'messages': total,
+        'deleted': total - len(channel.messages),
+        'ack_ms': round(ack * 1000, 3),
+        'total_s': round(elapsed, 3),
+        'messages_per_s': round((total - len(channel.messages)) / elapsed, 1),
+        'rest_calls': rest.calls,
+    }
+
+
+async def scenario_message_audit(messages=50_000, edits=1000, deletes=500, chatters=2000):
+    """Chatter snapshotted for the audit log, then edits, single deletes and a /clear of one channel.
+
+    The /clear's bulk deletes should reach the mod log as a single summary.
+    Snapshot memory is the cache's own estimate; bench_snapshots.py compares
+    it with discord.py's message cache.
+    """
+    Config.FEATURES['message_audit'] = True
+    Config.MESSAGE_AUDIT_BULK_WINDOW = 0.2
+    rest = FakeRest(latency=0.03, jitter=0.01)
+    guild = FakeGuild(9, rest, channels=20)
+    modlog_channel = guild.text_channels[-1]
+    await core.modlog_store.set(guild.id, modlog_channel.id)
+    dispatcher_bot, flush_interval = core.mod_log.bot, core.mod_log.flush_interval
+    core.mod_log.bot, core.mod_log.flush_interval = FakeBot(guild.me, guild), 0.05
+    audit = MessageAudit(FakeBot(guild.me))
+    moderation = Moderation(FakeBot(guild.me))
+    guild.listeners = {
+        'raw_message_delete': [audit.on_raw_message_delete],
+        'raw_bulk_message_delete': [audit.on_raw_bulk_message_delete],
+    }
+    rng = random.Random(9)
+    words = ['game', 'server', 'tonight', 'stream', 'patch', 'build', 'ranked', 'match', 'lobby', 'update',
+             'anyone', 'playing', 'weekend', 'event', 'music', 'boss', 'loot', 'quest', 'coffee', 'movie']
+    members = [guild.add_member(9 * 10 ** 12 + i) for i in range(chatters)]
+    channels = guild.text_channels[:-1]
+
+    posted = []
+    samples = []
+    message_id = discord.utils.time_snowflake(datetime.now(timezone.utc)) - messages
+    start = time.perf_counter()
+    for i in range(messages):
+        message_id += 1
+        channel = channels[rng.randrange(len(channels))]
+        attachments = [FakeAttachment(f'https://cdn.discordapp.com/attachments/{channel.id}/{message_id}/image.png')] \
+            if rng.random() < 0.1 else []
+        message = FakeMessage(message_id, channel, rng.choice(members),
+                              content=' '.join(rng.choice(words) for _ in range(rng.randrange(4, 20))),
+                              attachments=attachments)
+        channel.messages[message_id] = message
+        posted.append(message)
+        t = time.perf_counter()
+        await audit.on_message(message)
+        samples.append(time.perf_counter() - t)
+    message_s = time.perf_counter() - start
+
+    edit_samples = []
+    for message in rng.sample(posted, edits):
+        message.content += ' (edited)'
+        data = {'id': str(message.id), 'channel_id': str(message.channel.id), 'guild_id': str(guild.id),
+                'content': message.content, 'attachments': [],
+                'author': {'id': str(message.author.id), 'username': message.author.name, 'discriminator': '0'}}
+        payload = discord.RawMessageUpdateEvent(data, message)
+        t = time.perf_counter()
+        await audit.on_raw_message_edit(payload)
+        edit_samples.append(time.perf_counter() - t)
+
+    cleared_channel = channels[0]
+    await asyncio.gather(*(message.delete()
+                           for message in rng.sample([m for m in posted if m.channel is not cleared_channel], deletes)))
+    cleared = len(cleared_channel.messages)
+    interaction = FakeInteraction(guild, guild.moderator, cleared_channel, rest, guild.me)
+    _, clear_s = await invoke(Moderation.clear, moderation, interaction, amount=cleared)
+    # Let the bulk deletes settle into their summary and the mod log drain
+    await asyncio.sleep(Config.MESSAGE_AUDIT_BULK_WINDOW * 2)
+    while core.mod_log.queued(guild.id):
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.2)
+
+    titles = [embed.title for embed in modlog_channel.embeds]
+    snapshots = len(core.snapshot_cache)
+    result = {
+        'messages': messages,
+        'message_events_per_s': round(messages / message_s, 1),
+        'message_handler_latency': latency_summary(samples),
+        'edit_handler_latency': latency_summary(edit_samples),
+        'snapshots': snapshots,
+        'snapshot_bytes_per_message': round(core.snapshot_cache.bytes / snapshots, 1),
+        'snapshot_mb': round(core.snapshot_cache.bytes / 2 ** 20, 2),
+        'evicted': core.snapshot_cache.evicted,
+        'edits_logged': titles.count("✏️ Message Edited"),
+        'deletes_logged': titles.count("🗑️ Message Deleted"),
+        'cleared': cleared,
+        'clear_s': round(clear_s, 3),
+        'bulk_summaries': titles.count("🗑️ Messages Bulk Deleted"),
+        'modlog_messages': modlog_channel.sent,
+        'rest_calls': rest.calls,
+    }
+    core.mod_log.bot, core.mod_log.flush_interval = dispatcher_bot, flush_interval
+    await core.modlog_store.remove(guild.id)
+    Config.FEATURES['message_audit'] = False
+    return result
+
+
+async def scenario_modexport(cases=200_000, users=5000):
+    """/modexport of a server's whole history as CSV, then one user's history as JSON Lines.
+
+    Cases stream from the database into upload-sized files, so the traced
+    memory peak should stay near one file however many cases there are.
+    """
+    rest = FakeRest(latency=0.03, jitter=0.01)
+    guild = FakeGuild(10, rest)
+    cog = Cases(FakeBot(guild.me))
+    rng = random.Random(10)
+    actions = ['timeout', 'timeout', 'kick', 'ban', 'untimeout']
+    for i in range(cases):
+        action = rng.choice(actions)
+        core.case_store.record(guild.id, 10 * 10 ** 12 + rng.randrange(users), guild.moderator.id, action,
+                               f"Reason {i}, with a comma and \"quotes\"", 3600 if action == 'timeout' else None)
+        if i % 5000 == 4999:
+            await core.case_store.flush()
+    await core.case_store.flush()
+
+    gc.collect()
+    tracemalloc.start()
+    interaction = FakeInteraction(guild, guild.moderator, guild.text_channels[0], rest, guild.me)
+    _, full_s = await invoke(Cases.modexport, cog, interaction, format='csv')
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    files = interaction.followup.files
+
+    user = type('User', (), {'id': 10 * 10 ** 12 + 1})()
+    single = FakeInteraction(guild, guild.moderator, guild.text_channels[0], rest, guild.me)
+    _, user_s = await invoke(Cases.modexport, cog, single, format='jsonl', user=user, days=365)
+    return {
+        'cases': cases,
+        'files': len(files),
+        'largest_file_mb': round(max(size for _, size, _ in files) / 2 ** 20, 2),
+        'rows_exported': sum(lines - 1 for _, _, lines in files),
+        'export_s': round(full_s, 3),
+        'cases_per_s': round(cases / full_s, 1),
+        'traced_peak_mb': round(peak / 2 ** 20, 2),
+        'user_export_rows': sum(lines for _, _, lines in single.followup.files),
+        'user_export_ms': round(user_s * 1000, 3),
+        'rest_calls': rest.calls,
+    }
+
+
+async def scenario_help(calls=5000):
+    """Baseline: the cheapest command, to expose harness overhead."""
+    rest = FakeRest(latency=0.0, jitter=0.0)
+    guild = FakeGuild(5, rest)
+    cog = Help(FakeBot(guild.me))
+    samples = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        interaction = FakeInteraction(guild, guild.moderator, guild.text_channels[0], rest, guild.me)
+        samples.append((await invoke(Help.help_command, cog, interaction))[1])
+    elapsed = time.perf_counter() - start
+    return {'throughput_per_s': round(calls / elapsed, 1), 'latency': latency_summary(samples)}
+
+
+SCENARIOS = {
+    'help': scenario_help,
+    'serverinfo_500k': scenario_serverinfo,
+    'moderation_mix': scenario_moderation_mix,
+    'cooldown_burst': scenario_cooldown_burst,
+    'raid_burst': scenario_raid_burst,
+    'raid_lockdown': scenario_raid_lockdown,
+    'spam_campaign': scenario_spam_campaign,
+    'clear_10k': scenario_clear,
+    'message_audit': scenario_message_audit,
+    'modexport_200k': scenario_modexport,
+}
+
+
+async def main(names):
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scenarios': {},
+    }
+    for name in names:
+        gc.collect()
+        before = rss_mb()
+        started = time.perf_counter()
+        result = await SCENARIOS[name]()
+        result['wall_s'] = round(time.perf_counter() - started, 3)
+        result['peak_rss_mb'] = rss_mb()
+        result['peak_rss_growth_mb'] = round(result['peak_rss_mb'] - before, 1)
+        report['scenarios'][name] = result
+        print(f"{name}: done in {result['wall_s']}s", file=sys.stderr)
+    await core.case_store.close()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(main(args.scenarios or list(SCENARIOS)))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
@@ -0,0 +1,263 @@
+"""
+Near-duplicate detection for cross-channel spam campaigns.
+Each message is fingerprinted with a 64-bit SimHash of its character 4-grams,
+so copies that differ by a word, a number or their case land a few bits apart.
+A guild's last ``window`` fingerprints live in fixed-size arrays, indexed by
+bands of the fingerprint: two fingerprints within ``max_distance`` bits agree
+exactly on at least one of ``max_distance + 1`` bands, so a lookup only
+compares the recent entries in its own buckets instead of scanning the window.
+"""
+
+import re
+import time
+import unicodedata
+from array import array
+
+SHINGLE = 4
+MAX_CHARS = 1000                  # Long messages are fingerprinted by their start
+MASK64 = (1 << 64) - 1
+LANE = 16                         # Bits per counter when summing shingle hashes, enough for MAX_CHARS
+
+# _SPREAD[b] puts bit i of byte b at bit i * LANE, so adding spread bytes counts 8 bits at once
+_SPREAD = [sum(1 << (bit * LANE) for bit in range(8) if value >> bit & 1) for value in range(256)]
+_LANE_MASK = (1 << LANE) - 1
+# Digits, punctuation and symbols are what spammers vary between copies
+_NOISE_RE = re.compile(r'[^\w\s]|[\d_]')
+
+
+def normalize(text: str) -> str:
+    """Casefold, fold lookalike characters and keep only letters, single-spaced."""
+    text = unicodedata.normalize('NFKC', text[:MAX_CHARS * 2]).casefold()
+    return ' '.join(_NOISE_RE.sub(' ', text).split())[:MAX_CHARS]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of a normalised text's character 4-grams.
+
+    Uses Python's string hash, so fingerprints are only comparable within one
+    process, which is all the in-memory index needs.
+    """
+    shingles = {text[i:i + SHINGLE] for i in range(max(1, len(text) - SHINGLE + 1))}
+    a0 = a1 = a2 = a3 = a4 = a5 = a6 = a7 = 0
+    spread = _SPREAD
+    for shingle in shingles:
+        b0, b1, b2, b3, b4, b5, b6, b7 = (hash(shingle) & MASK64).to_bytes(8, 'little')
+        a0 += spread[b0]
+        a1 += spread[b1]
+        a2 += spread[b2]
+        a3 += spread[b3]
+        a4 += spread[b4]
+        a5 += spread[b5]
+        a6 += spread[b6]
+        a7 += spread[b7]
+    # A bit is set when more than half of the shingle hashes have it set
+    half = len(shingles) // 2
+    fingerprint = 0
+    for byte, counts in enumerate((a0, a1, a2, a3, a4, a5, a6, a7)):
+        for bit in range(8):
+            if (counts >> (bit * LANE)) & _LANE_MASK > half:
+                fingerprint |= 1 << (byte * 8 + bit)
+    return fingerprint
+
+
+try:
+    _popcount = int.bit_count          # Python 3.10+
+except AttributeError:
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+def distance(a: int, b: int) -> int:
+    """Number of bits two fingerprints differ in."""
+    return _popcount(a ^ b)
+
+
+def bands(max_distance):
+    """``(shift, mask)`` for ``max_distance + 1`` bands covering all 64 bits.
+
+    Each band's bucket array has ``mask + 1`` entries, so bands are at most
+    16 bits wide (4 bands or more), which keeps a guild's bucket arrays within 2 MiB.
+    """
+    count = max_distance + 1
+    if count < 4:
+        raise ValueError(
+            f"max_distance must be at least 3, not {max_distance}: "
+            "fewer bands would each be wider than 16 bits and need 2^17 or more buckets"
+        )
+    if count > 16:
+        raise ValueError(f"max_distance must be at most 15, not {max_distance}")
+    result = []
+    shift = 0
+    for i in range(count):
+        width = 64 // count + (1 if i < 64 % count else 0)
+        result.append((shift, (1 << width) - 1))
+        shift += width
+    return result
+
+
+class Campaign:
+    """A group of near-identical messages posted by several accounts."""
+
+    __slots__ = ('id', 'fingerprint', 'preview', 'started', 'expires', 'authors', 'messages', 'actioned')
+
+    def __init__(self, campaign_id, fingerprint, preview, now, expires):
+        self.id = campaign_id
+        self.fingerprint = fingerprint
+        self.preview = preview
+        self.started = now
+        self.expires = expires
+        self.authors = set()
+        self.messages = 0
+        self.actioned = set()
+
+
+class GuildIndex:
+    """The last ``window`` fingerprints of one guild.
+
+    Entries are numbered by a running sequence and stored at ``seq % window``.
+    Each band keeps, per bucket, the newest entry's sequence, and each entry
+    the sequence of the previous entry in the same bucket. Chains therefore
+    run newest to oldest and are cut where an entry has been overwritten or
+    is older than the time window, so nothing is ever unlinked.
+    """
+
+    __slots__ = ('fingerprints', 'times', 'seqs', 'authors', 'channels', 'messages', 'heads', 'links',
+                 'next_seq', 'campaigns', 'last_seen')
+
+    def __init__(self, window, band_layout):
+        self.fingerprints = array('Q', bytes(8 * window))
+        self.times = array('d', [float('-inf')]) * window
+        self.seqs = array('q', [-1]) * window
+        self.authors = array('Q', bytes(8 * window))
+        self.channels = array('Q', bytes(8 * window))     # 0 once the entry joined a campaign
+        self.messages = array('Q', bytes(8 * window))
+        self.heads = [array('q', [-1]) * (mask + 1) for _, mask in band_layout]
+        self.links = [array('q', [-1]) * window for _ in band_layout]
+        self.next_seq = 0
+        self.campaigns = []
+        self.last_seen = 0.0
+
+
+class CampaignDetector:
+    """Per-guild near-duplicate index that flags spam campaigns.
+
+    ``check`` fingerprints a message and looks for copies within
+    ``max_distance`` bits posted in the last ``seconds``. Once copies come
+    from ``accounts`` different authors the group becomes a campaign: the
+    matched messages are returned for removal, and for the next ``seconds``
+    every further copy is matched against the campaign directly.
+    """
+
+    def __init__(self, accounts=3, seconds=120, max_distance=7, min_length=20, window=2048,
+                 max_campaigns=16, idle_after=3600):
+        self.accounts = accounts
+        self.seconds = seconds
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.window = window
+        self.max_campaigns = max_campaigns
+        self.idle_after = idle_after
+        self.band_layout = bands(max_distance)
+        self.flagged = 0
+        self._guilds = {}
+        self._next_id = 1
+        self._next_sweep = time.monotonic() + idle_after
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def check(self, guild_id, channel_id, message_id, author_id, content, now=None):
+        """Index a message; return ``(campaign, [(channel_id, message_id, author_id), ...])`` to act on, or None.
+
+        For a new campaign the list holds every indexed copy plus this message;
+        for a copy of a known campaign it holds just this message.
+        """
+        text = normalize(content)
+        if len(text) - text.count(' ') < self.min_length:
+            return None
+        if now is None:
+            now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        state = self._guilds.get(guild_id)
+        if state is None:
+            state = self._guilds[guild_id] = GuildIndex(self.window, self.band_layout)
+        state.last_seen = now
+        fingerprint = simhash(text)
+        current = (channel_id, message_id, author_id)
+
+        for campaign in state.campaigns:
+            if campaign.expires > now and distance(campaign.fingerprint, fingerprint) <= self.max_distance:
+                campaign.expires = now + self.seconds
+                campaign.authors.add(author_id)
+                campaign.messages += 1
+                return campaign, [current]
+
+        matches = self._matches(state, fingerprint, now)
+        inserted = self._insert(state, fingerprint, now, current)
+        authors = {author_id}
+        authors.update(state.authors[slot] for slot in matches)
+        if len(authors) < self.accounts:
+            return None
+
+        campaign = Campaign(self._next_id, fingerprint, content[:200], now, now + self.seconds)
+        self._next_id += 1
+        self.flagged += 1
+        found = [(state.channels[slot], state.messages[slot], state.authors[slot]) for slot in matches]
+        found.append(current)
+        # Claimed entries stay in their chains but are never matched again
+        for slot in matches:
+            state.channels[slot] = 0
+        state.channels[inserted] = 0
+        campaign.authors = authors
+        campaign.messages = len(found)
+        state.campaigns = [c for c in state.campaigns if c.expires > now][-(self.max_campaigns - 1):] + [campaign]
+        return campaign, found
+
+    def _matches(self, state, fingerprint, now) -> set:
+        """Slots of recent, unclaimed entries within ``max_distance`` bits of ``fingerprint``."""
+        window = self.window
+        oldest = now - self.seconds
+        max_distance = self.max_distance
+        fingerprints, times, seqs, channels = state.fingerprints, state.times, state.seqs, state.channels
+        popcount = _popcount
+        found = set()
+        for (shift, mask), heads, links in zip(self.band_layout, state.heads, state.links):
+            seq = heads[(fingerprint >> shift) & mask]
+            while seq >= 0:
+                slot = seq % window
+                if seqs[slot] != seq or times[slot] < oldest:
+                    break
+                if channels[slot] and slot not in found and popcount(fingerprints[slot] ^ fingerprint) <= max_distance:
+                    found.add(slot)
+                seq = links[slot]
+        return found
+
+    def _insert(self, state, fingerprint, now, entry) -> int:
+        seq = state.next_seq
+        state.next_seq += 1
+        slot = seq % self.window
+        state.fingerprints[slot] = fingerprint
+        state.times[slot] = now
+        state.seqs[slot] = seq
+        state.channels[slot], state.messages[slot], state.authors[slot] = entry
+        for (shift, mask), heads, links in zip(self.band_layout, state.heads, state.links):
+            key = (fingerprint >> shift) & mask
+            links[slot] = heads[key]
+            heads[key] = seq
+        return slot
+
+    def campaigns(self, guild_id, now=None) -> list:
+        """Campaigns in a guild that are still active."""
+        state = self._guilds.get(guild_id)
+        if state is None:
+            return []
+        now = time.monotonic() if now is None else now
+        return [campaign for campaign in state.campaigns if campaign.expires > now]
+
+    def sweep(self, now=None):
+        """Forget guilds with no indexed messages for ``idle_after`` seconds."""
+        now = time.monotonic() if now is None else now
+        for guild_id in [g for g, state in self._guilds.items() if now - state.last_seen > self.idle_after]:
+            del self._guilds[guild_id]
+        self._next_sweep = now + self.idle_after
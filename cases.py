@@ -0,0 +1,219 @@
+"""
+Persistent moderation case store.
+Cases are queued by the command handlers and written to SQLite in batches on a
+dedicated thread, so recording an action never blocks the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    reason TEXT,
+    duration INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cases_guild ON cases (guild_id);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_user ON cases (guild_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_moderator ON cases (guild_id, moderator_id);
+CREATE INDEX IF NOT EXISTS idx_cases_created_at ON cases (created_at);
+CREATE TABLE IF NOT EXISTS audit_cursors (
+    guild_id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ('id', 'guild_id', 'user_id', 'moderator_id', 'action', 'reason', 'duration', 'created_at')
+
+
+def sqlite_path(database_url) -> str:
+    """Resolve ``DATABASE_URL`` to a SQLite file path."""
+    if not database_url:
+        return 'bot.db'
+    if not database_url.startswith('sqlite:///'):
+        raise ValueError(f"Unsupported DATABASE_URL (only sqlite:/// is supported): {database_url}")
+    return database_url[len('sqlite:///'):] or 'bot.db'
+
+
+class Case:
+    """One stored moderation action."""
+
+    __slots__ = COLUMNS
+
+    def __init__(self, *row):
+        for name, value in zip(COLUMNS, row):
+            setattr(self, name, value)
+
+
+class CaseStore:
+    """SQLite-backed case log with an async batching writer.
+
+    All database access happens on one worker thread that owns the connection.
+    Reads use keyset pagination on the case ID, which the (guild, user) and
+    (guild, moderator) indexes cover through SQLite's implicit rowid.
+    """
+
+    def __init__(self, database_url=None, batch_size=500):
+        self.path = sqlite_path(database_url)
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='case-store')
+        self._conn = None
+        self._queue = None
+        self._writer = None
+
+    # Worker thread side
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _write_batch(self, rows):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT INTO cases (guild_id, user_id, moderator_id, action, reason, duration, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def _write_audit(self, guild_id, rows, entry_id):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT INTO cases (guild_id, user_id, moderator_id, action, reason, duration, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(guild_id, *row) for row in rows]
+            )
+            conn.execute(
+                'INSERT INTO audit_cursors (guild_id, entry_id) VALUES (?, ?) '
+                'ON CONFLICT (guild_id) DO UPDATE SET entry_id = excluded.entry_id',
+                (guild_id, entry_id)
+            )
+
+    def _audit_cursor(self, guild_id):
+        row = self._connect().execute('SELECT entry_id FROM audit_cursors WHERE guild_id = ?', (guild_id,)).fetchone()
+        return row[0] if row else None
+
+    def _query(self, sql, params):
+        return [Case(*row) for row in self._connect().execute(sql, params)]
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # Event loop side
+
+    def _ensure_writer(self):
+        if self._writer is None or self._writer.done():
+            self._queue = self._queue or asyncio.Queue(maxsize=self.batch_size * 20)
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def record(self, guild_id, user_id, moderator_id, action, reason=None, duration=None):
+        """Queue a case for writing. Never blocks; drops and logs if the queue is full."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((guild_id, user_id, moderator_id, action, reason, duration, time.time()))
+        except asyncio.QueueFull:
+            logger.error(f"Case queue full, dropped {action} case for {user_id} in {guild_id}")
+
+    async def _write_loop(self):
+        # Whatever queues up while a batch is being written goes into the next batch
+        while True:
+            rows = [await self._queue.get()]
+            while len(rows) < self.batch_size and not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            try:
+                await self._run(self._write_batch, rows)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(rows)} cases: {e}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    async def flush(self):
+        """Wait until everything queued so far has been written."""
+        if self._writer is not None and not self._writer.done():
+            await self._queue.join()
+
+    async def close(self):
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+        if self._conn is not None:
+            await self._run(self._conn.close)
+        self._executor.shutdown(wait=False)
+
+    async def history(self, guild_id, user_id, before_id=None, limit=10) -> list:
+        """Newest cases against a user, older than ``before_id`` when paging."""
+        await self.flush()
+        return await self._run(
+            self._query,
+            'SELECT * FROM cases WHERE guild_id = ? AND user_id = ? AND id < ? ORDER BY id DESC LIMIT ?',
+            (guild_id, user_id, before_id or 2 ** 63 - 1, limit)
+        )
+
+    async def cases(self, guild_id, moderator_id=None, before_id=None, limit=10) -> list:
+        """Newest cases in a guild, optionally only those by one moderator."""
+        await self.flush()
+        if moderator_id is None:
+            sql = 'SELECT * FROM cases WHERE guild_id = ? AND id < ? ORDER BY id DESC LIMIT ?'
+            params = (guild_id, before_id or 2 ** 63 - 1, limit)
+        else:
+            sql = ('SELECT * FROM cases WHERE guild_id = ? AND moderator_id = ? AND id < ? '
+                   'ORDER BY id DESC LIMIT ?')
+            params = (guild_id, moderator_id, before_id or 2 ** 63 - 1, limit)
+        return await self._run(self._query, sql, params)
+
+    async def iter_cases(self, guild_id, user_id=None, moderator_id=None, action=None, since=None, page_size=1000):
+        """Yield a guild's matching cases oldest first, fetching ``page_size`` at a time.
+
+        Only one page is held at once, so exports of any size stream in
+        constant memory. ``since`` is a Unix time.
+        """
+        await self.flush()
+        sql = 'SELECT * FROM cases WHERE guild_id = ? AND id > ?'
+        filters = []
+        for column, value in (('user_id', user_id), ('moderator_id', moderator_id), ('action', action)):
+            if value is not None:
+                sql += f' AND {column} = ?'
+                filters.append(value)
+        if since is not None:
+            sql += ' AND created_at >= ?'
+            filters.append(since)
+        sql += ' ORDER BY id LIMIT ?'
+        after_id = 0
+        while True:
+            page = await self._run(self._query, sql, (guild_id, after_id, *filters, page_size))
+            for case in page:
+                yield case
+            if len(page) < page_size:
+                return
+            after_id = page[-1].id
+
+    async def audit_cursor(self, guild_id):
+        """ID of the last audit log entry imported for a guild, or None before the first sync."""
+        return await self._run(self._audit_cursor, guild_id)
+
+    async def record_audit(self, guild_id, rows, entry_id):
+        """Store cases imported from the audit log and advance the guild's cursor in one transaction.
+
+        Each row is ``(user_id, moderator_id, action, reason, duration, created_at)``.
+        """
+        await self._run(self._write_audit, guild_id, rows, entry_id)
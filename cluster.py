@@ -0,0 +1,421 @@
+"""
+Multi-process cluster launcher.
+Splits the bot's shards into contiguous ranges and runs each range in its own
+``bot.py`` worker process, so guild events are spread over every core. The
+launcher watches worker heartbeats, restarts crashed or hung workers and
+relays cross-cluster queries over a local line-delimited JSON channel.
+
+Usage: python cluster.py
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import secrets
+import signal
+import sys
+import time
+
+import aiohttp
+
+from config import Config
+from log_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot.py')
+GATEWAY_URL = 'https://discord.com/api/v10/gateway/bot'
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> list:
+    """Split shard IDs 0..shard_count-1 into at most ``cluster_count`` contiguous ranges."""
+    cluster_count = max(1, min(cluster_count, shard_count))
+    size, extra = divmod(shard_count, cluster_count)
+    ranges, start = [], 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def recommended_shards(token: str) -> int:
+    """Ask Discord how many shards the bot should run."""
+    headers = {'Authorization': f'Bot {token}'}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_URL, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data['shards']
+
+
+async def _send(writer, message: dict):
+    writer.write(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+    await writer.drain()
+
+
+class Worker:
+    """Launcher-side state for one cluster process."""
+
+    def __init__(self, cluster_id, shard_ids):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.process = None
+        self.writer = None
+        self.ready = asyncio.Event()
+        self.started_at = 0.0
+        self.last_heartbeat = 0.0
+        self.stats = {}
+        self.failures = 0
+        self.restarting = False
+
+    def __str__(self):
+        return f"cluster {self.cluster_id} (shards {self.shard_ids[0]}-{self.shard_ids[-1]})"
+
+
+class ClusterLauncher:
+    """Starts one worker per shard range and keeps them running.
+
+    Workers are started one at a time, each waiting for the previous one to
+    report READY, because Discord only allows one shard to identify at a time.
+    A worker that exits, or stops sending heartbeats for
+    ``Config.CLUSTER_HEARTBEAT_TIMEOUT`` seconds, is restarted with exponential
+    backoff.
+    """
+
+    def __init__(self, token, shard_count=0, cluster_count=0, host=None, port=None):
+        self.token = token
+        self.shard_count = shard_count
+        self.cluster_count = cluster_count or os.cpu_count() or 1
+        self.host = host or Config.CLUSTER_IPC_HOST
+        self.port = port or Config.CLUSTER_IPC_PORT
+        self.secret = secrets.token_hex(16)
+        self.workers = {}
+        self._server = None
+        self._pending = {}
+        self._request_ids = itertools.count(1)
+        self._identify_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+
+    # Worker processes
+
+    def _worker_env(self, worker: Worker) -> dict:
+        env = dict(os.environ)
+        root, ext = os.path.splitext(Config.LOG_FILE)
+        env.update({
+            'DISCORD_BOT_TOKEN': self.token,
+            'SHARDED': 'true',
+            'SHARD_COUNT': str(self.shard_count),
+            'SHARD_IDS': ','.join(str(s) for s in worker.shard_ids),
+            'CLUSTER_ID': str(worker.cluster_id),
+            'CLUSTER_IPC_HOST': self.host,
+            'CLUSTER_IPC_PORT': str(self.port),
+            'CLUSTER_IPC_SECRET': self.secret,
+            # Separate files so workers never rotate each other's log
+            'LOG_FILE': f"{root}.cluster{worker.cluster_id}{ext or '.log'}",
+        })
+        return env
+
+    async def _start_worker(self, worker: Worker):
+        """Spawn a worker and hold the identify lock until it is READY (or times out)."""
+        async with self._identify_lock:
+            if self._stopping.is_set():
+                return
+            worker.ready.clear()
+            worker.stats = {}
+            worker.started_at = worker.last_heartbeat = time.monotonic()
+            worker.process = await asyncio.create_subprocess_exec(
+                sys.executable, BOT_SCRIPT, env=self._worker_env(worker)
+            )
+            logger.info(f"Started {worker} as pid {worker.process.pid}")
+            # Stop waiting early if the worker dies; the monitor restarts it
+            ready = asyncio.create_task(worker.ready.wait())
+            exited = asyncio.create_task(worker.process.wait())
+            await asyncio.wait((ready, exited), timeout=Config.CLUSTER_READY_TIMEOUT,
+                               return_when=asyncio.FIRST_COMPLETED)
+            ready.cancel()
+            exited.cancel()
+            if worker.ready.is_set():
+                logger.info(f"{worker} is ready")
+            elif worker.process.returncode is None:
+                logger.warning(f"{worker} not ready after {Config.CLUSTER_READY_TIMEOUT}s, starting the next cluster")
+
+    async def _restart_worker(self, worker: Worker, reason: str):
+        worker.restarting = True
+        try:
+            worker.failures += 1
+            delay = min(Config.CLUSTER_RESTART_MAX_DELAY, 2 ** (worker.failures - 1))
+            logger.warning(f"Restarting {worker} in {delay}s: {reason}")
+            await self._stop_process(worker)
+            await asyncio.sleep(delay)
+            await self._start_worker(worker)
+        finally:
+            worker.restarting = False
+
+    async def _stop_process(self, worker: Worker, grace=10.0):
+        process = worker.process
+        if process is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def _monitor(self):
+        """Restart workers that exited or stopped heartbeating."""
+        while not self._stopping.is_set():
+            await asyncio.sleep(Config.CLUSTER_HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            for worker in self.workers.values():
+                if worker.restarting or worker.process is None:
+                    continue
+                if worker.process.returncode is not None:
+                    reason = f"exited with code {worker.process.returncode}"
+                elif now - worker.last_heartbeat > Config.CLUSTER_HEARTBEAT_TIMEOUT:
+                    reason = f"no heartbeat for {now - worker.last_heartbeat:.0f}s"
+                else:
+                    # A worker that has stayed healthy for a while starts its backoff over
+                    if worker.failures and worker.ready.is_set() and now - worker.started_at > Config.CLUSTER_RESTART_MAX_DELAY * 5:
+                        worker.failures = 0
+                    continue
+                asyncio.create_task(self._restart_worker(worker, reason))
+
+    # IPC
+
+    async def _handle_connection(self, reader, writer):
+        worker = None
+        try:
+            async for line in reader:
+                message = json.loads(line)
+                op = message.get('op')
+                if worker is None:
+                    if op != 'hello' or not secrets.compare_digest(str(message.get('secret', '')), self.secret):
+                        logger.warning("Rejected IPC connection with a bad handshake")
+                        break
+                    worker = self.workers.get(message.get('cluster'))
+                    if worker is None:
+                        break
+                    worker.writer = writer
+                    worker.last_heartbeat = time.monotonic()
+                    if message.get('ready'):
+                        worker.ready.set()
+                elif op == 'heartbeat':
+                    worker.last_heartbeat = time.monotonic()
+                    worker.stats = message.get('stats', {})
+                elif op == 'ready':
+                    worker.ready.set()
+                elif op == 'query':
+                    asyncio.create_task(self._answer_query(writer, message))
+                elif op == 'response':
+                    future = self._pending.get(message.get('id'))
+                    if future is not None and not future.done():
+                        future.set_result(message.get('data'))
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"IPC connection error: {e}")
+        finally:
+            if worker is not None and worker.writer is writer:
+                worker.writer = None
+            writer.close()
+
+    async def query(self, name, args=None, timeout=5.0) -> dict:
+        """Ask every connected worker to run handler ``name``; returns {cluster_id: result}."""
+        requests = {}
+        loop = asyncio.get_running_loop()
+        for worker in self.workers.values():
+            if worker.writer is None:
+                continue
+            request_id = next(self._request_ids)
+            future = self._pending[request_id] = loop.create_future()
+            requests[worker.cluster_id] = (request_id, future)
+            try:
+                await _send(worker.writer, {'op': 'request', 'id': request_id, 'name': name, 'args': args or {}})
+            except ConnectionError:
+                future.cancel()
+
+        results = {}
+        try:
+            for cluster_id, (request_id, future) in requests.items():
+                try:
+                    results[cluster_id] = await asyncio.wait_for(future, timeout)
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    logger.warning(f"Cluster {cluster_id} did not answer '{name}' within {timeout}s")
+        finally:
+            for request_id, _ in requests.values():
+                self._pending.pop(request_id, None)
+        return results
+
+    async def _answer_query(self, writer, message):
+        results = await self.query(message.get('name'), message.get('args'), message.get('timeout', 5.0))
+        try:
+            await _send(writer, {'op': 'result', 'id': message.get('id'), 'data': results})
+        except ConnectionError:
+            pass
+
+    # Lifecycle
+
+    async def run(self):
+        if not self.shard_count:
+            self.shard_count = await recommended_shards(self.token)
+        ranges = shard_ranges(self.shard_count, self.cluster_count)
+        self.workers = {i: Worker(i, shard_ids) for i, shard_ids in enumerate(ranges)}
+        logger.info(f"Launching {len(ranges)} clusters for {self.shard_count} shards")
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows; Ctrl+C still raises KeyboardInterrupt
+
+        monitor = asyncio.create_task(self._monitor())
+        try:
+            for worker in self.workers.values():
+                await self._start_worker(worker)
+            await self._stopping.wait()
+        finally:
+            self._stopping.set()
+            monitor.cancel()
+            logger.info("Stopping clusters")
+            await asyncio.gather(*(self._stop_process(w) for w in self.workers.values()))
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class ClusterClient:
+    """Worker-side end of the IPC channel.
+
+    Sends heartbeats with basic stats, answers requests relayed by the launcher
+    using registered handlers, and lets cogs query every cluster.
+    """
+
+    def __init__(self, bot, cluster_id, host, port, secret):
+        self.bot = bot
+        self.cluster_id = cluster_id
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.handlers = {'stats': self.stats}
+        self.ready = False
+        self._writer = None
+        self._task = None
+        self._pending = {}
+        self._request_ids = itertools.count(1)
+
+    def handler(self, name):
+        """Register ``func(**args)`` (sync or async) to answer cross-cluster query ``name``."""
+        def decorator(func):
+            self.handlers[name] = func
+            return func
+        return decorator
+
+    def stats(self) -> dict:
+        latency = self.bot.latency
+        return {
+            'guilds': len(self.bot.guilds),
+            'members': sum(guild.member_count or 0 for guild in self.bot.guilds),
+            'shards': sorted(getattr(self.bot, 'shards', {}) or []),
+            'latency': latency if latency == latency and latency != float('inf') else None,
+        }
+
+    def start(self):
+        """Connect in the background (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def mark_ready(self):
+        self.ready = True
+        if self._writer is not None:
+            await _send(self._writer, {'op': 'ready'})
+
+    async def query(self, name, timeout=5.0, **args) -> dict:
+        """Run handler ``name`` on every cluster; returns {cluster_id: result}.
+
+        Raises ConnectionError when the launcher is unreachable and TimeoutError
+        when it does not answer in time.
+        """
+        if self._writer is None:
+            raise ConnectionError("Not connected to the cluster launcher")
+        request_id = next(self._request_ids)
+        future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            await _send(self._writer, {'op': 'query', 'id': request_id, 'name': name, 'args': args, 'timeout': timeout})
+            # The launcher waits up to ``timeout`` per cluster, so allow for that here
+            data = await asyncio.wait_for(future, timeout * 2)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Cluster query '{name}' timed out") from None
+        finally:
+            self._pending.pop(request_id, None)
+        return {int(cluster_id): result for cluster_id, result in data.items()}
+
+    async def total_guilds(self) -> int:
+        return sum(stats['guilds'] for stats in (await self.query('stats')).values())
+
+    async def _run(self):
+        delay = 1
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.warning(f"Cannot reach cluster launcher at {self.host}:{self.port}: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+            delay = 1
+            self._writer = writer
+            heartbeat = asyncio.create_task(self._heartbeat(writer))
+            try:
+                await _send(writer, {'op': 'hello', 'cluster': self.cluster_id, 'secret': self.secret, 'ready': self.ready})
+                async for line in reader:
+                    message = json.loads(line)
+                    if message.get('op') == 'request':
+                        asyncio.create_task(self._answer(writer, message))
+                    elif message.get('op') == 'result':
+                        future = self._pending.get(message.get('id'))
+                        if future is not None and not future.done():
+                            future.set_result(message.get('data', {}))
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Cluster IPC connection lost: {e}")
+            finally:
+                heartbeat.cancel()
+                self._writer = None
+                writer.close()
+            await asyncio.sleep(delay)
+
+    async def _heartbeat(self, writer):
+        while True:
+            await _send(writer, {'op': 'heartbeat', 'stats': self.stats()})
+            await asyncio.sleep(Config.CLUSTER_HEARTBEAT_INTERVAL)
+
+    async def _answer(self, writer, message):
+        handler = self.handlers.get(message.get('name'))
+        data = None
+        if handler is not None:
+            try:
+                data = handler(**message.get('args', {}))
+                if asyncio.iscoroutine(data):
+                    data = await data
+            except Exception as e:
+                logger.error(f"Cluster query '{message.get('name')}' failed: {e}")
+        try:
+            await _send(writer, {'op': 'response', 'id': message.get('id'), 'data': data})
+        except ConnectionError:
+            pass
+
+
+if __name__ == "__main__":
+    setup_logging()
+    token = os.getenv('DISCORD_BOT_TOKEN')
+    if not token:
+        logger.error("DISCORD_BOT_TOKEN environment variable not found!")
+        exit(1)
+
+    launcher = ClusterLauncher(token, Config.SHARD_COUNT, Config.CLUSTER_COUNT)
+    try:
+        asyncio.run(launcher.run())
+    except KeyboardInterrupt:
+        pass
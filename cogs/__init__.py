@@ -0,0 +1,43 @@
+"""
+Bot extensions.
+Each module holds one area's cogs and an async ``setup(bot)``, so it can be
+loaded with ``bot.load_extension`` and reloaded without restarting the bot.
+Shared state lives in ``core``.
+"""
+
+import asyncio
+import logging
+import time
+
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+# None of these needs another loaded first, so they are loaded concurrently
+EXTENSIONS = [
+    'cogs.moderation',
+    'cogs.cases',
+    'cogs.information',
+    'cogs.automod',
+    'cogs.raid',
+    'cogs.policy',
+    'cogs.modlog',
+    'cogs.audit',
+    'cogs.admin',
+    'cogs.help',
+]
+
+
+async def load_extensions(bot, names=EXTENSIONS) -> dict:
+    """Load extensions concurrently; returns each one's load time in seconds, or None if it failed."""
+    async def load(name):
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(name)
+        except commands.ExtensionError as e:
+            # One broken extension should not keep the rest of the bot offline
+            logger.error(f"Failed to load extension {name}: {e}")
+            return name, None
+        return name, time.perf_counter() - start
+
+    return dict(await asyncio.gather(*(load(name) for name in names)))
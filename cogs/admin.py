@@ -0,0 +1,76 @@
+"""
+Bot owner commands: reloading extensions without a restart.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from cogs import EXTENSIONS
+from config import Config
+from core import command_syncer, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Admin(commands.Cog):
+    """Commands for the bot's owner."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    @discord.app_commands.command(name="reload", description="Reload a bot extension (bot owner only)")
+    @discord.app_commands.describe(extension="The extension to reload, or all of them")
+    @discord.app_commands.choices(extension=[
+        discord.app_commands.Choice(name=name.split('.')[-1], value=name) for name in ['all'] + EXTENSIONS
+    ])
+    async def reload(self, interaction: discord.Interaction, extension: str):
+        """Reload one extension, or every extension."""
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("❌ Only the bot owner can reload extensions!", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        names = EXTENSIONS if extension == 'all' else [extension]
+        reloaded = []
+        failed = []
+        start = time.perf_counter()
+        for name in names:
+            try:
+                # discord.py keeps the old version loaded when the new one fails
+                await self.bot.reload_extension(name)
+                reloaded.append(name)
+            except commands.ExtensionError as e:
+                failed.append(f"`{name}`: {e}")
+                logger.error(f"Failed to reload extension {name}: {e}")
+        elapsed = time.perf_counter() - start
+        
+        # Reloaded commands are new objects: wrap them again and push any changed signatures
+        if Config.FEATURES['metrics']:
+            metrics.instrument_commands(self.bot.tree)
+        try:
+            synced = await command_syncer.resync()
+        except discord.HTTPException as e:
+            synced = 0
+            failed.append(f"Command sync: {e}")
+        
+        embed = discord.Embed(
+            title="🔄 Extensions Reloaded" if not failed else "⚠️ Reload Incomplete",
+            description=(
+                f"**Reloaded:** {', '.join(f'`{name}`' for name in reloaded) or 'nothing'} in {elapsed * 1000:.0f}ms\n"
+                f"**Command scopes synced:** {synced}"
+            ),
+            color=Config.COLORS['SUCCESS'] if not failed else Config.COLORS['WARNING'],
+            timestamp=datetime.now()
+        )
+        if failed:
+            embed.add_field(name="Failed", value='\n'.join(failed)[:1024], inline=False)
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        logger.info(f"{interaction.user} reloaded {', '.join(reloaded) or 'nothing'} ({len(failed)} failed)")
+
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,189 @@
+"""
+Message audit: deleted and edited messages in the mod log.
+Uses raw gateway events, which arrive whether or not discord.py cached the
+message, and looks the old content up in the compact snapshot cache.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from config import Config
+from core import mod_log, modlog_store, snapshot_cache
+from snapshots import MessageSnapshot
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_CHARS = 3500           # Room left in a bulk delete summary for its transcript
+LINE_CHARS = 200                  # Per message in a transcript
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def _quote(content, limit=1024):
+    return _clip(discord.utils.escape_markdown(content), limit) if content else "*(no text)*"
+
+
+class BulkDelete:
+    """Bulk deletes in one channel gathered into a single summary, e.g. the batches of one /clear."""
+    
+    __slots__ = ('guild_id', 'channel_id', 'deleted', 'cached', 'authors', 'lines', 'chars', 'last', 'task')
+    
+    def __init__(self, guild_id, channel_id):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.deleted = 0
+        self.cached = 0
+        self.authors = Counter()
+        self.lines = []
+        self.chars = 0
+        self.last = time.monotonic()
+        self.task = None
+    
+    def add(self, count, snapshots):
+        self.deleted += count
+        self.cached += len(snapshots)
+        self.last = time.monotonic()
+        for snapshot in snapshots:
+            self.authors[snapshot.author] += 1
+            if self.chars < TRANSCRIPT_CHARS:
+                line = _clip(f"**{discord.utils.escape_markdown(snapshot.author)}:** "
+                             f"{discord.utils.escape_markdown(snapshot.content) or '*(attachment)*'}", LINE_CHARS)
+                self.lines.append(line)
+                self.chars += len(line) + 1
+    
+    def embed(self):
+        embed = discord.Embed(
+            title="🗑️ Messages Bulk Deleted",
+            description='\n'.join(self.lines) or "*(none of the messages were cached)*",
+            color=Config.COLORS['ERROR'],
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="Channel", value=f"<#{self.channel_id}>", inline=True)
+        embed.add_field(name="Deleted", value=f"{self.deleted} ({self.cached} cached)", inline=True)
+        if self.authors:
+            embed.add_field(
+                name="Top Authors",
+                value='\n'.join(f"{discord.utils.escape_markdown(name)}: {count}" for name, count in self.authors.most_common(5)),
+                inline=True
+            )
+        shown = len(self.lines)
+        if shown < self.cached:
+            embed.set_footer(text=f"Showing {shown} of {self.cached} cached messages")
+        return embed
+
+
+class MessageAudit(commands.Cog):
+    """Logs deleted and edited messages to the mod log."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self._bulk = {}
+    
+    async def cog_unload(self):
+        # Send what has been gathered rather than losing it on reload
+        for pending in list(self._bulk.values()):
+            pending.task.cancel()
+            await mod_log.log(pending.guild_id, pending.embed())
+        self._bulk.clear()
+    
+    @staticmethod
+    def _audited(guild_id):
+        return Config.FEATURES['message_audit'] and guild_id is not None and modlog_store.get(guild_id) is not None
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Snapshot guild messages from members in servers with a mod log."""
+        if message.guild is None or message.author.bot or not self._audited(message.guild.id):
+            return
+        snapshot_cache.add(message.guild.id, MessageSnapshot.from_message(message))
+    
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Log a deleted message's last known content."""
+        if not self._audited(payload.guild_id):
+            return
+        snapshot = snapshot_cache.pop(payload.guild_id, payload.message_id)
+        if snapshot is None:
+            # Bot messages and ones older than the cache are not worth an entry without their content
+            return
+        
+        embed = discord.Embed(
+            title="🗑️ Message Deleted",
+            description=_quote(snapshot.content, 4000),
+            color=Config.COLORS['ERROR'],
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="Author", value=f"<@{snapshot.author_id}> ({discord.utils.escape_markdown(snapshot.author)})", inline=True)
+        embed.add_field(name="Channel", value=f"<#{snapshot.channel_id}>", inline=True)
+        embed.add_field(name="Sent", value=f"<t:{int(snapshot.created)}:R>", inline=True)
+        if snapshot.attachments:
+            embed.add_field(name="Attachments", value=_clip('\n'.join(snapshot.attachments), 1024), inline=False)
+        embed.set_footer(text=f"Message ID: {snapshot.id}")
+        await mod_log.log(payload.guild_id, embed)
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Gather a channel's bulk deletes and log them as one summary once they stop."""
+        if not self._audited(payload.guild_id):
+            return
+        snapshots = snapshot_cache.pop_many(payload.guild_id, payload.message_ids)
+        key = (payload.guild_id, payload.channel_id)
+        pending = self._bulk.get(key)
+        if pending is None:
+            pending = self._bulk[key] = BulkDelete(payload.guild_id, payload.channel_id)
+            pending.task = asyncio.create_task(self._flush_bulk(key, pending))
+        pending.add(len(payload.message_ids), snapshots)
+    
+    async def _flush_bulk(self, key, pending):
+        while True:
+            await asyncio.sleep(Config.MESSAGE_AUDIT_BULK_WINDOW)
+            if time.monotonic() - pending.last >= Config.MESSAGE_AUDIT_BULK_WINDOW:
+                break
+        del self._bulk[key]
+        await mod_log.log(pending.guild_id, pending.embed())
+    
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Log the before and after of an edited message."""
+        if not self._audited(payload.guild_id):
+            return
+        content = payload.data.get('content')
+        if content is None:
+            return
+        before = snapshot_cache.edit(payload.guild_id, payload.message_id, content)
+        if before is None:
+            # Not seen before (sent before the bot started or expired); remember it from now on
+            author = payload.data.get('author')
+            if author is not None and not author.get('bot'):
+                snapshot_cache.add(payload.guild_id, MessageSnapshot.from_data(payload.data))
+            return
+        if before == content:
+            # Embed unfurls and pins also arrive as edits
+            return
+        
+        # Built from the payload and the snapshot; RawMessageUpdateEvent.message needs discord.py 2.5
+        snapshot = snapshot_cache.get(payload.guild_id, payload.message_id)
+        jump_url = f"https://discord.com/channels/{payload.guild_id}/{payload.channel_id}/{payload.message_id}"
+        embed = discord.Embed(
+            title="✏️ Message Edited",
+            description=f"[Jump to message]({jump_url})",
+            color=Config.COLORS['WARNING'],
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="Before", value=_quote(before), inline=False)
+        embed.add_field(name="After", value=_quote(content), inline=False)
+        embed.add_field(name="Author", value=f"<@{snapshot.author_id}> ({discord.utils.escape_markdown(snapshot.author)})", inline=True)
+        embed.add_field(name="Channel", value=f"<#{payload.channel_id}>", inline=True)
+        embed.set_footer(text=f"Message ID: {payload.message_id}")
+        await mod_log.log(payload.guild_id, embed)
+
+async def setup(bot):
+    await bot.add_cog(MessageAudit(bot))
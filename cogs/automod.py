@@ -0,0 +1,248 @@
+"""
+Auto-moderation: flood detection, spam campaigns, blocked links and the per-server word filter.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+import discord
+from discord.ext import commands
+
+import mass_actions
+from automod import WordFilterStore
+from blocklist import Blocklist
+from campaigns import CampaignDetector
+from config import Config
+from core import case_store, member_cache, mod_log, policy_store
+from purge import BULK_DELETE_BATCH
+from spam import SpamDetector
+
+logger = logging.getLogger(__name__)
+
+
+class AutoModeration(commands.Cog):
+    """Message filtering: flood detection, spam campaigns, blocked links and per-guild banned-term lists."""
+    
+    filter_group = discord.app_commands.Group(name="filter", description="Manage the word filter")
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.word_filters = WordFilterStore(Config.AUTOMOD_TERMS_FILE, whole_words=Config.AUTOMOD_WHOLE_WORDS)
+        self.spam = SpamDetector(Config.SPAM_THRESHOLDS, max_tracked=Config.SPAM_MAX_TRACKED)
+        self.campaigns = CampaignDetector(
+            accounts=Config.CAMPAIGN_ACCOUNTS,
+            seconds=Config.CAMPAIGN_SECONDS,
+            max_distance=Config.CAMPAIGN_MAX_DISTANCE,
+            min_length=Config.CAMPAIGN_MIN_LENGTH,
+            window=Config.CAMPAIGN_WINDOW
+        )
+        self.links = None
+        if os.path.exists(Config.LINK_BLOCKLIST_FILE):
+            try:
+                self.links = Blocklist(Config.LINK_BLOCKLIST_FILE, Config.LINK_BLOCKLIST_RELOAD_INTERVAL)
+                logger.info(f"Loaded link blocklist with {len(self.links)} domains")
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load link blocklist {Config.LINK_BLOCKLIST_FILE}: {e}")
+    
+    async def cog_unload(self):
+        if self.links is not None:
+            self.links.close()
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Run the spam detector and word filter on every guild message."""
+        if message.guild is None or message.author.bot:
+            return
+        if message.author.guild_permissions.manage_messages:
+            return
+        
+        if Config.FEATURES['spam_protection'] and await self.check_spam(message):
+            return
+        if Config.FEATURES['campaign_protection'] and await self.check_campaign(message):
+            return
+        if Config.FEATURES['auto_moderation']:
+            if await self.check_links(message):
+                return
+            await self.check_words(message)
+    
+    async def check_spam(self, message: discord.Message) -> bool:
+        """Timeout members who trip a flood threshold."""
+        tripped = self.spam.record_message(message)
+        if tripped is None:
+            return False
+        
+        self.spam.reset(message.guild.id, message.author.id)
+        try:
+            timeout_until = datetime.now().astimezone() + timedelta(minutes=Config.SPAM_TIMEOUT_MINUTES)
+            await message.author.timeout(timeout_until, reason=f"Spam detected ({tripped})")
+            await message.channel.send(
+                f"🔇 {message.author.mention} has been timed out for {Config.SPAM_TIMEOUT_MINUTES} minutes for spamming.",
+                delete_after=Config.AUTOMOD_WARNING_SECONDS
+            )
+            case_store.record(
+                message.guild.id, message.author.id, self.bot.user.id, 'timeout',
+                f"Spam detected ({tripped})", Config.SPAM_TIMEOUT_MINUTES * 60
+            )
+            logger.info(f"Spam detector timed out {message.author} in {message.guild.name} ({tripped})")
+        except discord.HTTPException as e:
+            logger.error(f"Spam timeout error: {e}")
+        return True
+    
+    async def check_campaign(self, message: discord.Message) -> bool:
+        """Bulk delete copies of a message posted by several accounts and time the accounts out."""
+        if not message.content:
+            return False
+        hit = self.campaigns.check(message.guild.id, message.channel.id, message.id, message.author.id, message.content)
+        if hit is None:
+            return False
+        
+        campaign, found = hit
+        guild = message.guild
+        reason = f"Spam campaign #{campaign.id}"
+        # Claimed before any await so concurrent copies from the same account are not actioned twice
+        author_ids = {author_id for _, _, author_id in found} - campaign.actioned
+        campaign.actioned.update(author_ids)
+        # Members the policy protects from the timeout keep their messages as well
+        guild_policy = policy_store.get(guild)
+        members = await member_cache.get_many(guild, {author_id for _, _, author_id in found})
+        exempt = {
+            user_id for user_id, member in members.items()
+            if guild_policy.may_act(guild.me, member, guild.me) is not None
+        }
+        by_channel = {}
+        for channel_id, message_id, author_id in found:
+            if author_id not in exempt:
+                by_channel.setdefault(channel_id, []).append(discord.Object(id=message_id))
+        deleted = 0
+        for channel_id, messages in by_channel.items():
+            channel = message.channel if channel_id == message.channel.id else guild.get_channel_or_thread(channel_id)
+            if channel is None:
+                continue
+            for i in range(0, len(messages), BULK_DELETE_BATCH):
+                chunk = messages[i:i + BULK_DELETE_BATCH]
+                try:
+                    await channel.delete_messages(chunk, reason=reason)
+                    deleted += len(chunk)
+                except discord.HTTPException as e:
+                    logger.error(f"Campaign delete error in #{channel}: {e}")
+        
+        result = mass_actions.MassActionResult()
+        targets = [members[user_id] for user_id in author_ids if user_id in members and user_id not in exempt]
+        if targets:
+            until = datetime.now().astimezone() + timedelta(minutes=Config.CAMPAIGN_TIMEOUT_MINUTES)
+            await mass_actions.mass_timeout(targets, until, reason, result)
+            for user_id in result.succeeded:
+                case_store.record(guild.id, user_id, self.bot.user.id, 'timeout', reason, Config.CAMPAIGN_TIMEOUT_MINUTES * 60)
+        
+        if len(found) > 1 or result.succeeded:
+            embed = discord.Embed(
+                title=f"🧹 Spam Campaign #{campaign.id}",
+                description=(
+                    f"**Message:** {discord.utils.escape_markdown(campaign.preview)[:300]}\n"
+                    f"**Accounts so far:** {len(campaign.authors)}\n"
+                    f"**Deleted:** {deleted} message(s) in {len(by_channel)} channel(s)\n"
+                    f"**Timed out:** {len(result.succeeded)} ({len(result.failed)} failed)"
+                ),
+                color=Config.COLORS['WARNING'],
+                timestamp=datetime.now()
+            )
+            await mod_log.log(guild.id, embed)
+        logger.info(
+            f"Campaign #{campaign.id} in {guild.name}: deleted {deleted} messages, "
+            f"timed out {len(result.succeeded)} of {len(author_ids)} new accounts"
+        )
+        return True
+    
+    async def check_links(self, message: discord.Message) -> bool:
+        """Delete messages linking to a blocklisted domain or any of its subdomains."""
+        if self.links is None or not message.content:
+            return False
+        
+        domain = self.links.find(message.content)
+        if domain is None:
+            return False
+        
+        try:
+            await message.delete()
+            await message.channel.send(
+                f"⚠️ {message.author.mention}, your message contained a blocked link.",
+                delete_after=Config.AUTOMOD_WARNING_SECONDS
+            )
+            logger.info(f"Link filter removed a message from {message.author} in {message.guild.name} (matched '{domain}')")
+        except discord.HTTPException as e:
+            logger.error(f"Link filter error: {e}")
+        return True
+    
+    async def check_words(self, message: discord.Message):
+        """Delete messages containing banned terms."""
+        if not message.content:
+            return
+        
+        term = self.word_filters.get(message.guild.id).find(message.content)
+        if term is None:
+            return
+        
+        try:
+            await message.delete()
+            await message.channel.send(
+                f"⚠️ {message.author.mention}, your message contained a blocked word.",
+                delete_after=Config.AUTOMOD_WARNING_SECONDS
+            )
+            logger.info(f"Word filter removed a message from {message.author} in {message.guild.name} (matched '{term}')")
+        except discord.HTTPException as e:
+            logger.error(f"Word filter error: {e}")
+    
+    @filter_group.command(name="add", description="Add blocked words (comma separated)")
+    @discord.app_commands.describe(words="Words or phrases to block, separated by commas")
+    async def filter_add(self, interaction: discord.Interaction, words: str):
+        """Add terms to the guild's word filter."""
+        if not policy_store.get(interaction.guild).may_use(interaction.user, 'filter', 'manage_guild'):
+            await interaction.response.send_message(
+                "❌ You don't have permission to manage the word filter!",
+                ephemeral=True
+            )
+            return
+        
+        added = await self.word_filters.add(interaction.guild.id, words.split(','))
+        await interaction.response.send_message(f"✅ Added {added} word(s) to the filter.", ephemeral=True)
+        logger.info(f"{interaction.user} added {added} filter words in {interaction.guild.name}")
+    
+    @filter_group.command(name="remove", description="Remove blocked words (comma separated)")
+    @discord.app_commands.describe(words="Words or phrases to unblock, separated by commas")
+    async def filter_remove(self, interaction: discord.Interaction, words: str):
+        """Remove terms from the guild's word filter."""
+        if not policy_store.get(interaction.guild).may_use(interaction.user, 'filter', 'manage_guild'):
+            await interaction.response.send_message(
+                "❌ You don't have permission to manage the word filter!",
+                ephemeral=True
+            )
+            return
+        
+        removed = await self.word_filters.remove(interaction.guild.id, words.split(','))
+        await interaction.response.send_message(f"✅ Removed {removed} word(s) from the filter.", ephemeral=True)
+        logger.info(f"{interaction.user} removed {removed} filter words in {interaction.guild.name}")
+    
+    @filter_group.command(name="list", description="Show the blocked words")
+    async def filter_list(self, interaction: discord.Interaction):
+        """List the guild's filtered terms."""
+        if not policy_store.get(interaction.guild).may_use(interaction.user, 'filter', 'manage_guild'):
+            await interaction.response.send_message(
+                "❌ You don't have permission to manage the word filter!",
+                ephemeral=True
+            )
+            return
+        
+        terms = self.word_filters.terms(interaction.guild.id)
+        embed = discord.Embed(
+            title="🚫 Word Filter",
+            description=", ".join(f"`{term}`" for term in terms)[:4000] if terms else "No blocked words",
+            color=Config.COLORS['INFO'],
+            timestamp=datetime.now()
+        )
+        embed.set_footer(text=f"{len(terms)} word(s) | Auto-moderation {'enabled' if Config.FEATURES['auto_moderation'] else 'disabled'}")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(AutoModeration(bot))
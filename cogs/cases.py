@@ -0,0 +1,179 @@
+"""
+Moderation case history commands.
+"""
+
+import io
+import logging
+import time
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+import export
+from config import Config
+from core import case_store, policy_store
+
+logger = logging.getLogger(__name__)
+
+
+class CasePager(discord.ui.View):
+    """Pages through cases newest first using the last shown case ID as the cursor."""
+    
+    def __init__(self, author_id, title, fetch):
+        super().__init__(timeout=120)
+        self.author_id = author_id
+        self.title = title
+        self.fetch = fetch
+        self.cursor = None
+        self.page = 1
+    
+    async def load(self):
+        """Fetch the next page and build its embed."""
+        cases = await self.fetch(self.cursor, Config.CASES_PER_PAGE + 1)
+        has_more = len(cases) > Config.CASES_PER_PAGE
+        cases = cases[:Config.CASES_PER_PAGE]
+        if cases:
+            self.cursor = cases[-1].id
+        self.older.disabled = not has_more
+        
+        embed = discord.Embed(
+            title=self.title,
+            description="\n".join(self.format_case(case) for case in cases) or "No cases found",
+            color=Config.COLORS['INFO'],
+            timestamp=datetime.now()
+        )
+        embed.set_footer(text=f"Page {self.page}")
+        return embed
+    
+    @staticmethod
+    def format_case(case):
+        line = f"`#{case.id}` **{case.action.upper()}** <@{case.user_id}> by <@{case.moderator_id}> <t:{int(case.created_at)}:R>"
+        if case.duration:
+            line += f" ({case.duration // 60} min)"
+        if case.reason:
+            line += f"\n↳ {case.reason[:100]}"
+        return line
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+    
+    @discord.ui.button(label="Older", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        embed = await self.load()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+
+class Cases(commands.Cog):
+    """Moderation case history commands."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def _send_pager(self, interaction, pager):
+        try:
+            embed = await pager.load()
+            await interaction.response.send_message(embed=embed, view=pager, ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(
+                f"❌ Failed to load cases: {str(e)}",
+                ephemeral=True
+            )
+            logger.error(f"Case lookup error: {e}")
+    
+    @discord.app_commands.command(name="history", description="Show the moderation history of a user")
+    @discord.app_commands.describe(user="The user to look up")
+    async def history(self, interaction: discord.Interaction, user: discord.User):
+        """Show cases against a user."""
+        if not policy_store.get(interaction.guild).may_use(interaction.user, 'history', 'moderate_members'):
+            await interaction.response.send_message(
+                "❌ You don't have permission to view moderation history!",
+                ephemeral=True
+            )
+            return
+        
+        async def fetch(before_id, limit):
+            return await case_store.history(interaction.guild.id, user.id, before_id=before_id, limit=limit)
+        
+        await self._send_pager(interaction, CasePager(interaction.user.id, f"📋 History for {user}", fetch))
+    
+    @discord.app_commands.command(name="cases", description="Show recent moderation cases")
+    @discord.app_commands.describe(moderator="Only show cases by this moderator")
+    async def cases(self, interaction: discord.Interaction, moderator: discord.Member = None):
+        """Show recent cases in the server."""
+        if not policy_store.get(interaction.guild).may_use(interaction.user, 'cases', 'moderate_members'):
+            await interaction.response.send_message(
+                "❌ You don't have permission to view moderation cases!",
+                ephemeral=True
+            )
+            return
+        
+        moderator_id = moderator.id if moderator else None
+        
+        async def fetch(before_id, limit):
+            return await case_store.cases(interaction.guild.id, moderator_id=moderator_id, before_id=before_id, limit=limit)
+        
+        title = f"📋 Cases by {moderator}" if moderator else "📋 Recent Cases"
+        await self._send_pager(interaction, CasePager(interaction.user.id, title, fetch))
+    
+    @discord.app_commands.command(name="modexport", description="Export moderation cases as CSV or JSON Lines")
+    @discord.app_commands.describe(
+        format="File format",
+        user="Only cases against this user",
+        moderator="Only cases by this moderator",
+        action="Only this action, e.g. ban or timeout",
+        days="Only cases from the last N days"
+    )
+    @discord.app_commands.choices(format=[
+        discord.app_commands.Choice(name="CSV", value="csv"),
+        discord.app_commands.Choice(name="JSON Lines", value="jsonl")
+    ])
+    async def modexport(self, interaction: discord.Interaction, format: str = 'csv', user: discord.User = None,
+                        moderator: discord.User = None, action: str = None, days: int = None):
+        """Stream matching cases into files no larger than the server's upload limit."""
+        if not policy_store.get(interaction.guild).may_use(interaction.user, 'modexport', 'view_audit_log'):
+            await interaction.response.send_message(
+                "❌ You don't have permission to export moderation cases!",
+                ephemeral=True
+            )
+            return
+        if days is not None and days < 1:
+            await interaction.response.send_message("❌ Days must be at least 1!", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        guild = interaction.guild
+        cases = case_store.iter_cases(
+            guild.id,
+            user_id=user.id if user else None,
+            moderator_id=moderator.id if moderator else None,
+            action=action.lower() if action else None,
+            since=time.time() - days * 86400 if days else None,
+            page_size=Config.EXPORT_PAGE_SIZE
+        )
+        max_bytes = min(Config.EXPORT_FILE_BYTES, guild.filesize_limit)
+        exported = files = 0
+        try:
+            # Each file is uploaded as soon as it is full, so only one is held in memory
+            async for part, count in export.chunks(export.encode(cases, format), max_bytes, export.header(format)):
+                files += 1
+                await interaction.followup.send(
+                    file=discord.File(io.BytesIO(part), filename=f"modexport-{guild.id}-{files}.{format}"),
+                    ephemeral=True
+                )
+                exported += count
+        except Exception as e:
+            await interaction.followup.send(f"❌ Export failed after {exported} cases: {str(e)}", ephemeral=True)
+            logger.error(f"Case export error: {e}")
+            return
+        
+        await interaction.followup.send(
+            f"✅ Exported {exported} cases in {files} file(s)." if exported else "No cases match those filters.",
+            ephemeral=True
+        )
+        logger.info(f"{interaction.user} exported {exported} cases from {guild.name}")
+
+
+async def setup(bot):
+    await bot.add_cog(Cases(bot))
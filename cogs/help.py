@@ -0,0 +1,80 @@
+"""
+The /help command.
+"""
+
+import discord
+from discord.ext import commands
+
+from config import Config
+
+
+class Help(commands.Cog):
+    """Help command for the bot."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    @discord.app_commands.command(name="help", description="Show available commands")
+    async def help_command(self, interaction: discord.Interaction):
+        """Show help information."""
+        embed = discord.Embed(
+            title="🛡️ Discord Moderation Bot - Help",
+            description="A simple and extensible Discord moderation bot with slash commands.",
+            color=Config.COLORS['INFO']
+        )
+        
+        embed.add_field(
+            name="🛡️ Moderation Commands",
+            value="`/kick` - Kick a member\n`/ban` - Ban a member\n`/timeout` - Timeout a member\n`/untimeout` - Remove timeout\n`/clear` - Clear messages\n`/massban` - Ban many users\n`/masstimeout` - Timeout many members\n`/removerole` - Remove a role (optionally temporary)",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="📋 Case Commands",
+            value="`/history` - Show a user's moderation history\n`/cases` - Show recent cases\n`/modexport` - Export cases as CSV or JSON Lines",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🚫 Auto-Moderation Commands",
+            value="`/filter add` - Block words\n`/filter remove` - Unblock words\n`/filter list` - Show blocked words",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🚨 Raid Commands",
+            value="`/lockdown start` - Lock the server down\n`/lockdown end` - Lift the lockdown\n`/lockdown status` - Show the lockdown status",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="👮 Policy Commands",
+            value="`/policy modrole` - Add or remove a mod role\n`/policy immune` - Add or remove an immune role\n`/policy command` - Set which roles may use a command\n`/policy cooldown` - Limit how often a command may be used\n`/policy show` - Show the policy",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="📜 Mod Log Commands",
+            value="`/modlog set` - Log moderation actions to a channel\n`/modlog disable` - Stop logging\n`/modlog status` - Show the mod log and its queue",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="📊 Information Commands",
+            value="`/userinfo` - Get user information\n`/serverinfo` - Get server information\n`/help` - Show this help",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🔧 Features",
+            value="• Slash commands\n• Permission checks\n• Beautiful embeds\n• Error handling\n• Logging\n• Extensible design",
+            inline=False
+        )
+        
+        embed.set_footer(text="Made with ❤️ for the Discord community")
+        
+        await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Help(bot))
@@ -0,0 +1,175 @@
+"""
+Information commands: /userinfo and /serverinfo.
+"""
+
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from config import Config
+from core import member_cache
+from stats import StatsTracker
+
+
+class Information(commands.Cog):
+    """Information commands for users and server."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.stats = StatsTracker()
+    
+    async def cog_load(self):
+        # Loaded or reloaded after READY: count the guilds that are already here
+        if self.bot.is_ready():
+            for guild in self.bot.guilds:
+                self.stats.rebuild(guild)
+    
+    # Keep /serverinfo counters current without rescanning members on the command path
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild):
+        # Fired for every guild on READY and after an outage, when events may have been missed
+        self.stats.rebuild(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.stats.rebuild(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_chunked(self, guild):
+        # Counters built before the guild was chunked only saw part of it
+        self.stats.rebuild(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.stats.invalidate(guild.id)
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.stats.member_join(member)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.stats.member_remove(member)
+    
+    @commands.Cog.listener()
+    async def on_presence_update(self, before, after):
+        self.stats.presence_update(before, after)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.stats.channel_create(channel)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.stats.channel_delete(channel)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.stats.role_delta(role, 1)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.stats.role_delta(role, -1)
+    
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild, before, after):
+        self.stats.emojis_update(guild, after)
+    
+    @discord.app_commands.command(name="userinfo", description="Get information about a user")
+    @discord.app_commands.describe(member="The member to get information about")
+    async def userinfo(self, interaction: discord.Interaction, member: discord.Member = None):
+        """Get detailed information about a user."""
+        if member is None:
+            member = interaction.user
+        if not isinstance(member, discord.Member):
+            # Only a User when the member was missing from the interaction and the cache
+            member = await member_cache.get(interaction.guild, member.id)
+            if member is None:
+                await interaction.response.send_message("❌ That user is not a member of this server!", ephemeral=True)
+                return
+        
+        # Get user roles (excluding @everyone)
+        roles = [role.mention for role in member.roles[1:]]
+        roles_str = ", ".join(roles) if roles else "No roles"
+        
+        embed = discord.Embed(
+            title=f"👤 {member.display_name}",
+            color=member.color,
+            timestamp=datetime.now()
+        )
+        
+        # Set thumbnail
+        if member.avatar:
+            embed.set_thumbnail(url=member.avatar.url)
+        else:
+            embed.set_thumbnail(url=member.default_avatar.url)
+        
+        # Add fields
+        embed.add_field(name="📛 Username", value=f"{member.name}#{member.discriminator}", inline=True)
+        embed.add_field(name="🆔 ID", value=member.id, inline=True)
+        embed.add_field(name="📅 Account Created", value=f"<t:{int(member.created_at.timestamp())}:R>", inline=True)
+        embed.add_field(name="📅 Joined Server", value=f"<t:{int(member.joined_at.timestamp())}:R>", inline=True)
+        embed.add_field(name="🎭 Roles", value=roles_str[:1024], inline=False)
+        
+        # Add timeout info if applicable
+        if member.timed_out_until:
+            embed.add_field(name="🔇 Timed Out Until", value=f"<t:{int(member.timed_out_until.timestamp())}:R>", inline=True)
+        
+        embed.set_footer(text=f"Requested by {interaction.user}")
+        
+        await interaction.response.send_message(embed=embed)
+    
+    @discord.app_commands.command(name="serverinfo", description="Get information about the server")
+    @discord.app_commands.describe(refresh="Recount statistics from the cache (requires Manage Server)")
+    async def serverinfo(self, interaction: discord.Interaction, refresh: bool = False):
+        """Get detailed information about the server."""
+        guild = interaction.guild
+        
+        # Get server statistics
+        may_refresh = interaction.user.guild_permissions.manage_guild
+        if refresh and may_refresh:
+            stats = self.stats.rebuild(guild)
+        else:
+            stats = self.stats.get(guild)
+        total_members = guild.member_count
+        online_members = stats.online
+        text_channels = stats.text_channels
+        voice_channels = stats.voice_channels
+        roles = stats.roles
+        emojis = stats.emojis
+        
+        embed = discord.Embed(
+            title=f"🏰 {guild.name}",
+            color=Config.COLORS['INFO'],
+            timestamp=datetime.now()
+        )
+        
+        # Set server icon if available
+        if guild.icon:
+            embed.set_thumbnail(url=guild.icon.url)
+        
+        # Add fields
+        embed.add_field(name="🆔 Server ID", value=guild.id, inline=True)
+        embed.add_field(name="👑 Owner", value=f"<@{guild.owner_id}>", inline=True)
+        embed.add_field(name="📅 Created", value=f"<t:{int(guild.created_at.timestamp())}:R>", inline=True)
+        embed.add_field(name="👥 Total Members", value=total_members, inline=True)
+        embed.add_field(name="🟢 Online Members", value=online_members, inline=True)
+        embed.add_field(name="📝 Text Channels", value=text_channels, inline=True)
+        embed.add_field(name="🔊 Voice Channels", value=voice_channels, inline=True)
+        embed.add_field(name="🎭 Roles", value=roles, inline=True)
+        embed.add_field(name="😀 Emojis", value=emojis, inline=True)
+        embed.add_field(name="📊 Boost Level", value=guild.premium_tier, inline=True)
+        
+        embed.set_footer(text=f"Requested by {interaction.user}")
+        
+        await interaction.response.send_message(embed=embed)
+        if refresh and not may_refresh:
+            await interaction.followup.send(
+                "❌ Refreshing requires the Manage Server permission; these are the cached statistics.",
+                ephemeral=True
+            )
+
+
+async def setup(bot):
+    await bot.add_cog(Information(bot))
@@ -0,0 +1,423 @@
+"""
+Moderation commands: kick, ban, timeouts, role removal, /clear and mass actions.
+"""
+
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+
+import discord
+from discord.ext import commands
+
+import mass_actions
+from config import Config
+from core import case_store, expiry_scheduler, member_cache, mod_log, policy_store
+from expiry import DISCORD_TIMEOUT_LIMIT, TIMEOUT_REAPPLY_MARGIN, format_duration, parse_duration
+from modlog import action_embed
+from pipeline import CheckFailure, CommandRunner, CommandSpec
+from purge import PurgeEngine, PurgeFilter
+
+logger = logging.getLogger(__name__)
+
+KICK = CommandSpec('kick', 'kick_members', 'kick members')
+BAN = CommandSpec('ban', 'ban_members', 'ban members')
+TIMEOUT = CommandSpec('timeout', 'moderate_members', 'timeout members')
+UNTIMEOUT = CommandSpec('untimeout', 'moderate_members', 'remove timeouts',
+                        failure='remove timeout', target_checks=False)
+CLEAR = CommandSpec('clear', 'manage_messages', 'manage messages', failure='clear messages', ephemeral=True)
+MASSBAN = CommandSpec('massban', 'ban_members', 'ban members', failure='mass ban')
+MASSTIMEOUT = CommandSpec('masstimeout', 'moderate_members', 'timeout members', failure='mass timeout')
+REMOVEROLE = CommandSpec('removerole', 'manage_roles', 'manage roles', failure='remove role')
+# Commands run through CommandRunner, and so subject to cooldowns
+MODERATION_COMMANDS = [spec.name for spec in (KICK, BAN, TIMEOUT, UNTIMEOUT, CLEAR, MASSBAN, MASSTIMEOUT, REMOVEROLE)]
+
+
+class Moderation(commands.Cog):
+    """Moderation commands for server management."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.runner = CommandRunner(policy_store)
+    
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        # A manual unban makes a pending tempban expiry pointless
+        await expiry_scheduler.cancel(guild.id, user.id, 'unban')
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        # Re-apply a long timeout the member tried to dodge by leaving
+        expiry_scheduler.run_now(member.guild.id, member.id, 'timeout')
+    
+    @staticmethod
+    def _duration(text) -> int:
+        try:
+            return parse_duration(text)
+        except ValueError as e:
+            raise CheckFailure(str(e))
+    
+    @staticmethod
+    def _timeout_until(seconds):
+        """End of the first timeout chunk; Discord caps a single timeout at 28 days."""
+        return datetime.now().astimezone() + timedelta(seconds=min(seconds, DISCORD_TIMEOUT_LIMIT - 60))
+    
+    async def _schedule_timeout(self, guild_id, user_ids, seconds, until):
+        """Schedule re-application of a timeout longer than 28 days once the first chunk is applied."""
+        if seconds <= DISCORD_TIMEOUT_LIMIT:
+            return
+        ends_at = datetime.now().timestamp() + seconds
+        due = until.timestamp() - TIMEOUT_REAPPLY_MARGIN
+        await expiry_scheduler.schedule_many(
+            [(guild_id, user_id, 'timeout', due, ends_at, None) for user_id in user_ids]
+        )
+    
+    @discord.app_commands.command(name="kick", description="Kick a member from the server")
+    @discord.app_commands.describe(
+        member="The member to kick",
+        reason="Reason for the kick"
+    )
+    async def kick(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
+        """Kick a member from the server."""
+        async def body(ctx):
+            await member.kick(reason=f"{reason} | {interaction.user}")
+            
+            embed = discord.Embed(
+                title="👢 Member Kicked",
+                description=f"**Member:** {member.mention}\n**Reason:** {reason}\n**Moderator:** {interaction.user.mention}",
+                color=Config.COLORS['WARNING'],
+                timestamp=datetime.now()
+            )
+            embed.set_footer(text=f"ID: {member.id}")
+            
+            await ctx.send(embed=embed)
+            await mod_log.log(interaction.guild.id, embed)
+            case_store.record(interaction.guild.id, member.id, interaction.user.id, 'kick', reason)
+            logger.info(f"{interaction.user} kicked {member} from {interaction.guild.name}")
+        
+        await self.runner.run(KICK, interaction, body, member)
+    
+    @discord.app_commands.command(name="ban", description="Ban a member from the server")
+    @discord.app_commands.describe(
+        member="The member to ban",
+        reason="Reason for the ban",
+        duration="How long the ban lasts, e.g. 12h, 7d or 1w2d (permanent if empty)"
+    )
+    async def ban(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided",
+                  duration: str = None):
+        """Ban a member from the server, optionally for a limited time."""
+        async def body(ctx):
+            seconds = self._duration(duration) if duration else None
+            await member.ban(reason=f"{reason} | {interaction.user}")
+            if seconds:
+                await expiry_scheduler.schedule(
+                    interaction.guild.id, member.id, 'unban', datetime.now().timestamp() + seconds
+                )
+            else:
+                # A permanent ban replaces any earlier tempban
+                await expiry_scheduler.cancel(interaction.guild.id, member.id, 'unban')
+            
+            length = f"\n**Duration:** {format_duration(seconds)}" if seconds else ""
+            embed = discord.Embed(
+                title="🔨 Member Banned",
+                description=f"**Member:** {member.mention}{length}\n**Reason:** {reason}\n**Moderator:** {interaction.user.mention}",
+                color=Config.COLORS['ERROR'],
+                timestamp=datetime.now()
+            )
+            embed.set_footer(text=f"ID: {member.id}")
+            
+            await ctx.send(embed=embed)
+            await mod_log.log(interaction.guild.id, embed)
+            case_store.record(interaction.guild.id, member.id, interaction.user.id, 'ban', reason, seconds)
+            logger.info(
+                f"{interaction.user} banned {member} from {interaction.guild.name}"
+                + (f" for {format_duration(seconds)}" if seconds else "")
+            )
+        
+        await self.runner.run(BAN, interaction, body, member)
+    
+    @discord.app_commands.command(name="timeout", description="Timeout a member")
+    @discord.app_commands.describe(
+        member="The member to timeout",
+        minutes=f"Duration in minutes ({Config.MIN_TIMEOUT_MINUTES}-{Config.MAX_TIMEOUT_MINUTES}; over 28 days is re-applied automatically)",
+        reason="Reason for the timeout"
+    )
+    async def timeout(self, interaction: discord.Interaction, member: discord.Member, minutes: int, reason: str = "No reason provided"):
+        """Timeout a member for specified duration."""
+        async def body(ctx):
+            # Duration validation
+            if minutes < Config.MIN_TIMEOUT_MINUTES or minutes > Config.MAX_TIMEOUT_MINUTES:
+                raise CheckFailure(f"Duration must be between 1 minute and {Config.MAX_TIMEOUT_MINUTES // 1440} days ({Config.MAX_TIMEOUT_MINUTES} minutes)!")
+            
+            # Longer than 28 days is re-applied in chunks by the expiry scheduler
+            timeout_until = self._timeout_until(minutes * 60)
+            await member.timeout(timeout_until, reason=f"{reason} | {interaction.user}")
+            await expiry_scheduler.cancel(interaction.guild.id, member.id, 'timeout')
+            await self._schedule_timeout(interaction.guild.id, [member.id], minutes * 60, timeout_until)
+            
+            embed = discord.Embed(
+                title="🔇 Member Timed Out",
+                description=f"**Member:** {member.mention}\n**Duration:** {minutes} minutes\n**Reason:** {reason}\n**Moderator:** {interaction.user.mention}",
+                color=Config.COLORS['WARNING'],
+                timestamp=datetime.now()
+            )
+            embed.set_footer(text=f"ID: {member.id}")
+            
+            await ctx.send(embed=embed)
+            await mod_log.log(interaction.guild.id, embed)
+            case_store.record(interaction.guild.id, member.id, interaction.user.id, 'timeout', reason, minutes * 60)
+            logger.info(f"{interaction.user} timed out {member} for {minutes} minutes in {interaction.guild.name}")
+        
+        await self.runner.run(TIMEOUT, interaction, body, member)
+    
+    @discord.app_commands.command(name="untimeout", description="Remove timeout from a member")
+    @discord.app_commands.describe(member="The member to remove timeout from")
+    async def untimeout(self, interaction: discord.Interaction, member: discord.Member):
+        """Remove timeout from a member."""
+        async def body(ctx):
+            await member.timeout(None, reason=f"Timeout removed by {interaction.user}")
+            await expiry_scheduler.cancel(interaction.guild.id, member.id, 'timeout')
+            
+            embed = discord.Embed(
+                title="🔊 Timeout Removed",
+                description=f"**Member:** {member.mention}\n**Moderator:** {interaction.user.mention}",
+                color=Config.COLORS['SUCCESS'],
+                timestamp=datetime.now()
+            )
+            embed.set_footer(text=f"ID: {member.id}")
+            
+            await ctx.send(embed=embed)
+            await mod_log.log(interaction.guild.id, embed)
+            case_store.record(interaction.guild.id, member.id, interaction.user.id, 'untimeout')
+            logger.info(f"{interaction.user} removed timeout from {member} in {interaction.guild.name}")
+        
+        await self.runner.run(UNTIMEOUT, interaction, body, member)
+    
+    @discord.app_commands.command(name="clear", description="Clear messages from the channel")
+    @discord.app_commands.describe(
+        amount=f"Number of messages to clear (1-{Config.MAX_CLEAR_AMOUNT})",
+        user="Only delete messages from this member",
+        pattern="Only delete messages matching this regex",
+        attachments="Only delete messages with (True) or without (False) attachments",
+        bots="Only delete messages sent by bots",
+        before="Only delete messages before this message ID",
+        after="Only delete messages after this message ID"
+    )
+    async def clear(self, interaction: discord.Interaction, amount: int, user: discord.Member = None,
+                    pattern: str = None, attachments: bool = None, bots: bool = False,
+                    before: str = None, after: str = None):
+        """Clear specified number of messages."""
+        async def body(ctx):
+            # Amount validation
+            if amount < 1 or amount > Config.MAX_CLEAR_AMOUNT:
+                raise CheckFailure(f"Amount must be between 1 and {Config.MAX_CLEAR_AMOUNT}!")
+            
+            # Filter validation
+            try:
+                before_id = int(before) if before else None
+                after_id = int(after) if after else None
+            except ValueError:
+                raise CheckFailure("`before` and `after` must be message IDs!")
+            
+            try:
+                check = PurgeFilter(author=user, pattern=pattern, has_attachment=attachments, bots_only=bots)
+            except re.error as e:
+                raise CheckFailure(f"Invalid pattern: {e}")
+            
+            # Progress updates edit the deferred response
+            await ctx.defer()
+            
+            async def progress(result, done):
+                embed = discord.Embed(
+                    title="🗑️ Messages Cleared" if done else "🗑️ Clearing Messages...",
+                    description=(
+                        f"**Deleted:** {result.deleted}/{amount} messages\n"
+                        f"**Scanned:** {result.scanned} messages\n"
+                        f"**Failed:** {result.failed}\n"
+                        f"**Filters:** {check.describe()}\n"
+                        f"**Moderator:** {interaction.user.mention}"
+                    ),
+                    color=Config.COLORS['SUCCESS'] if done else Config.COLORS['INFO'],
+                    timestamp=datetime.now()
+                )
+                embed.set_footer(text=f"{result.elapsed:.1f}s elapsed")
+                if done:
+                    entry = embed.copy()
+                    entry.add_field(name="Channel", value=interaction.channel.mention)
+                    await mod_log.log(interaction.guild.id, entry)
+                await ctx.edit(embed=embed)
+            
+            engine = PurgeEngine(
+                interaction.channel,
+                amount,
+                check=check,
+                before=before_id,
+                after=after_id,
+                reason=f"Clear by {interaction.user}",
+                progress=progress
+            )
+            result = await engine.run()
+            logger.info(
+                f"{interaction.user} cleared {result.deleted} messages in {interaction.channel.name} "
+                f"({result.bulk_deleted} bulk, {result.single_deleted} single, {result.failed} failed, "
+                f"{result.elapsed:.1f}s)"
+            )
+        
+        await self.runner.run(CLEAR, interaction, body)
+    
+    async def _resolve_mass_targets(self, interaction, targets, file, joined_within, require_member):
+        """Collect and pre-check mass action targets."""
+        guild = interaction.guild
+        # Recent joins can only be found among members we have, so chunk the guild if needed
+        members = await member_cache.all_members(guild) if joined_within else None
+        ids = await mass_actions.collect_target_ids(guild, targets, file, joined_within, members=members)
+        if not ids:
+            raise CheckFailure("No target IDs found!")
+        if len(ids) > Config.MASS_ACTION_MAX_TARGETS:
+            raise CheckFailure(f"Too many targets ({len(ids)})! The limit is {Config.MASS_ACTION_MAX_TARGETS}.")
+        # Uncached members must still go through the hierarchy checks
+        resolved = await member_cache.get_many(guild, ids)
+        return mass_actions.check_targets(
+            guild, policy_store.get(guild), interaction.user, guild.me, ids,
+            require_member=require_member, members=resolved
+        )
+    
+    @discord.app_commands.command(name="massban", description="Ban many users at once")
+    @discord.app_commands.describe(
+        targets="User IDs or mentions separated by spaces",
+        file="Text file containing user IDs",
+        joined_within="Ban everyone who joined in the last N minutes",
+        reason="Reason for the ban"
+    )
+    async def massban(self, interaction: discord.Interaction, targets: str = None,
+                      file: discord.Attachment = None, joined_within: int = None,
+                      reason: str = "No reason provided"):
+        """Ban a list of users in one action."""
+        async def body(ctx):
+            checked = await self._resolve_mass_targets(interaction, targets, file, joined_within, False)
+            
+            result = mass_actions.MassActionResult(checked.rejected)
+            await mass_actions.mass_ban(
+                interaction.guild, checked.allowed, f"{reason} | {interaction.user}", result
+            )
+            
+            embed = mass_actions.summary_embed(
+                "🔨 Mass Ban", result, interaction.user, reason, Config.COLORS['ERROR']
+            )
+            for user_id in result.succeeded:
+                case_store.record(interaction.guild.id, user_id, interaction.user.id, 'ban', reason)
+            
+            await ctx.send(embed=embed)
+            # One entry per user; the dispatcher packs them 10 to a message
+            for user_id in result.succeeded:
+                await mod_log.log(interaction.guild.id, action_embed(
+                    "🔨 Member Banned", user_id, interaction.user, reason, Config.COLORS['ERROR'], "**Via:** /massban"
+                ))
+            logger.info(
+                f"{interaction.user} mass banned {len(result.succeeded)} users "
+                f"({len(result.failed)} failed) in {interaction.guild.name}"
+            )
+        
+        await self.runner.run(MASSBAN, interaction, body)
+    
+    @discord.app_commands.command(name="masstimeout", description="Timeout many members at once")
+    @discord.app_commands.describe(
+        minutes=f"Duration in minutes ({Config.MIN_TIMEOUT_MINUTES}-{Config.MAX_TIMEOUT_MINUTES}; over 28 days is re-applied automatically)",
+        targets="User IDs or mentions separated by spaces",
+        file="Text file containing user IDs",
+        joined_within="Timeout everyone who joined in the last N minutes",
+        reason="Reason for the timeout"
+    )
+    async def masstimeout(self, interaction: discord.Interaction, minutes: int, targets: str = None,
+                          file: discord.Attachment = None, joined_within: int = None,
+                          reason: str = "No reason provided"):
+        """Timeout a list of members in one action."""
+        async def body(ctx):
+            # Duration validation
+            if minutes < Config.MIN_TIMEOUT_MINUTES or minutes > Config.MAX_TIMEOUT_MINUTES:
+                raise CheckFailure(f"Duration must be between 1 minute and {Config.MAX_TIMEOUT_MINUTES // 1440} days ({Config.MAX_TIMEOUT_MINUTES} minutes)!")
+            
+            checked = await self._resolve_mass_targets(interaction, targets, file, joined_within, True)
+            
+            result = mass_actions.MassActionResult(checked.rejected)
+            timeout_until = self._timeout_until(minutes * 60)
+            await mass_actions.mass_timeout(
+                checked.allowed, timeout_until, f"{reason} | {interaction.user}", result
+            )
+            await self._schedule_timeout(interaction.guild.id, result.succeeded, minutes * 60, timeout_until)
+            
+            embed = mass_actions.summary_embed(
+                "🔇 Mass Timeout", result, interaction.user, reason, Config.COLORS['WARNING']
+            )
+            for user_id in result.succeeded:
+                case_store.record(interaction.guild.id, user_id, interaction.user.id, 'timeout', reason, minutes * 60)
+            
+            await ctx.send(embed=embed)
+            for user_id in result.succeeded:
+                await mod_log.log(interaction.guild.id, action_embed(
+                    "🔇 Member Timed Out", user_id, interaction.user, reason, Config.COLORS['WARNING'],
+                    f"**Duration:** {minutes} minutes\n**Via:** /masstimeout"
+                ))
+            logger.info(
+                f"{interaction.user} mass timed out {len(result.succeeded)} members for {minutes} minutes "
+                f"({len(result.failed)} failed) in {interaction.guild.name}"
+            )
+        
+        await self.runner.run(MASSTIMEOUT, interaction, body)
+    
+    @discord.app_commands.command(name="removerole", description="Remove a role from a member, optionally for a limited time")
+    @discord.app_commands.describe(
+        member="The member to remove the role from",
+        role="The role to remove",
+        duration="Give the role back after e.g. 12h, 7d or 1w2d (permanent if empty)",
+        reason="Reason for removing the role"
+    )
+    async def removerole(self, interaction: discord.Interaction, member: discord.Member, role: discord.Role,
+                         duration: str = None, reason: str = "No reason provided"):
+        """Remove a role from a member and optionally restore it later."""
+        async def body(ctx):
+            seconds = self._duration(duration) if duration else None
+            if role not in member.roles:
+                raise CheckFailure(f"{member.mention} does not have {role.mention}!")
+            if role.managed or role.is_default():
+                raise CheckFailure("That role is managed by Discord or an integration!")
+            guild_policy = policy_store.get(interaction.guild)
+            role_rank = guild_policy.role_rank(role)
+            if role_rank >= guild_policy.rank(interaction.user) and interaction.user.id != interaction.guild.owner_id:
+                raise CheckFailure("You cannot remove a role equal to or higher than your own!")
+            if role_rank >= guild_policy.rank(interaction.guild.me):
+                raise CheckFailure("I cannot remove a role equal to or higher than my own!")
+            
+            await member.remove_roles(role, reason=f"{reason} | {interaction.user}")
+            if seconds:
+                # One restore entry per member: merge into a pending one so its roles still come back
+                due_at = datetime.now().timestamp() + seconds
+                role_ids = [role.id]
+                pending = expiry_scheduler.get(interaction.guild.id, member.id, 'role_restore')
+                if pending is not None:
+                    pending_ids = json.loads(pending.data or '{}').get('roles', [])
+                    role_ids = pending_ids + [role_id for role_id in role_ids if role_id not in pending_ids]
+                    due_at = max(due_at, pending.due_at)
+                await expiry_scheduler.schedule(
+                    interaction.guild.id, member.id, 'role_restore', due_at, data={'roles': role_ids}
+                )
+            
+            length = f"\n**Duration:** {format_duration(seconds)}" if seconds else ""
+            embed = discord.Embed(
+                title="🎭 Role Removed",
+                description=f"**Member:** {member.mention}\n**Role:** {role.mention}{length}\n**Reason:** {reason}\n**Moderator:** {interaction.user.mention}",
+                color=Config.COLORS['WARNING'],
+                timestamp=datetime.now()
+            )
+            embed.set_footer(text=f"ID: {member.id}")
+            
+            await ctx.send(embed=embed)
+            await mod_log.log(interaction.guild.id, embed)
+            case_store.record(interaction.guild.id, member.id, interaction.user.id, 'removerole', reason, seconds)
+            logger.info(f"{interaction.user} removed {role.name} from {member} in {interaction.guild.name}")
+        
+        await self.runner.run(REMOVEROLE, interaction, body, member)
+
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
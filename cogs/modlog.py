@@ -0,0 +1,96 @@
+"""
+Mod-log channel configuration.
+"""
+
+import logging
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from config import Config
+from core import mod_log, modlog_store, policy_store
+
+logger = logging.getLogger(__name__)
+
+
+class ModLog(commands.Cog):
+    """Mod-log channel configuration."""
+    
+    modlog_group = discord.app_commands.Group(name="modlog", description="Configure the mod-log channel")
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def _check(self, interaction):
+        """Reply with an error and return False unless the user may configure the mod log."""
+        if policy_store.get(interaction.guild).may_use(interaction.user, 'modlog', 'manage_guild'):
+            return True
+        await interaction.response.send_message(
+            "❌ You don't have permission to configure the mod log!",
+            ephemeral=True
+        )
+        return False
+    
+    @modlog_group.command(name="set", description="Post moderation actions to a channel")
+    @discord.app_commands.describe(
+        channel="The mod-log channel",
+        webhook="Post through a webhook (needs Manage Webhooks), keeping the bot's own message limits free"
+    )
+    async def modlog_set(self, interaction: discord.Interaction, channel: discord.TextChannel, webhook: bool = False):
+        """Set the mod-log channel."""
+        if not await self._check(interaction):
+            return
+        
+        webhook_url = None
+        if webhook:
+            try:
+                created = await channel.create_webhook(name=f"{self.bot.user.name} Mod Log", reason=f"Mod log set by {interaction.user}")
+                webhook_url = created.url
+            except discord.HTTPException as e:
+                await interaction.response.send_message(f"❌ Failed to create a webhook: {str(e)}", ephemeral=True)
+                return
+        
+        await modlog_store.set(interaction.guild.id, channel.id, webhook_url)
+        await interaction.response.send_message(
+            f"✅ Moderation actions will be logged in {channel.mention}{' through a webhook' if webhook_url else ''}.",
+            ephemeral=True
+        )
+        logger.info(f"{interaction.user} set the mod log to #{channel.name} in {interaction.guild.name}")
+    
+    @modlog_group.command(name="disable", description="Stop logging moderation actions")
+    async def modlog_disable(self, interaction: discord.Interaction):
+        """Disable the mod log."""
+        if not await self._check(interaction):
+            return
+        
+        removed = await modlog_store.remove(interaction.guild.id)
+        await interaction.response.send_message(
+            "✅ Mod log disabled." if removed else "❌ No mod-log channel is set!",
+            ephemeral=True
+        )
+    
+    @modlog_group.command(name="status", description="Show the mod-log channel and queue")
+    async def modlog_status(self, interaction: discord.Interaction):
+        """Show the mod-log configuration and dispatcher counters."""
+        if not await self._check(interaction):
+            return
+        
+        config = modlog_store.get(interaction.guild.id)
+        embed = discord.Embed(
+            title="📜 Mod Log",
+            color=Config.COLORS['INFO'],
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="Channel", value=f"<#{config['channel_id']}>" if config else "Not set", inline=True)
+        embed.add_field(name="Webhook", value="Yes" if config and config.get('webhook_url') else "No", inline=True)
+        embed.add_field(name="Queued", value=str(mod_log.queued(interaction.guild.id)), inline=True)
+        embed.set_footer(
+            text=f"All servers: {mod_log.sent_embeds} entries in {mod_log.sent_messages} messages, "
+                 f"{mod_log.dropped} dropped, {mod_log.failed} failed"
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(ModLog(bot))
@@ -0,0 +1,148 @@
+"""
+Per-server moderation policy commands.
+"""
+
+import logging
+from datetime import datetime
+from typing import Literal
+
+import discord
+from discord.ext import commands
+
+from cogs.moderation import MODERATION_COMMANDS
+from config import Config
+from core import policy_store
+
+logger = logging.getLogger(__name__)
+
+
+class Policy(commands.Cog):
+    """Per-server mod roles, immune roles and command permission overrides."""
+    
+    policy_group = discord.app_commands.Group(name="policy", description="Manage who may moderate and who may be moderated")
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    async def _check(self, interaction):
+        """Reply with an error and return False unless the user may manage the policy."""
+        if policy_store.get(interaction.guild).may_use(interaction.user, 'policy', 'manage_guild'):
+            return True
+        await interaction.response.send_message(
+            "❌ You don't have permission to manage the moderation policy!",
+            ephemeral=True
+        )
+        return False
+    
+    @policy_group.command(name="modrole", description="Let a role use moderation commands without Discord permissions")
+    @discord.app_commands.describe(action="Add or remove the role", role="The moderator role")
+    async def policy_modrole(self, interaction: discord.Interaction, action: Literal['add', 'remove'], role: discord.Role):
+        """Add or remove a mod role."""
+        if not await self._check(interaction):
+            return
+        
+        changed = await policy_store.set_roles(interaction.guild.id, 'mod_roles', role.id, add=action == 'add')
+        status = ("is now a mod role" if action == 'add' else "is no longer a mod role") if changed else "was already set that way"
+        await interaction.response.send_message(f"✅ {role.mention} {status}.", ephemeral=True)
+        logger.info(f"{interaction.user} updated mod role {role.name} ({action}) in {interaction.guild.name}")
+    
+    @policy_group.command(name="immune", description="Protect a role from moderation commands")
+    @discord.app_commands.describe(action="Add or remove the role", role="The protected role")
+    async def policy_immune(self, interaction: discord.Interaction, action: Literal['add', 'remove'], role: discord.Role):
+        """Add or remove an immune role."""
+        if not await self._check(interaction):
+            return
+        
+        changed = await policy_store.set_roles(interaction.guild.id, 'immune_roles', role.id, add=action == 'add')
+        status = ("is now immune" if action == 'add' else "is no longer immune") if changed else "was already set that way"
+        await interaction.response.send_message(f"✅ {role.mention} {status}.", ephemeral=True)
+        logger.info(f"{interaction.user} updated immune role {role.name} ({action}) in {interaction.guild.name}")
+    
+    @policy_group.command(name="command", description="Choose which roles may use a command")
+    @discord.app_commands.describe(
+        name="The command, e.g. ban",
+        action="Allow a role, remove it, or reset the command to its default permission",
+        role="The role to allow or remove"
+    )
+    async def policy_command(self, interaction: discord.Interaction, name: str,
+                             action: Literal['add', 'remove', 'reset'], role: discord.Role = None):
+        """Edit a per-command role override."""
+        if not await self._check(interaction):
+            return
+        
+        name = name.strip().lstrip('/').lower()
+        if name not in {command.name for command in self.bot.tree.get_commands()}:
+            await interaction.response.send_message(f"❌ Unknown command `/{name}`!", ephemeral=True)
+            return
+        if action != 'reset' and role is None:
+            await interaction.response.send_message("❌ Choose a role to add or remove!", ephemeral=True)
+            return
+        
+        role_id = role.id if action != 'reset' else None
+        changed = await policy_store.set_override(interaction.guild.id, name, role_id, add=action == 'add')
+        await interaction.response.send_message(
+            f"✅ Updated the override for `/{name}`." if changed else f"✅ Nothing to change for `/{name}`.",
+            ephemeral=True
+        )
+        logger.info(f"{interaction.user} changed the /{name} override ({action}) in {interaction.guild.name}")
+    
+    @policy_group.command(name="cooldown", description="Limit how often each moderator may use a command")
+    @discord.app_commands.describe(
+        name="The moderation command, e.g. ban",
+        seconds="Seconds per use (0 for no limit; leave empty to restore the default)",
+        burst=f"Uses allowed back to back (default {Config.COOLDOWN_BURST})"
+    )
+    async def policy_cooldown(self, interaction: discord.Interaction, name: str, seconds: float = None, burst: int = None):
+        """Set or reset a command's cooldown for this server."""
+        if not await self._check(interaction):
+            return
+        
+        name = name.strip().lstrip('/').lower()
+        if name not in MODERATION_COMMANDS:
+            await interaction.response.send_message(
+                f"❌ Cooldowns apply to moderation commands: {', '.join(f'`/{n}`' for n in MODERATION_COMMANDS)}",
+                ephemeral=True
+            )
+            return
+        if (seconds is not None and seconds < 0) or (burst is not None and burst < 1):
+            await interaction.response.send_message("❌ Seconds must be 0 or more and burst at least 1!", ephemeral=True)
+            return
+        
+        await policy_store.set_cooldown(interaction.guild.id, name, seconds, burst)
+        per, uses = policy_store.get(interaction.guild).cooldowns.get(name, (0, 0))
+        limit = f"{uses} use(s), then one every {per:g}s" if per > 0 else "no limit"
+        await interaction.response.send_message(f"✅ `/{name}` cooldown: {limit}.", ephemeral=True)
+        logger.info(f"{interaction.user} set the /{name} cooldown to {limit} in {interaction.guild.name}")
+    
+    @policy_group.command(name="show", description="Show the moderation policy")
+    async def policy_show(self, interaction: discord.Interaction):
+        """Show the server's policy settings."""
+        if not await self._check(interaction):
+            return
+        
+        settings = policy_store.settings(interaction.guild.id)
+        
+        def roles(ids):
+            return ", ".join(f"<@&{role_id}>" for role_id in ids) or "None"
+        
+        embed = discord.Embed(
+            title="🛡️ Moderation Policy",
+            color=Config.COLORS['INFO'],
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="👮 Mod Roles", value=roles(settings['mod_roles']), inline=False)
+        embed.add_field(name="🔒 Immune Roles", value=roles(settings['immune_roles']), inline=False)
+        overrides = "\n".join(f"`/{name}` - {roles(ids)}" for name, ids in sorted(settings['overrides'].items()))
+        embed.add_field(name="⚙️ Command Overrides", value=overrides[:1024] or "None", inline=False)
+        limits = policy_store.get(interaction.guild).cooldowns
+        cooldowns = "\n".join(
+            f"`/{name}` - {limits[name][1]} use(s), then one every {limits[name][0]:g}s"
+            for name in MODERATION_COMMANDS if name in limits and limits[name][0] > 0
+        )
+        embed.add_field(name="⏱️ Cooldowns", value=cooldowns or "None", inline=False)
+        embed.set_footer(text="The server owner and administrators always have access")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Policy(bot))
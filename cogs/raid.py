@@ -0,0 +1,104 @@
+"""
+Raid protection: join-rate detection and /lockdown.
+"""
+
+import logging
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from config import Config
+from core import policy_store, raid_guard
+
+logger = logging.getLogger(__name__)
+
+
+class RaidProtection(commands.Cog):
+    """Join-rate raid detection and server lockdown."""
+    
+    lockdown_group = discord.app_commands.Group(name="lockdown", description="Raid lockdown controls")
+    
+    def __init__(self, bot):
+        self.bot = bot
+        # The guard lives in core so reloading this extension keeps active lockdowns
+        self.guard = raid_guard
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        # The feature flag only gates automatic detection; a manual lockdown always catches joins
+        detect = Config.FEATURES['raid_protection']
+        if detect or member.guild.id in self.guard.lockdowns:
+            self.guard.member_join(member, detect=detect)
+    
+    async def _check(self, interaction):
+        """Reply with an error and return False unless the user may control lockdowns."""
+        if policy_store.get(interaction.guild).may_use(interaction.user, 'lockdown', 'manage_guild'):
+            return True
+        await interaction.response.send_message(
+            "❌ You don't have permission to manage raid lockdowns!",
+            ephemeral=True
+        )
+        return False
+    
+    @lockdown_group.command(name="start", description="Lock the server down until /lockdown end")
+    @discord.app_commands.describe(reason="Why the server is being locked down")
+    async def lockdown_start(self, interaction: discord.Interaction, reason: str = "Manual lockdown"):
+        """Start a manual lockdown."""
+        if not await self._check(interaction):
+            return
+        
+        if interaction.guild.id in self.guard.lockdowns:
+            await interaction.response.send_message("❌ The server is already locked down!", ephemeral=True)
+            return
+        self.guard.start(interaction.guild, f"{reason} ({interaction.user})", manual=True)
+        await interaction.response.send_message(
+            f"🚨 Lockdown started. New members will be {'kicked' if Config.RAID_ACTION == 'kick' else 'timed out'} until `/lockdown end`.",
+            ephemeral=True
+        )
+        logger.info(f"{interaction.user} started a lockdown in {interaction.guild.name}")
+    
+    @lockdown_group.command(name="end", description="Lift the raid lockdown")
+    async def lockdown_end(self, interaction: discord.Interaction):
+        """End the current lockdown."""
+        if not await self._check(interaction):
+            return
+        
+        ended = self.guard.end(interaction.guild.id)
+        await interaction.response.send_message(
+            "✅ Lockdown ending; the verification level will be restored." if ended else "❌ The server is not locked down!",
+            ephemeral=True
+        )
+        if ended:
+            logger.info(f"{interaction.user} ended the lockdown in {interaction.guild.name}")
+    
+    @lockdown_group.command(name="status", description="Show the raid lockdown status")
+    async def lockdown_status(self, interaction: discord.Interaction):
+        """Show whether the server is locked down."""
+        if not await self._check(interaction):
+            return
+        
+        lockdown = self.guard.lockdowns.get(interaction.guild.id)
+        if lockdown is None:
+            description = (
+                f"Not locked down. Raid protection is {'enabled' if Config.FEATURES['raid_protection'] else 'disabled'}.\n"
+                f"**Trigger:** more than {Config.RAID_JOIN_RATE[0]} joins in {Config.RAID_JOIN_RATE[1]}s, "
+                f"or {Config.RAID_SUSPICIOUS_RATE[0]} suspicious joins in {Config.RAID_SUSPICIOUS_RATE[1]}s"
+            )
+        else:
+            description = (
+                f"**Locked down since:** <t:{int(lockdown.started.timestamp())}:R>\n"
+                f"**Reason:** {lockdown.reason}\n"
+                f"**Actioned:** {lockdown.actioned} ({lockdown.failed} failed, {len(lockdown.pending)} waiting)"
+            )
+        embed = discord.Embed(
+            title="🚨 Raid Lockdown",
+            description=description,
+            color=Config.COLORS['ERROR'] if lockdown else Config.COLORS['INFO'],
+            timestamp=datetime.now()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(RaidProtection(bot))
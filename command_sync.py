@@ -0,0 +1,105 @@
+"""
+Conditional slash-command sync.
+Fingerprints the command tree and only pushes it to Discord when the
+fingerprint differs from the one recorded after the last successful sync.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Commands serialise against their tree from discord.py 2.4; 2.3's to_dict takes no arguments
+_TO_DICT_TAKES_TREE = 'tree' in inspect.signature(discord.app_commands.Command.to_dict).parameters
+
+
+def fingerprint(tree, guild=None) -> str:
+    """Stable hash of the commands registered for a scope (global when ``guild`` is None)."""
+    args = (tree,) if _TO_DICT_TAKES_TREE else ()
+    payload = sorted(
+        (command.to_dict(*args) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get('type', 1), command['name'])
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class CommandSyncer:
+    """Syncs the tree globally or to development guilds when it has changed.
+
+    Fingerprints are stored per scope in ``path`` so restarts with an unchanged
+    tree skip the sync round-trip entirely.
+    """
+
+    def __init__(self, tree, path, dev_guild_ids=()):
+        self.tree = tree
+        self.path = path
+        self.dev_guild_ids = list(dev_guild_ids)
+        self.synced = False
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable command sync cache {self.path}: {e}")
+            return {}
+
+    def _save(self, fingerprints: dict):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(fingerprints, f, indent=2)
+
+    async def sync(self, force=False) -> int:
+        """Sync every scope whose fingerprint changed and return how many scopes were synced.
+
+        Only the first call per process does any work unless ``force`` is set,
+        so reconnects that re-fire on_ready cost nothing.
+        """
+        if self.synced and not force:
+            return 0
+
+        stored = self._load()
+        synced = 0
+        try:
+            for guild in self._scopes():
+                scope = str(guild.id) if guild else 'global'
+                current = fingerprint(self.tree, guild=guild)
+                if not force and stored.get(scope) == current:
+                    logger.info(f"Slash commands unchanged for {scope}, skipping sync")
+                    continue
+                commands = await self.tree.sync(guild=guild)
+                stored[scope] = current
+                synced += 1
+                logger.info(f"Synced {len(commands)} slash commands to {scope}")
+        finally:
+            # Scopes synced before a failure are recorded, so the next attempt skips them
+            if synced:
+                self._save(stored)
+
+        # Only once every scope is in sync; after a failure the next on_ready tries again
+        self.synced = True
+        return synced
+
+    async def resync(self) -> int:
+        """Sync again after the tree changed at runtime, e.g. when an extension is reloaded."""
+        self.synced = False
+        return await self.sync()
+
+    def _scopes(self):
+        """Development guilds get a copy of the global tree; otherwise sync globally."""
+        if not self.dev_guild_ids:
+            return [None]
+        scopes = []
+        for guild_id in self.dev_guild_ids:
+            guild = discord.Object(id=guild_id)
+            self.tree.copy_global_to(guild=guild)
+            scopes.append(guild)
+        return scopes
+
@@ -15,9 +15,46 @@ class Config:
     PREFIX = os.getenv('BOT_PREFIX', '!')
     TOKEN = os.getenv('DISCORD_BOT_TOKEN')
     
+    # Slash command sync settings
+    COMMAND_SYNC_CACHE = os.getenv('COMMAND_SYNC_CACHE', '.command_sync.json')
+    # Comma separated guild IDs; when set, commands sync only to these guilds
+    DEV_GUILD_IDS = [int(g) for g in os.getenv('DEV_GUILD_IDS', '').split(',') if g.strip()]
+    
+    # Sharding: SHARDED runs an AutoShardedBot; SHARD_COUNT 0 lets Discord pick
+    SHARD_COUNT = int(os.getenv('SHARD_COUNT', 0))
+    SHARD_IDS = [int(s) for s in os.getenv('SHARD_IDS', '').split(',') if s.strip()]
+    SHARDED = os.getenv('SHARDED', 'false').lower() == 'true' or bool(SHARD_IDS)
+    if SHARD_IDS and not SHARD_COUNT:
+        # discord.py needs the total to know which guilds the listed shards own
+        raise ValueError("SHARD_IDS is set but SHARD_COUNT is not; set SHARD_COUNT to the total number of shards")
+    
+    # Member cache: MEMBER_CACHE_FLAGS is 'all', 'none' or flag names ('voice,joined');
+    # MEMBER_CHUNKING is 'startup', 'lazy' (on a guild's first interaction) or 'off'
+    MEMBER_CACHE_FLAGS = os.getenv('MEMBER_CACHE_FLAGS', 'all')
+    MEMBER_CHUNKING = os.getenv('MEMBER_CHUNKING', 'startup')
+    MEMBER_LRU_SIZE = int(os.getenv('MEMBER_LRU_SIZE', 10000))   # Fetched members kept when not cached
+    MEMBER_LRU_TTL = 300               # Seconds before a fetched member is fetched again
+    
+    # Cluster launcher (cluster.py); CLUSTER_ID is set by the launcher for each worker
+    CLUSTER_COUNT = int(os.getenv('CLUSTER_COUNT', 0))      # 0 = one cluster per CPU core
+    CLUSTER_ID = int(os.getenv('CLUSTER_ID')) if os.getenv('CLUSTER_ID') else None
+    CLUSTER_IPC_HOST = os.getenv('CLUSTER_IPC_HOST', '127.0.0.1')
+    CLUSTER_IPC_PORT = int(os.getenv('CLUSTER_IPC_PORT', 9190))
+    CLUSTER_IPC_SECRET = os.getenv('CLUSTER_IPC_SECRET', '')
+    CLUSTER_HEARTBEAT_INTERVAL = 5     # Seconds between worker heartbeats
+    CLUSTER_HEARTBEAT_TIMEOUT = 60     # Restart a worker silent for this long
+    CLUSTER_READY_TIMEOUT = 600        # Max wait for a cluster's shards before starting the next
+    CLUSTER_RESTART_MAX_DELAY = 60     # Cap on the restart backoff
+    
     # Logging settings
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
+    LOG_JSON = os.getenv('LOG_JSON', 'false').lower() == 'true'   # JSON lines instead of plain text
+    LOG_ROTATION = os.getenv('LOG_ROTATION', 'size')              # 'size' or 'time'
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')    # For time based rotation
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    LOG_QUEUE_SIZE = 10000             # Records waiting for the log thread before new ones are dropped
     
     # Color scheme for embeds
     COLORS = {
@@ -43,21 +80,122 @@ class Config:
         'SERVER': '🏰'
     }
     
-    # Command cooldowns (in seconds)
+    # Command cooldowns: seconds per use for each moderator, with up to
+    # COOLDOWN_BURST uses back to back; servers can change them with /policy cooldown
     COOLDOWNS = {
         'kick': 5,
         'ban': 5,
         'timeout': 3,
-        'clear': 10
+        'clear': 10,
+        'massban': 30,
+        'masstimeout': 30
+    }
+    COOLDOWN_BURST = 3
+    COOLDOWN_SWEEP_INTERVAL = 300      # Seconds between sweeps of idle cooldown buckets
+    
+    # Expected command latency (seconds) before any measurements; commands at or
+    # above DEFER_THRESHOLD are deferred before their API call
+    COMMAND_LATENCY_BUDGETS = {
+        'kick': 0.5,
+        'ban': 0.5,
+        'timeout': 0.5,
+        'untimeout': 0.5,
+        'clear': 10.0,
+        'massban': 30.0,
+        'masstimeout': 30.0
     }
+    DEFER_THRESHOLD = 1.0
+    AUTO_DEFER_AFTER = 2.0             # Defer anything still running after this long
     
     # Maximum values
-    MAX_CLEAR_AMOUNT = 100
-    MAX_TIMEOUT_MINUTES = 40320  # 28 days
+    MAX_CLEAR_AMOUNT = 10000
+    MAX_TIMEOUT_MINUTES = 525600  # 365 days; beyond 28 days the timeout is re-applied in chunks
     MIN_TIMEOUT_MINUTES = 1
     
-    # Database settings (for future use)
-    DATABASE_URL = os.getenv('DATABASE_URL')
+    # Purge settings
+    PURGE_SCAN_LIMIT = 50000           # Max messages scanned per /clear
+    PURGE_SINGLE_DELETE_DELAY = 1.0    # Seconds between deletes of messages older than 14 days
+    PURGE_PROGRESS_INTERVAL = 5        # Seconds between progress updates
+    
+    # Expiry scheduler (tempbans, long timeouts, temporary role removals)
+    EXPIRY_BATCH_SIZE = 50             # Expired actions run together
+    EXPIRY_BATCH_DELAY = 1.0           # Seconds between batches while catching up after downtime
+    EXPIRY_RETRY_DELAY = 60            # Base delay before retrying a failed expiry
+    EXPIRY_MAX_ATTEMPTS = 5
+    
+    # Mass action settings
+    MASS_ACTION_MAX_TARGETS = 1000     # Max targets per /massban or /masstimeout
+    MASS_ACTION_CONCURRENCY = 5        # Parallel API calls when no bulk endpoint exists
+    
+    # Per-guild moderation policy (mod roles, immune roles, command overrides)
+    POLICY_FILE = os.getenv('POLICY_FILE', 'guild_policies.json')
+    
+    # Mod-log channel: entries are batched up to 10 embeds per message
+    MODLOG_FILE = os.getenv('MODLOG_FILE', 'modlog_channels.json')
+    MODLOG_FLUSH_INTERVAL = 2.0        # Seconds an entry waits for others to share its message
+    MODLOG_MAX_QUEUE = 1000            # Entries queued per guild before callers are held back
+    MODLOG_MAX_WAIT = 5.0              # Seconds a caller is held before its entry is dropped
+    
+    # Message audit: deleted and edited messages are logged from compact snapshots of
+    # recent messages in servers with a mod log, instead of discord.py's message cache
+    MESSAGE_AUDIT_GUILD_BYTES = int(os.getenv('MESSAGE_AUDIT_GUILD_BYTES', 4 * 1024 * 1024))  # Snapshot budget per server
+    MESSAGE_AUDIT_TTL_HOURS = 24       # Snapshots older than this are dropped
+    MESSAGE_AUDIT_BULK_WINDOW = 5.0    # Seconds of quiet before a channel's bulk deletes are summarised
+    DISCORD_MESSAGE_CACHE = int(os.getenv('DISCORD_MESSAGE_CACHE', 0))  # discord.py's own cache of full messages; 0 disables it
+    
+    # Auto-moderation settings
+    AUTOMOD_TERMS_FILE = os.getenv('AUTOMOD_TERMS_FILE', 'automod_terms.json')
+    AUTOMOD_WHOLE_WORDS = True         # Only match banned terms as whole words
+    AUTOMOD_WARNING_SECONDS = 5        # How long the filter warning stays visible
+    # Blocked link domains, built with `python blocklist.py`; checked when the file exists
+    LINK_BLOCKLIST_FILE = os.getenv('LINK_BLOCKLIST_FILE', 'blocklist.bin')
+    LINK_BLOCKLIST_RELOAD_INTERVAL = 60  # Seconds between checks for a rebuilt file
+    
+    # Spam detection: counter -> (max events, window in seconds)
+    SPAM_THRESHOLDS = {
+        'messages': (8, 5),
+        'mentions': (10, 10),
+        'links': (5, 10),
+        'attachments': (6, 10)
+    }
+    SPAM_MAX_TRACKED = 50000           # Members tracked at once before LRU eviction
+    SPAM_TIMEOUT_MINUTES = 10
+    
+    # Spam campaigns: near-identical messages from CAMPAIGN_ACCOUNTS accounts within
+    # CAMPAIGN_SECONDS are bulk deleted and their authors timed out
+    CAMPAIGN_ACCOUNTS = 4
+    CAMPAIGN_SECONDS = 120
+    CAMPAIGN_MAX_DISTANCE = 7          # SimHash bits (of 64) in which two copies may differ, 3 to 15
+    CAMPAIGN_MIN_LENGTH = 30           # Letters a message needs before it is fingerprinted
+    CAMPAIGN_WINDOW = 2048             # Recent messages indexed per server
+    CAMPAIGN_TIMEOUT_MINUTES = 60
+    
+    # Raid protection: lock down when joins exceed RAID_JOIN_RATE, or when joins showing
+    # RAID_SUSPICION_SCORE signals (new account, no avatar, similar names) exceed RAID_SUSPICIOUS_RATE
+    RAID_JOIN_RATE = (15, 10)          # (joins, seconds)
+    RAID_SUSPICIOUS_RATE = (5, 60)
+    RAID_MIN_ACCOUNT_AGE_DAYS = 7
+    RAID_SIMILAR_NAMES = 3             # Joins among the last 50 sharing a name's letters
+    RAID_SUSPICION_SCORE = 2
+    RAID_ACTION = os.getenv('RAID_ACTION', 'timeout')   # What happens to joins during a lockdown: 'timeout' or 'kick'
+    RAID_TIMEOUT_MINUTES = 60
+    RAID_VERIFICATION_LEVEL = 'high'   # Raised to this during a lockdown, then restored
+    RAID_LOCKDOWN_MINUTES = 10         # Lockdown lasts this long after the last over-threshold join
+    RAID_BATCH_INTERVAL = 1.0          # Seconds new joins are gathered before acting on them
+    
+    # Metrics endpoint (Prometheus text format at /metrics)
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', 9100))
+    
+    # Database settings (SQLite; defaults to sqlite:///bot.db)
+    DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///bot.db')
+    CASES_PER_PAGE = 10
+    EXPORT_PAGE_SIZE = 1000            # Cases read from the database at a time by /modexport
+    EXPORT_FILE_BYTES = 8 * 1024 * 1024  # Largest /modexport file; capped at the server's upload limit
+    
+    # Audit log sync: kicks, bans and timeouts made outside the bot are imported as cases
+    AUDIT_SYNC_INTERVAL = 900          # Seconds between passes over every server's new entries
+    AUDIT_SYNC_BACKFILL_DAYS = 30      # How far back a server's first pass starts
     
     # API settings (for future use)
     API_BASE_URL = os.getenv('API_BASE_URL', 'https://api.example.com')
@@ -65,7 +203,13 @@ class Config:
     # Feature flags
     FEATURES = {
         'logging': True,
-        'auto_moderation': False,
+        'auto_moderation': os.getenv('AUTO_MODERATION', 'false').lower() == 'true',
+        'spam_protection': os.getenv('SPAM_PROTECTION', 'false').lower() == 'true',
+        'raid_protection': os.getenv('RAID_PROTECTION', 'false').lower() == 'true',
+        'campaign_protection': os.getenv('CAMPAIGN_PROTECTION', 'false').lower() == 'true',
+        'message_audit': os.getenv('MESSAGE_AUDIT', 'false').lower() == 'true',
+        'audit_sync': os.getenv('AUDIT_SYNC', 'false').lower() == 'true',
+        'metrics': os.getenv('METRICS', 'false').lower() == 'true',
         'welcome_messages': False,
         'custom_commands': False
     }
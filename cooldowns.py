@@ -0,0 +1,53 @@
+"""
+Command cooldowns.
+Token buckets keyed by (guild, user, command), stored as a single timestamp per
+key (the generic cell rate algorithm): refill is computed on access, and keys
+whose bucket has refilled completely are swept periodically.
+"""
+
+import time
+
+
+class CooldownEngine:
+    """Per-user, per-command rate limits.
+
+    A bucket holds ``burst`` uses and regains one every ``per`` seconds. The
+    only state is the time at which the bucket will be full again, so a key
+    costs one float and nothing needs to tick in the background.
+    """
+
+    def __init__(self, sweep_interval=300):
+        self.sweep_interval = sweep_interval
+        self.rejected = 0
+        self._full_at = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def __len__(self):
+        return len(self._full_at)
+
+    def hit(self, guild_id, user_id, command, per, burst) -> float:
+        """Take one use; return 0 if allowed, otherwise the seconds until one is available."""
+        if per <= 0 or burst <= 0:
+            return 0.0
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        key = (guild_id, user_id, command)
+        full_at = max(self._full_at.get(key, now), now)
+        # Allowed while the bucket is no more than burst - 1 uses short of full
+        retry_after = full_at - now - per * (burst - 1)
+        if retry_after > 0:
+            self.rejected += 1
+            return retry_after
+        self._full_at[key] = full_at + per
+        return 0.0
+
+    def reset(self, guild_id, user_id, command):
+        self._full_at.pop((guild_id, user_id, command), None)
+
+    def sweep(self, now=None):
+        """Drop buckets that have refilled completely; they behave exactly like missing ones."""
+        now = time.monotonic() if now is None else now
+        self._full_at = {key: full_at for key, full_at in self._full_at.items() if full_at > now}
+        self._next_sweep = now + self.sweep_interval
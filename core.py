@@ -0,0 +1,111 @@
+"""
+Shared bot instance and services.
+The bot and the stores, schedulers and dispatchers the extensions share are
+created here once, so reloading an extension keeps their state (queued
+mod-log entries, pending expiries, active lockdowns) intact.
+"""
+
+import logging
+from datetime import timedelta
+
+import discord
+from discord.ext import commands
+
+from audit_sync import AuditLogSync
+from cases import CaseStore
+from cluster import ClusterClient
+from command_sync import CommandSyncer
+from config import Config
+from expiry import ExpiryScheduler
+from log_setup import dropped_records, setup_logging
+from members import MemberCache, cache_flags
+from metrics import Gauge, Metrics
+from modlog import ModLogDispatcher, ModLogStore
+from policy import PolicyStore
+from raid import RaidDetector, RaidGuard
+from snapshots import SnapshotCache
+
+# Setup logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Bot setup
+intents = discord.Intents.default()
+intents.message_content = True
+intents.members = True
+
+# Member cache policy: which members stay cached and whether guilds are chunked at startup
+bot_options = dict(
+    command_prefix=Config.PREFIX,
+    intents=intents,
+    help_command=None,
+    member_cache_flags=cache_flags(Config.MEMBER_CACHE_FLAGS),
+    chunk_guilds_at_startup=Config.MEMBER_CHUNKING == 'startup',
+    # The message audit keeps its own compact snapshots, so the full-message cache is off by default
+    max_messages=Config.DISCORD_MESSAGE_CACHE or None
+)
+
+if Config.SHARDED:
+    # One process owns SHARD_IDS (all shards when unset) out of SHARD_COUNT
+    bot = commands.AutoShardedBot(
+        shard_count=Config.SHARD_COUNT or None,
+        shard_ids=Config.SHARD_IDS or None,
+        **bot_options
+    )
+else:
+    bot = commands.Bot(**bot_options)
+
+command_syncer = CommandSyncer(bot.tree, Config.COMMAND_SYNC_CACHE, Config.DEV_GUILD_IDS)
+case_store = CaseStore(Config.DATABASE_URL)
+metrics = Metrics(bot)
+policy_store = PolicyStore(Config.POLICY_FILE)
+modlog_store = ModLogStore(Config.MODLOG_FILE)
+mod_log = ModLogDispatcher(bot, modlog_store, Config.MODLOG_FLUSH_INTERVAL, Config.MODLOG_MAX_QUEUE, Config.MODLOG_MAX_WAIT)
+member_cache = MemberCache(bot, Config.MEMBER_CHUNKING, Config.MEMBER_LRU_SIZE, Config.MEMBER_LRU_TTL)
+expiry_scheduler = ExpiryScheduler(bot, Config.DATABASE_URL, member_cache.get)
+audit_sync = AuditLogSync(bot, case_store, Config.AUDIT_SYNC_INTERVAL, Config.AUDIT_SYNC_BACKFILL_DAYS)
+raid_guard = RaidGuard(
+    RaidDetector(
+        Config.RAID_JOIN_RATE,
+        Config.RAID_SUSPICIOUS_RATE,
+        timedelta(days=Config.RAID_MIN_ACCOUNT_AGE_DAYS),
+        similar_names=Config.RAID_SIMILAR_NAMES,
+        suspicion_score=Config.RAID_SUSPICION_SCORE
+    ),
+    case_store, mod_log,
+    action=Config.RAID_ACTION,
+    timeout_minutes=Config.RAID_TIMEOUT_MINUTES,
+    verification_level=discord.VerificationLevel[Config.RAID_VERIFICATION_LEVEL],
+    duration=Config.RAID_LOCKDOWN_MINUTES * 60,
+    batch_interval=Config.RAID_BATCH_INTERVAL,
+    colors=Config.COLORS
+)
+snapshot_cache = SnapshotCache(Config.MESSAGE_AUDIT_GUILD_BYTES, Config.MESSAGE_AUDIT_TTL_HOURS * 3600)
+cluster_client = None
+if Config.CLUSTER_ID is not None:
+    cluster_client = ClusterClient(bot, Config.CLUSTER_ID, Config.CLUSTER_IPC_HOST,
+                                   Config.CLUSTER_IPC_PORT, Config.CLUSTER_IPC_SECRET)
+
+
+def install():
+    """Register the services' listeners and metrics; once per process, before extensions load."""
+    member_cache.install()
+    policy_store.install(bot)
+    if Config.FEATURES['metrics']:
+        metrics.install_event_counter()
+        metrics.install_rate_limit_hook()
+        metrics.registry.append(Gauge('bot_modlog_queued', 'Mod-log entries waiting to be sent', mod_log.queued))
+        metrics.registry.append(Gauge('bot_modlog_dropped', 'Mod-log entries dropped because a queue was full', lambda: mod_log.dropped))
+        metrics.registry.append(Gauge('bot_log_records_dropped', 'Log records dropped because the log queue was full', dropped_records))
+        if Config.FEATURES['message_audit']:
+            metrics.registry.append(Gauge('bot_message_snapshots', 'Message snapshots kept for the audit log', lambda: len(snapshot_cache)))
+            metrics.registry.append(Gauge('bot_message_snapshot_bytes', 'Approximate bytes held by message snapshots', lambda: snapshot_cache.bytes))
+
+
+async def close():
+    """Stop background work and close the databases after the bot has disconnected."""
+    await mod_log.close()
+    await expiry_scheduler.close()
+    await audit_sync.close()
+    await case_store.close()
+    await metrics.stop()
@@ -0,0 +1,369 @@
+"""
+Durable scheduler for expiring moderation actions.
+Temporary bans, timeouts longer than Discord's 28 day limit and temporary role
+removals are stored in SQLite and driven by a single timer over a min-heap, so
+a pending expiry costs one heap entry rather than a sleeping task.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+from cases import sqlite_path
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    due_at REAL NOT NULL,
+    ends_at REAL NOT NULL,
+    data TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_scheduled_target ON scheduled_actions (guild_id, user_id, action);
+"""
+
+COLUMNS = ('id', 'guild_id', 'user_id', 'action', 'due_at', 'ends_at', 'data', 'attempts')
+
+DISCORD_TIMEOUT_LIMIT = 28 * 86400
+TIMEOUT_REAPPLY_MARGIN = 3600   # Re-apply a long timeout this long before the current one runs out
+MAX_SLEEP = 300                 # Re-check the clock at least this often
+
+DURATION_RE = re.compile(r'(\d+)\s*([smhdw])')
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_duration(text: str) -> int:
+    """Parse durations like ``90m``, ``12h`` or ``1w2d`` into seconds."""
+    text = (text or '').strip().lower()
+    parts = DURATION_RE.findall(text)
+    if not parts or DURATION_RE.sub('', text).strip():
+        raise ValueError(f"Invalid duration '{text}' (use e.g. 30m, 12h, 7d or 1w2d)")
+    seconds = sum(int(amount) * UNITS[unit] for amount, unit in parts)
+    if seconds <= 0:
+        raise ValueError("Duration must be greater than zero")
+    return seconds
+
+
+def format_duration(seconds) -> str:
+    """Render seconds as e.g. ``7d 12h``."""
+    seconds = int(seconds)
+    parts = []
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        amount, seconds = divmod(seconds, size)
+        if amount:
+            parts.append(f"{amount}{unit}")
+    return ' '.join(parts) or f"{seconds}s"
+
+
+class ScheduledAction:
+    """One pending expiry."""
+
+    __slots__ = COLUMNS
+
+    def __init__(self, *row):
+        for name, value in zip(COLUMNS, row):
+            setattr(self, name, value)
+
+    @property
+    def key(self):
+        return (self.guild_id, self.user_id, self.action)
+
+
+class ExpiryScheduler:
+    """Runs expiring actions at their due time and survives restarts.
+
+    Every pending action lives in SQLite and in an in-memory min-heap keyed by
+    due time. One task sleeps until the earliest entry is due; cancelled or
+    rescheduled entries are skipped lazily when they reach the top. After a
+    restart everything overdue is caught up in batches of
+    ``Config.EXPIRY_BATCH_SIZE`` so a long outage does not burst the API.
+
+    Handlers return the next due time to keep an action pending (long timeouts
+    are re-applied in 28 day chunks) or None when it is finished.
+    """
+
+    def __init__(self, bot, database_url=None, resolve_member=None):
+        self.bot = bot
+        self.path = sqlite_path(database_url)
+        self.resolve_member = resolve_member
+        self.handlers = {
+            'unban': self._unban,
+            'timeout': self._timeout,
+            'role_restore': self._restore_roles,
+        }
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='expiry-store')
+        self._conn = None
+        self._heap = []          # (due_at, id)
+        self._actions = {}       # id -> ScheduledAction
+        self._by_key = {}        # (guild_id, user_id, action) -> id
+        self._wake = None
+        self._task = None
+
+    # Worker thread side
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _load(self):
+        return [ScheduledAction(*row) for row in self._connect().execute(f"SELECT {', '.join(COLUMNS)} FROM scheduled_actions")]
+
+    def _upsert_many(self, rows):
+        """Insert or replace rows keyed by (guild, user, action); returns their IDs."""
+        conn = self._connect()
+        ids = []
+        with conn:
+            for row in rows:
+                conn.execute(
+                    'INSERT INTO scheduled_actions (guild_id, user_id, action, due_at, ends_at, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (guild_id, user_id, action) DO UPDATE SET '
+                    'due_at = excluded.due_at, ends_at = excluded.ends_at, data = excluded.data, attempts = 0',
+                    row
+                )
+                ids.append(conn.execute(
+                    'SELECT id FROM scheduled_actions WHERE guild_id = ? AND user_id = ? AND action = ?', row[:3]
+                ).fetchone()[0])
+        return ids
+
+    def _apply(self, updates, deletes):
+        conn = self._connect()
+        with conn:
+            if updates:
+                conn.executemany('UPDATE scheduled_actions SET due_at = ?, attempts = ? WHERE id = ?', updates)
+            if deletes:
+                conn.executemany('DELETE FROM scheduled_actions WHERE id = ?', [(i,) for i in deletes])
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # Event loop side
+
+    def __len__(self):
+        return len(self._actions)
+
+    def _owns(self, guild_id) -> bool:
+        """Whether this process handles the guild (clusters only see their own shards)."""
+        shard_ids = getattr(self.bot, 'shard_ids', None)
+        shard_count = getattr(self.bot, 'shard_count', None)
+        if not shard_ids or not shard_count:
+            return True
+        return (guild_id >> 22) % shard_count in shard_ids
+
+    def _push(self, action: ScheduledAction):
+        self._actions[action.id] = action
+        self._by_key[action.key] = action.id
+        wake = not self._heap or action.due_at < self._heap[0][0]
+        heapq.heappush(self._heap, (action.due_at, action.id))
+        if wake and self._wake is not None:
+            self._wake.set()
+
+    def _forget(self, action: ScheduledAction):
+        self._actions.pop(action.id, None)
+        if self._by_key.get(action.key) == action.id:
+            del self._by_key[action.key]
+
+    async def start(self):
+        """Restore pending actions from the database and start the timer (idempotent)."""
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._timer())
+        rows = await self._run(self._load)
+        now = time.time()
+        # Actions scheduled while the rows were loading are newer than their rows and stay as they are
+        restored = [row for row in rows if self._owns(row.guild_id) and row.id not in self._actions]
+        for action in restored:
+            self._actions[action.id] = action
+            self._by_key[action.key] = action.id
+        self._heap.extend((action.due_at, action.id) for action in restored)
+        heapq.heapify(self._heap)
+        self._wake.set()
+        overdue = sum(1 for action in restored if action.due_at <= now)
+        logger.info(f"Restored {len(restored)} scheduled actions ({overdue} overdue)")
+
+    async def schedule(self, guild_id, user_id, action, due_at, ends_at=None, data=None) -> ScheduledAction:
+        """Schedule (or replace) ``action`` for a member; times are UNIX timestamps."""
+        return (await self.schedule_many([(guild_id, user_id, action, due_at, ends_at, data)]))[0]
+
+    async def schedule_many(self, items) -> list:
+        """Schedule several (guild_id, user_id, action, due_at, ends_at, data) tuples in one write."""
+        rows = [
+            (guild_id, user_id, action, due_at, due_at if ends_at is None else ends_at,
+             json.dumps(data) if data is not None else None)
+            for guild_id, user_id, action, due_at, ends_at, data in items
+        ]
+        ids = await self._run(self._upsert_many, rows)
+        scheduled = []
+        for action_id, row in zip(ids, rows):
+            previous = self._actions.get(self._by_key.get(row[:3]))
+            if previous is not None:
+                self._forget(previous)
+            action = ScheduledAction(action_id, *row, 0)
+            self._push(action)
+            scheduled.append(action)
+        return scheduled
+
+    def get(self, guild_id, user_id, action):
+        action_id = self._by_key.get((guild_id, user_id, action))
+        return self._actions.get(action_id)
+
+    async def cancel(self, guild_id, user_id, action) -> bool:
+        """Drop a pending action; returns whether one existed."""
+        pending = self.get(guild_id, user_id, action)
+        if pending is None:
+            return False
+        self._forget(pending)
+        await self._run(self._apply, [], [pending.id])
+        return True
+
+    def run_now(self, guild_id, user_id, action):
+        """Make a pending action due immediately (e.g. re-apply a timeout on rejoin)."""
+        pending = self.get(guild_id, user_id, action)
+        if pending is not None and pending.due_at > time.time():
+            pending.due_at = time.time()
+            self._push(pending)
+
+    async def _timer(self):
+        while True:
+            # Skip entries that were cancelled or rescheduled since they were pushed
+            while self._heap:
+                due_at, action_id = self._heap[0]
+                action = self._actions.get(action_id)
+                if action is not None and action.due_at == due_at:
+                    break
+                heapq.heappop(self._heap)
+
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), min(delay, MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = []
+            now = time.time()
+            while self._heap and len(batch) < Config.EXPIRY_BATCH_SIZE and self._heap[0][0] <= now:
+                due_at, action_id = heapq.heappop(self._heap)
+                action = self._actions.get(action_id)
+                if action is not None and action.due_at == due_at:
+                    batch.append(action)
+            try:
+                await self._run_batch(batch)
+            except Exception as e:
+                logger.error(f"Expiry batch failed: {e}")
+            if len(batch) >= Config.EXPIRY_BATCH_SIZE and self._heap and self._heap[0][0] <= time.time():
+                # Catching up after downtime: spread the backlog out
+                await asyncio.sleep(Config.EXPIRY_BATCH_DELAY)
+
+    async def _run_batch(self, batch):
+        outcomes = await asyncio.gather(*(self._execute(action) for action in batch))
+        updates, deletes = [], []
+        for action, next_due in zip(batch, outcomes):
+            if self._actions.get(action.id) is not action:
+                continue  # Cancelled or replaced while running
+            if next_due is None:
+                self._forget(action)
+                deletes.append(action.id)
+            else:
+                action.due_at = next_due
+                updates.append((next_due, action.attempts, action.id))
+                self._push(action)
+        if updates or deletes:
+            await self._run(self._apply, updates, deletes)
+
+    async def _execute(self, action: ScheduledAction):
+        """Run one action; returns its next due time or None when it is finished."""
+        handler = self.handlers.get(action.action)
+        if handler is None:
+            logger.error(f"No handler for scheduled action '{action.action}', dropping it")
+            return None
+        try:
+            guild = self.bot.get_guild(action.guild_id)
+            if guild is None:
+                raise LookupError(f"guild {action.guild_id} is not available")
+            next_due = await handler(guild, action)
+            action.attempts = 0
+            return next_due
+        except (discord.NotFound, discord.Forbidden) as e:
+            logger.warning(f"Dropping {action.action} for {action.user_id} in {action.guild_id}: {e}")
+            return None
+        except Exception as e:
+            action.attempts += 1
+            if action.attempts >= Config.EXPIRY_MAX_ATTEMPTS:
+                logger.error(f"Giving up on {action.action} for {action.user_id} in {action.guild_id}: {e}")
+                return None
+            logger.warning(f"Retrying {action.action} for {action.user_id} in {action.guild_id} later: {e}")
+            return time.time() + Config.EXPIRY_RETRY_DELAY * action.attempts
+
+    async def _member(self, guild, user_id):
+        if self.resolve_member is not None:
+            return await self.resolve_member(guild, user_id)
+        return guild.get_member(user_id)
+
+    # Handlers
+
+    async def _unban(self, guild, action):
+        await guild.unban(discord.Object(id=action.user_id), reason="Temporary ban expired")
+        logger.info(f"Temporary ban of {action.user_id} in {guild.name} expired")
+        return None
+
+    async def _timeout(self, guild, action):
+        remaining = action.ends_at - time.time()
+        if remaining <= TIMEOUT_REAPPLY_MARGIN:
+            return None  # The timeout already applied runs until the end
+        member = await self._member(guild, action.user_id)
+        if member is None:
+            # Left the server; the timeout is re-applied if they rejoin (see run_now)
+            return min(action.ends_at, time.time() + 86400)
+        chunk = min(remaining, DISCORD_TIMEOUT_LIMIT - 60)
+        until = datetime.now(timezone.utc) + timedelta(seconds=chunk)
+        await member.timeout(until, reason="Long timeout re-applied")
+        if chunk >= remaining:
+            return None
+        return until.timestamp() - TIMEOUT_REAPPLY_MARGIN
+
+    async def _restore_roles(self, guild, action):
+        member = await self._member(guild, action.user_id)
+        if member is None:
+            logger.info(f"Not restoring roles for {action.user_id} in {guild.name}: no longer a member")
+            return None
+        role_ids = json.loads(action.data or '{}').get('roles', [])
+        roles = [role for role in map(guild.get_role, role_ids) if role is not None]
+        if roles:
+            await member.add_roles(*roles, reason="Temporary role removal expired")
+        return None
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        if self._conn is not None:
+            await self._run(self._conn.close)
+        self._executor.shutdown(wait=False)
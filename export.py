@@ -0,0 +1,115 @@
+"""
+Moderation history export.
+Cases stream from the case store a page at a time through a chain of async
+generators: ``encode`` turns each case into a CSV or JSON Lines row and
+``chunks`` packs the rows into parts of at most a given size. An export of any
+length holds one page and one part in memory. ``/modexport`` uploads each part
+as a file; run this module to write an export from the database directly.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from cases import COLUMNS, CaseStore
+from config import Config
+
+FORMATS = ('csv', 'jsonl')
+WRITE_CHUNK = 1024 * 1024        # Bytes gathered before each write when exporting to a file
+
+
+def _row(case) -> list:
+    row = [getattr(case, column) for column in COLUMNS]
+    row[-1] = datetime.fromtimestamp(case.created_at, timezone.utc).isoformat(timespec='seconds')
+    return row
+
+
+def header(fmt) -> bytes:
+    """What starts every file of an export: the column names for CSV, nothing for JSON Lines."""
+    return (','.join(COLUMNS) + '\n').encode() if fmt == 'csv' else b''
+
+
+async def encode(cases, fmt):
+    """Yield each case as one encoded CSV or JSON Lines row."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (use {' or '.join(FORMATS)})")
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        async for case in cases:
+            writer.writerow(_row(case))
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    else:
+        async for case in cases:
+            yield (json.dumps(dict(zip(COLUMNS, _row(case))), ensure_ascii=False) + '\n').encode()
+
+
+async def chunks(rows, max_bytes, prefix=b''):
+    """Pack encoded rows into ``(bytes, row count)`` parts of at most ``max_bytes``, each starting with ``prefix``.
+
+    A row larger than ``max_bytes`` on its own still gets a part to itself.
+    Nothing is yielded when there are no rows.
+    """
+    part = bytearray(prefix)
+    count = 0
+    async for row in rows:
+        if count and len(part) + len(row) > max_bytes:
+            yield bytes(part), count
+            part = bytearray(prefix)
+            count = 0
+        part += row
+        count += 1
+    if count:
+        yield bytes(part), count
+
+
+async def write(store, out, guild_id, fmt='csv', **filters) -> int:
+    """Write a guild's matching cases to a binary file; returns the number written."""
+    out.write(header(fmt))
+    written = 0
+    async for part, count in chunks(encode(store.iter_cases(guild_id, **filters), fmt), WRITE_CHUNK):
+        out.write(part)
+        written += count
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a server's moderation cases as CSV or JSON Lines.")
+    parser.add_argument('guild', type=int, help="Server ID")
+    parser.add_argument('--user', type=int, help="Only cases against this user ID")
+    parser.add_argument('--moderator', type=int, help="Only cases by this moderator ID")
+    parser.add_argument('--action', help="Only this action, e.g. ban or timeout")
+    parser.add_argument('--days', type=int, help="Only cases from the last N days")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    parser.add_argument('--database', default=Config.DATABASE_URL, help="Database URL (default: DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    async def run():
+        store = CaseStore(args.database)
+        out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            return await write(
+                store, out, args.guild, args.format,
+                user_id=args.user, moderator_id=args.moderator, action=args.action,
+                since=time.time() - args.days * 86400 if args.days else None
+            )
+        finally:
+            if args.output:
+                out.close()
+            await store.close()
+
+    start = time.perf_counter()
+    count = asyncio.run(run())
+    print(f"Exported {count} cases in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
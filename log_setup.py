@@ -0,0 +1,145 @@
+"""
+Non-blocking logging pipeline.
+Loggers only put records on an in-memory queue; a background listener thread
+formats them and does all file and console I/O, including rotation.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+
+from config import Config
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_handler = None
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+# Structured fields handlers may attach with ``extra={...}``
+CONTEXT_FIELDS = ('guild', 'command', 'latency_ms')
+
+
+class EnqueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves the line layout to the listener thread.
+
+    Like the stock handler, it merges the arguments into the message and
+    renders any traceback before a record leaves the calling thread, so the
+    listener never touches live objects. It skips the stock handler's full
+    format(); the listener adds the timestamp and layout. When the queue is
+    full the record is dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than fail when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with optional guild, command and latency fields."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _file_handler():
+    if Config.LOG_ROTATION == 'time':
+        return logging.handlers.TimedRotatingFileHandler(
+            Config.LOG_FILE,
+            when=Config.LOG_ROTATE_WHEN,
+            backupCount=Config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+    return logging.handlers.RotatingFileHandler(
+        Config.LOG_FILE,
+        maxBytes=Config.LOG_MAX_BYTES,
+        backupCount=Config.LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route the root logger through a queue and start the listener thread."""
+    file_handler = _file_handler()
+    file_handler.setFormatter(JsonFormatter() if Config.LOG_JSON else logging.Formatter(TEXT_FORMAT))
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    listener = _Listener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = EnqueueHandler(log_queue)
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO))
+
+    global _listener, _handler
+    shutdown_logging()
+    _listener = listener
+    _handler = handler
+    listener.start()
+    return listener
+
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def shutdown_logging():
+    """Stop the listener thread after it has written every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+_handler = None
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+atexit.register(shutdown_logging)
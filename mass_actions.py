@@ -0,0 +1,189 @@
+"""
+Mass moderation helpers for raid response.
+Resolves target lists, applies hierarchy checks in one pass and runs the
+resulting actions through a bounded-concurrency scheduler.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+from config import Config
+import policy
+
+logger = logging.getLogger(__name__)
+
+SNOWFLAKE_RE = re.compile(r'\b\d{17,20}\b')
+BULK_BAN_CHUNK = 200  # Discord's limit per bulk-ban request
+
+
+def parse_ids(text: str) -> list:
+    """Extract unique snowflake IDs from free text, keeping their order."""
+    return list(dict.fromkeys(int(match) for match in SNOWFLAKE_RE.findall(text or '')))
+
+
+async def collect_target_ids(guild, ids=None, file=None, joined_within=None, members=None) -> list:
+    """Merge the ID list, uploaded file and recent-join selector into one ID list.
+
+    ``members`` is the member list scanned for recent joins (the guild cache by default).
+    """
+    found = parse_ids(ids)
+    if file is not None:
+        data = await file.read()
+        found.extend(parse_ids(data.decode('utf-8', errors='ignore')))
+    if joined_within:
+        since = datetime.now(timezone.utc) - timedelta(minutes=joined_within)
+        found.extend(m.id for m in (guild.members if members is None else members)
+                     if m.joined_at and m.joined_at >= since)
+    return list(dict.fromkeys(found))
+
+
+class TargetCheck:
+    """Result of the hierarchy pre-pass: who may be actioned and why others may not."""
+
+    def __init__(self):
+        self.allowed = []
+        self.rejected = {}
+
+
+# Short reasons for the summary embed, keyed by policy reason
+TARGET_REJECTIONS = {
+    policy.SELF: "cannot moderate yourself",
+    policy.BOT: "cannot moderate the bot",
+    policy.OWNER: "cannot moderate the server owner",
+    policy.IMMUNE: "immune to moderation",
+    policy.ABOVE_ACTOR: "equal or higher role than you",
+    policy.ABOVE_BOT: "equal or higher role than me",
+}
+
+
+def check_targets(guild, guild_policy, moderator, bot_member, target_ids, require_member=False,
+                  members=None) -> TargetCheck:
+    """Apply the single-target policy checks to every target at once.
+
+    The moderator's and bot's ranks are resolved once up front so each target
+    costs a few dict and set lookups. ``members`` maps IDs to members resolved
+    beforehand for targets the guild cache may not hold; any target found in
+    neither is treated as a non-member.
+    """
+    result = TargetCheck()
+    moderator_rank = guild_policy.rank(moderator)
+    bot_rank = guild_policy.rank(bot_member)
+    # Rejected whether or not they are members; later keys win, so yourself beats owner
+    fixed = {guild.owner_id: policy.OWNER, bot_member.id: policy.BOT, moderator.id: policy.SELF}
+
+    for target_id in target_ids:
+        if target_id in fixed:
+            result.rejected[target_id] = TARGET_REJECTIONS[fixed[target_id]]
+            continue
+
+        member = members.get(target_id) if members is not None else None
+        if member is None:
+            member = guild.get_member(target_id)
+        if member is None:
+            if require_member:
+                result.rejected[target_id] = "not a member of this server"
+            else:
+                # Users outside the guild can still be banned by ID
+                result.allowed.append(discord.Object(id=target_id))
+            continue
+
+        reason = guild_policy.check_target(member, moderator.id, moderator_rank, bot_rank)
+        if reason is not None:
+            result.rejected[target_id] = TARGET_REJECTIONS[reason]
+        else:
+            result.allowed.append(member)
+
+    return result
+
+
+class MassActionResult:
+    """Summary of a mass action."""
+
+    def __init__(self, rejected=None):
+        self.succeeded = []
+        self.failed = dict(rejected or {})
+
+    def fail(self, target_id, reason):
+        self.failed[target_id] = reason
+
+
+class MassActionScheduler:
+    """Runs one coroutine per target with bounded concurrency.
+
+    Rate limits are left to discord.py, which waits out each route bucket's
+    reset and retries 429s itself; the semaphore only caps how many requests
+    are queued on the bucket at once.
+    """
+
+    def __init__(self, concurrency=None):
+        self.concurrency = concurrency or Config.MASS_ACTION_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def run(self, targets, action, result: MassActionResult) -> MassActionResult:
+        await asyncio.gather(*(self._run_one(target, action, result) for target in targets))
+        return result
+
+    async def _run_one(self, target, action, result):
+        async with self._semaphore:
+            try:
+                await action(target)
+                result.succeeded.append(target.id)
+            except discord.HTTPException as e:
+                result.fail(target.id, e.text or str(e))
+
+
+async def mass_ban(guild, targets, reason, result: MassActionResult) -> MassActionResult:
+    """Ban targets, using the bulk-ban endpoint when the library supports it."""
+    if hasattr(guild, 'bulk_ban'):
+        for i in range(0, len(targets), BULK_BAN_CHUNK):
+            chunk = targets[i:i + BULK_BAN_CHUNK]
+            try:
+                outcome = await guild.bulk_ban(chunk, reason=reason)
+            except discord.HTTPException as e:
+                for target in chunk:
+                    result.fail(target.id, e.text or str(e))
+                continue
+            result.succeeded.extend(user.id for user in outcome.banned)
+            for user in outcome.failed:
+                result.fail(user.id, "ban rejected by Discord")
+        return result
+
+    scheduler = MassActionScheduler()
+    return await scheduler.run(targets, lambda target: guild.ban(target, reason=reason), result)
+
+
+async def mass_timeout(targets, until, reason, result: MassActionResult) -> MassActionResult:
+    """Timeout member targets through the scheduler."""
+    scheduler = MassActionScheduler()
+    return await scheduler.run(targets, lambda member: member.timeout(until, reason=reason), result)
+
+
+async def mass_kick(targets, reason, result: MassActionResult) -> MassActionResult:
+    """Kick member targets through the scheduler."""
+    scheduler = MassActionScheduler()
+    return await scheduler.run(targets, lambda member: member.kick(reason=reason), result)
+
+
+def summary_embed(title, result: MassActionResult, moderator, reason, color) -> discord.Embed:
+    """Build the single summary embed sent once a mass action finishes."""
+    embed = discord.Embed(
+        title=title,
+        description=(
+            f"**Succeeded:** {len(result.succeeded)}\n"
+            f"**Failed:** {len(result.failed)}\n"
+            f"**Reason:** {reason}\n"
+            f"**Moderator:** {moderator.mention}"
+        ),
+        color=color,
+        timestamp=datetime.now()
+    )
+    if result.failed:
+        lines = [f"`{target_id}` - {why}" for target_id, why in list(result.failed.items())[:15]]
+        if len(result.failed) > 15:
+            lines.append(f"...and {len(result.failed) - 15} more")
+        embed.add_field(name="❌ Failures", value="\n".join(lines)[:1024], inline=False)
+    return embed
@@ -0,0 +1,195 @@
+"""
+Member cache policy.
+Builds discord.py's member cache settings from Config and resolves members
+that are not in the cache: first from a bounded LRU of fetched members, then
+from Discord. Guilds can be chunked at startup, lazily on first use, or never.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+CHUNKING_MODES = ('startup', 'lazy', 'off')
+QUERY_BATCH = 100  # Max user IDs per gateway member query
+
+
+def cache_flags(spec: str) -> discord.MemberCacheFlags:
+    """Parse 'all', 'none' or comma separated flag names such as 'voice,joined'."""
+    spec = spec.strip().lower()
+    if spec == 'all':
+        return discord.MemberCacheFlags.all()
+    if spec == 'none':
+        return discord.MemberCacheFlags.none()
+    names = [name.strip() for name in spec.split(',') if name.strip()]
+    valid = set(discord.MemberCacheFlags.VALID_FLAGS)
+    unknown = [name for name in names if name not in valid]
+    if unknown:
+        raise ValueError(f"Unknown member cache flag(s): {', '.join(unknown)} (valid: {', '.join(sorted(valid))})")
+    return discord.MemberCacheFlags(**{name: True for name in names}) if names else discord.MemberCacheFlags.none()
+
+
+class MemberCache:
+    """Resolves members whether or not discord.py has them cached.
+
+    Lookups check the guild cache, then an LRU of members fetched earlier
+    (bounded by ``size``; entries expire after ``ttl`` seconds because updates
+    for uncached members never reach the bot), then Discord. Concurrent
+    lookups for the same member share one request.
+    """
+
+    def __init__(self, bot, chunking='startup', size=10000, ttl=300):
+        if chunking not in CHUNKING_MODES:
+            raise ValueError(f"Unknown chunking mode '{chunking}' (valid: {', '.join(CHUNKING_MODES)})")
+        self.bot = bot
+        self.chunking = chunking
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()   # (guild_id, user_id) -> (member, expires)
+        self._inflight = {}
+        self._chunking = set()
+
+    def install(self):
+        """Register the listeners that drop departed members and chunk guilds lazily."""
+        self.bot.add_listener(self._on_interaction, 'on_interaction')
+        self.bot.add_listener(self._on_raw_member_remove, 'on_raw_member_remove')
+
+    def __len__(self):
+        return len(self._lru)
+
+    def cached(self, guild: discord.Guild, user_id: int):
+        """Return the member from the guild cache or the LRU without any API call."""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        key = (guild.id, user_id)
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        member, expires = entry
+        if expires < time.monotonic():
+            del self._lru[key]
+            return None
+        self._lru.move_to_end(key)
+        return member
+
+    def remember(self, member: discord.Member):
+        key = (member.guild.id, member.id)
+        self._lru[key] = (member, time.monotonic() + self.ttl)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    async def get(self, guild: discord.Guild, user_id: int):
+        """Return the member, fetching it if needed, or None if they are not in the guild."""
+        member = self.cached(guild, user_id)
+        if member is not None:
+            self.hits += 1
+            return member
+        self.misses += 1
+
+        key = (guild.id, user_id)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = self._inflight[key] = asyncio.ensure_future(self._fetch(guild, user_id))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, guild, user_id):
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+        self.remember(member)
+        return member
+
+    async def get_many(self, guild: discord.Guild, user_ids) -> dict:
+        """Resolve many members at once; returns {user_id: member} for those in the guild.
+
+        Misses are requested over the gateway in batches of 100 IDs, which
+        costs no REST rate limit budget. A batch the gateway does not answer
+        is fetched over REST instead.
+        """
+        found = {}
+        missing = []
+        for user_id in user_ids:
+            member = self.cached(guild, user_id)
+            if member is not None:
+                found[user_id] = member
+            else:
+                missing.append(user_id)
+        self.hits += len(found)
+        self.misses += len(missing)
+        if guild.chunked:
+            # Every member is cached, so the rest are not in the guild
+            return found
+
+        for i in range(0, len(missing), QUERY_BATCH):
+            batch = missing[i:i + QUERY_BATCH]
+            try:
+                members = await guild.query_members(user_ids=batch, limit=len(batch), cache=False)
+            except asyncio.TimeoutError:
+                logger.warning(f"Member query timed out in {guild.name}, fetching {len(batch)} members over REST")
+                members = await self._fetch_many(guild, batch)
+            for member in members:
+                self.remember(member)
+                found[member.id] = member
+        return found
+
+    async def _fetch_many(self, guild, user_ids) -> list:
+        results = await asyncio.gather(*(self._fetch(guild, user_id) for user_id in user_ids), return_exceptions=True)
+        members = []
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, discord.HTTPException):
+                # Left unresolved, like a member who is not in the guild
+                logger.warning(f"Could not fetch member {user_id} in {guild.name}: {result}")
+            elif isinstance(result, BaseException):
+                raise result
+            elif result is not None:
+                members.append(result)
+        return members
+
+    async def all_members(self, guild: discord.Guild) -> list:
+        """Every member of the guild, chunking it first if it is not fully cached."""
+        if guild.chunked:
+            return list(guild.members)
+        # Keep the result in the cache unless the policy says members are never chunked
+        members = await guild.chunk(cache=self.chunking != 'off')
+        if guild.chunked:
+            self.bot.dispatch('guild_chunked', guild)
+        return members
+
+    def ensure_chunked(self, guild: discord.Guild):
+        """Start chunking ``guild`` in the background when chunking is lazy."""
+        if self.chunking != 'lazy' or guild.chunked or guild.id in self._chunking:
+            return
+        self._chunking.add(guild.id)
+        asyncio.create_task(self._chunk(guild))
+
+    async def _chunk(self, guild):
+        started = time.perf_counter()
+        try:
+            await guild.chunk()
+        except Exception as e:
+            logger.warning(f"Failed to chunk guild {guild.id}: {e}")
+            return
+        finally:
+            self._chunking.discard(guild.id)
+        # Members now come from the guild cache
+        for key in [key for key in self._lru if key[0] == guild.id]:
+            del self._lru[key]
+        logger.info(f"Chunked {guild.member_count} members of {guild.name} in {time.perf_counter() - started:.1f}s")
+        self.bot.dispatch('guild_chunked', guild)
+
+    async def _on_interaction(self, interaction: discord.Interaction):
+        if interaction.guild is not None:
+            self.ensure_chunked(interaction.guild)
+
+    async def _on_raw_member_remove(self, payload):
+        self._lru.pop((payload.guild_id, payload.user.id), None)
@@ -0,0 +1,231 @@
+"""
+Prometheus metrics for the bot.
+Counters and histograms are plain in-process objects updated from event
+listeners and command wrappers; a small aiohttp server renders them in the
+Prometheus text format on demand.
+"""
+
+import asyncio
+import bisect
+import functools
+import logging
+import re
+import time
+
+import discord
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SNOWFLAKE_PATH_RE = re.compile(r'/\d{15,20}')
+RATE_LIMIT_MESSAGE = 'We are being rate limited.'
+GLOBAL_RATE_LIMIT_MESSAGE = 'Global rate limit has been hit.'
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{str(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *label_values, amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} counter'
+        for key, value in self.values.items():
+            yield f'{self.name}{_labels(self.labels, key)} {value}'
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time."""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help = help_text
+        self.read = read
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} gauge'
+        yield f'{self.name} {self.read()}'
+
+
+class Histogram:
+    """Fixed-bucket histogram; observing is one bisect and two additions."""
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, value, *label_values):
+        series = self.series.get(label_values)
+        if series is None:
+            # Per-bucket counts plus a trailing +Inf slot, then the running sum
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+        for key, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else bound
+                yield f'{self.name}_bucket{_labels(self.labels + ("le",), key + (le,))} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labels, key)} {total}'
+            yield f'{self.name}_count{_labels(self.labels, key)} {cumulative}'
+
+
+class RateLimitFilter(logging.Filter):
+    """Counts the 429 warnings discord.py's HTTP client logs, per route template.
+
+    Records below ``level`` are dropped once counted, so the logger can be
+    lowered to WARNING without changing what is logged.
+    """
+
+    def __init__(self, counter, level=logging.NOTSET):
+        super().__init__()
+        self.counter = counter
+        self.level = level
+
+    def filter(self, record):
+        if record.levelno == logging.WARNING and isinstance(record.msg, str):
+            if record.msg.startswith(RATE_LIMIT_MESSAGE) and len(record.args) >= 2:
+                method, url = record.args[0], str(record.args[1])
+                path = url.split('/api/v', 1)[-1].split('/', 1)[-1].split('?', 1)[0]
+                self.counter.inc(method, SNOWFLAKE_PATH_RE.sub('/{id}', '/' + path))
+            elif record.msg.startswith(GLOBAL_RATE_LIMIT_MESSAGE):
+                self.counter.inc('*', 'global')
+        return record.levelno >= self.level
+
+
+class Metrics:
+    """Registry of every metric the bot exports."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.commands = Counter('bot_commands_total', 'Slash command invocations by outcome', ('command', 'outcome'))
+        self.command_latency = Histogram('bot_command_duration_seconds', 'Slash command handler duration', ('command',))
+        self.events = Counter('bot_events_total', 'Client events dispatched by name', ('event',))
+        self.rate_limits = Counter('bot_rest_rate_limits_total', 'REST 429 responses by route', ('method', 'route'))
+        self.loop_lag = Histogram('bot_event_loop_lag_seconds', 'Event loop scheduling delay')
+        self.last_loop_lag = 0.0
+        self.registry = [
+            self.commands,
+            self.command_latency,
+            self.events,
+            self.rate_limits,
+            self.loop_lag,
+            Gauge('bot_event_loop_lag_last_seconds', 'Most recent event loop lag sample', lambda: self.last_loop_lag),
+            Gauge('bot_gateway_latency_seconds', 'Gateway heartbeat latency', self._heartbeat),
+            Gauge('bot_cached_guilds', 'Guilds in the cache', lambda: len(bot.guilds)),
+            Gauge('bot_cached_members', 'Members in the cache', lambda: sum(len(g.members) for g in bot.guilds)),
+            Gauge('bot_cached_users', 'Users in the cache', lambda: len(bot.users)),
+            Gauge('bot_cached_messages', 'Messages in the cache', lambda: len(bot.cached_messages)),
+        ]
+        self._runner = None
+        self._lag_task = None
+
+    def _heartbeat(self):
+        latency = self.bot.latency
+        return latency if latency == latency and latency != float('inf') else 0
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.registry:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def instrument_commands(self, tree):
+        """Wrap every registered slash command callback with timing and outcome counting."""
+        for command in tree.walk_commands():
+            if isinstance(command, discord.app_commands.Command) and not getattr(command._callback, '__metrics__', False):
+                command._callback = self._wrap(command.qualified_name, command._callback)
+
+    def _wrap(self, name, callback):
+        commands, latency = self.commands, self.command_latency
+
+        @functools.wraps(callback)
+        async def wrapped(*args, **kwargs):
+            interaction = args[1] if len(args) > 1 and isinstance(args[1], discord.Interaction) else args[0]
+            start = time.perf_counter()
+            outcome = 'error'
+            try:
+                await callback(*args, **kwargs)
+                # CommandRunner reports handled failures through the interaction extras
+                outcome = 'error' if interaction.extras.get('command_failed') else 'success'
+            finally:
+                latency.observe(time.perf_counter() - start, name)
+                commands.inc(name, outcome)
+
+        wrapped.__metrics__ = True
+        return wrapped
+
+    def install_event_counter(self):
+        """Count every event the client dispatches, without adding a listener task per event."""
+        dispatch = self.bot.dispatch
+        events = self.events
+
+        def counted_dispatch(event_name, *args, **kwargs):
+            events.inc(event_name)
+            return dispatch(event_name, *args, **kwargs)
+
+        self.bot.dispatch = counted_dispatch
+
+    def install_rate_limit_hook(self):
+        # Logger filters only see records that pass the logger's level, so with LOG_LEVEL
+        # above WARNING the 429 warnings must still reach the filter, which then drops them
+        http_logger = logging.getLogger('discord.http')
+        level = http_logger.getEffectiveLevel()
+        http_logger.setLevel(min(level, logging.WARNING))
+        http_logger.addFilter(RateLimitFilter(self.rate_limits, level))
+
+    async def _watch_loop_lag(self, interval=1.0):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - expected)
+            self.last_loop_lag = lag
+            self.loop_lag.observe(lag)
+
+    async def _handle(self, request):
+        return web.Response(text=self.render(), content_type='text/plain', charset='utf-8',
+                            headers={'X-Content-Type-Options': 'nosniff'})
+
+    async def start(self, host, port):
+        """Start the HTTP endpoint and the loop lag monitor (idempotent)."""
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self._lag_task = asyncio.create_task(self._watch_loop_lag())
+        logger.info(f"Metrics available at http://{host}:{port}/metrics")
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
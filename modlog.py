@@ -0,0 +1,223 @@
+"""
+Mod-log channel dispatcher.
+Queues moderation event embeds per guild and posts them in batches of up to
+10 embeds per message, through a webhook when one is set up, so a raid that
+produces hundreds of events costs a few dozen API calls instead of one each.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBEDS = 10             # Discord's limit per message
+MAX_EMBED_CHARS = 6000      # Combined text of every embed in one message
+IDLE_TIMEOUT = 300          # Seconds before an idle guild's flusher exits
+
+
+class ModLogStore:
+    """Per-guild mod-log channel (and optional webhook URL) persisted to JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self._channels = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._channels = {int(guild_id): config for guild_id, config in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load mod-log channels from {self.path}: {e}")
+
+    def _dump(self, snapshot):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+
+    async def _save(self):
+        snapshot = {str(guild_id): dict(config) for guild_id, config in self._channels.items()}
+        await asyncio.get_running_loop().run_in_executor(None, self._dump, snapshot)
+
+    def get(self, guild_id):
+        """Return ``{'channel_id': ..., 'webhook_url': ...}`` or None when the guild has no mod log."""
+        return self._channels.get(guild_id)
+
+    async def set(self, guild_id, channel_id, webhook_url=None):
+        self._channels[guild_id] = {'channel_id': channel_id, 'webhook_url': webhook_url}
+        await self._save()
+
+    async def remove(self, guild_id) -> bool:
+        if self._channels.pop(guild_id, None) is None:
+            return False
+        await self._save()
+        return True
+
+    async def clear_webhook(self, guild_id):
+        config = self._channels.get(guild_id)
+        if config is not None and config.get('webhook_url'):
+            config['webhook_url'] = None
+            await self._save()
+
+
+def action_embed(title, user_id, moderator, reason=None, color=None, details=None) -> discord.Embed:
+    """Compact mod-log entry for one action against one user."""
+    lines = [f"**User:** <@{user_id}> (`{user_id}`)"]
+    if details:
+        lines.append(details)
+    if reason:
+        lines.append(f"**Reason:** {reason}")
+    lines.append(f"**Moderator:** {moderator.mention}")
+    return discord.Embed(title=title, description="\n".join(lines), color=color, timestamp=datetime.now())
+
+
+class _GuildQueue:
+    __slots__ = ('entries', 'task', 'dropped')
+
+    def __init__(self, size):
+        self.entries = asyncio.Queue(size)
+        self.task = None
+        self.dropped = 0
+
+
+class ModLogDispatcher:
+    """Coalesces mod-log embeds into multi-embed messages.
+
+    Each guild with a mod log gets a bounded queue and a flusher task. The
+    flusher sends as soon as 10 embeds (or 6000 characters) are waiting, or
+    ``flush_interval`` seconds after the oldest waiting embed arrived. When a
+    queue is full, ``log`` waits up to ``max_wait`` seconds for room and then
+    drops the entry; the next message says how many were dropped.
+    """
+
+    def __init__(self, bot, store, flush_interval=2.0, max_queue=1000, max_wait=5.0):
+        self.bot = bot
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queues = {}
+
+    def queued(self, guild_id=None) -> int:
+        """Entries waiting to be sent, for one guild or all of them."""
+        if guild_id is not None:
+            queue = self._queues.get(guild_id)
+            return queue.entries.qsize() if queue else 0
+        return sum(queue.entries.qsize() for queue in self._queues.values())
+
+    async def log(self, guild_id, embed) -> bool:
+        """Queue an entry for the guild's mod log; returns False if it has none or the entry was dropped."""
+        if self.store.get(guild_id) is None:
+            return False
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = self._queues[guild_id] = _GuildQueue(self.max_queue)
+        if queue.task is None:
+            queue.task = asyncio.create_task(self._flusher(guild_id, queue))
+
+        try:
+            queue.entries.put_nowait(embed)
+            return True
+        except asyncio.QueueFull:
+            pass
+        # Backpressure: hold the caller while the flusher makes room
+        try:
+            await asyncio.wait_for(queue.entries.put(embed), self.max_wait)
+            return True
+        except asyncio.TimeoutError:
+            queue.dropped += 1
+            self.dropped += 1
+            return False
+
+    async def _flusher(self, guild_id, queue):
+        loop = asyncio.get_running_loop()
+        carry = None
+        try:
+            while True:
+                if carry is not None:
+                    first, carry = carry, None
+                else:
+                    try:
+                        first = await asyncio.wait_for(queue.entries.get(), IDLE_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        if queue.entries.empty():
+                            break
+                        continue
+
+                batch = [first]
+                chars = len(first)
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < MAX_EMBEDS:
+                    if queue.entries.empty():
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            embed = await asyncio.wait_for(queue.entries.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    else:
+                        embed = queue.entries.get_nowait()
+                    if chars + len(embed) > MAX_EMBED_CHARS:
+                        carry = embed
+                        break
+                    batch.append(embed)
+                    chars += len(embed)
+
+                content = None
+                if queue.dropped:
+                    content = f"⚠️ {queue.dropped} mod-log entries were dropped because the queue was full."
+                    queue.dropped = 0
+                await self._send(guild_id, batch, content)
+        finally:
+            queue.task = None
+            if queue.entries.empty() and self._queues.get(guild_id) is queue:
+                del self._queues[guild_id]
+
+    async def _send(self, guild_id, embeds, content):
+        config = self.store.get(guild_id)
+        if config is None:
+            # The mod log was disabled while entries were waiting
+            return
+        try:
+            if config.get('webhook_url'):
+                webhook = discord.Webhook.from_url(config['webhook_url'], client=self.bot)
+                try:
+                    await webhook.send(content=content, embeds=embeds)
+                    self._sent(embeds)
+                    return
+                except discord.NotFound:
+                    logger.warning(f"Mod-log webhook for guild {guild_id} was deleted, using the channel instead")
+                    await self.store.clear_webhook(guild_id)
+
+            channel = self.bot.get_channel(config['channel_id'])
+            if channel is None:
+                self.failed += len(embeds)
+                logger.warning(f"Mod-log channel {config['channel_id']} for guild {guild_id} is not available")
+                return
+            await channel.send(content=content, embeds=embeds)
+            self._sent(embeds)
+        except discord.HTTPException as e:
+            self.failed += len(embeds)
+            logger.error(f"Failed to send {len(embeds)} mod-log entries for guild {guild_id}: {e}")
+
+    def _sent(self, embeds):
+        self.sent_messages += 1
+        self.sent_embeds += len(embeds)
+
+    async def close(self):
+        """Stop every flusher; entries still queued are discarded."""
+        for queue in self._queues.values():
+            if queue.task is not None:
+                queue.task.cancel()
+        self._queues.clear()
@@ -0,0 +1,198 @@
+"""
+Shared execution layer for moderation commands.
+Handles permission, hierarchy and cooldown checks (through the guild's cached
+policy), deferring before slow work, replying through the right channel
+(response or followup) and latency tracking.
+"""
+
+import asyncio
+import logging
+import math
+import time
+
+import discord
+
+from config import Config
+from cooldowns import CooldownEngine
+import policy
+
+logger = logging.getLogger(__name__)
+
+
+class CommandSpec:
+    """Static description of a moderation command."""
+
+    def __init__(self, name, permission, noun, verb=None, failure=None, target_checks=True, ephemeral=False):
+        self.name = name
+        self.permission = permission      # Permission attribute both the user and bot need
+        self.noun = noun                  # "kick members", used in permission errors
+        self.verb = verb or name          # "kick", used in target errors
+        self.failure = failure or f"{self.verb} member"
+        self.target_checks = target_checks
+        self.ephemeral = ephemeral
+
+
+class CheckFailure(Exception):
+    """Raised inside a command body to reply with an error and stop."""
+
+
+class LatencyTracker:
+    """Exponentially weighted moving average of each command's latency."""
+
+    def __init__(self, budgets, alpha=0.2):
+        self.alpha = alpha
+        self._expected = dict(budgets)
+
+    def expected(self, name) -> float:
+        return self._expected.get(name, 0.0)
+
+    def record(self, name, seconds):
+        previous = self._expected.get(name)
+        if previous is None:
+            self._expected[name] = seconds
+        else:
+            self._expected[name] = previous + self.alpha * (seconds - previous)
+
+
+class CommandContext:
+    """Wraps an interaction so replies work whether or not it has been deferred."""
+
+    def __init__(self, interaction: discord.Interaction, ephemeral=False):
+        self.interaction = interaction
+        self.ephemeral = ephemeral
+        self.deferred = False
+        self._lock = asyncio.Lock()
+
+    async def defer(self):
+        """Acknowledge the interaction so the 3 second deadline no longer applies."""
+        async with self._lock:
+            if not self.interaction.response.is_done():
+                await self.interaction.response.defer(thinking=True, ephemeral=self.ephemeral)
+                self.deferred = True
+
+    async def send(self, content=None, *, embed=None, ephemeral=None):
+        """Reply with the initial response, or a followup once the interaction is acknowledged."""
+        kwargs = {'ephemeral': self.ephemeral if ephemeral is None else ephemeral}
+        if content is not None:
+            kwargs['content'] = content
+        if embed is not None:
+            kwargs['embed'] = embed
+        async with self._lock:
+            if self.interaction.response.is_done():
+                await self.interaction.followup.send(**kwargs)
+            else:
+                await self.interaction.response.send_message(**kwargs)
+
+    async def edit(self, **kwargs):
+        """Edit the original response (or the deferred "thinking" message)."""
+        await self.interaction.edit_original_response(**kwargs)
+
+
+TARGET_ERRORS = {
+    policy.SELF: "You cannot {verb} yourself!",
+    policy.BOT: "You cannot {verb} me!",
+    policy.OWNER: "You cannot {verb} the server owner!",
+    policy.IMMUNE: "That member is immune to moderation in this server!",
+    policy.ABOVE_ACTOR: "You cannot {verb} someone with equal or higher roles!",
+    policy.ABOVE_BOT: "I cannot {verb} someone with equal or higher roles than mine!",
+}
+
+
+def target_error(spec: CommandSpec, interaction: discord.Interaction, member, guild_policy) -> str:
+    """Return the reason ``interaction.user`` may not act on ``member``, or None."""
+    reason = guild_policy.may_act(interaction.user, member, interaction.guild.me)
+    return TARGET_ERRORS[reason].format(verb=spec.verb) if reason else None
+
+
+class CommandRunner:
+    """Runs command bodies with shared checks, auto-deferral and error handling.
+
+    Commands whose expected latency (configured budget, then a moving average of
+    observed latency) exceeds ``Config.DEFER_THRESHOLD`` are deferred up front.
+    Anything else still gets deferred automatically if it has not replied by
+    ``Config.AUTO_DEFER_AFTER`` seconds.
+    """
+
+    def __init__(self, policies):
+        self.policies = policies
+        self.cooldowns = CooldownEngine(Config.COOLDOWN_SWEEP_INTERVAL)
+        self.latencies = LatencyTracker(Config.COMMAND_LATENCY_BUDGETS)
+
+    def check(self, spec: CommandSpec, interaction: discord.Interaction, member=None) -> str:
+        """Return the first failing permission, hierarchy or cooldown check for a command, or None.
+
+        Runs before anything is sent to Discord, so rejected commands cost no API calls.
+        """
+        guild_policy = self.policies.get(interaction.guild)
+        if not guild_policy.may_use(interaction.user, spec.name, spec.permission):
+            return f"You don't have permission to {spec.noun}!"
+        if not getattr(interaction.guild.me.guild_permissions, spec.permission):
+            return f"I don't have permission to {spec.noun}!"
+        if member is not None and spec.target_checks:
+            error = target_error(spec, interaction, member, guild_policy)
+            if error is not None:
+                return error
+        # Last, so requests rejected above do not use up the moderator's bucket
+        limit = guild_policy.cooldowns.get(spec.name)
+        if limit is not None:
+            retry_after = self.cooldowns.hit(interaction.guild_id, interaction.user.id, spec.name, *limit)
+            if retry_after:
+                return f"You're using /{spec.name} too quickly! Try again in {math.ceil(retry_after)}s."
+        return None
+
+    async def run(self, spec: CommandSpec, interaction: discord.Interaction, body, member=None):
+        """Check, then run ``body(ctx)`` and record the command's latency."""
+        ctx = CommandContext(interaction, ephemeral=spec.ephemeral)
+        started = time.perf_counter()
+
+        error = self.check(spec, interaction, member)
+        if error is not None:
+            interaction.extras['command_failed'] = True
+            await ctx.send(f"❌ {error}", ephemeral=True)
+            return
+
+        timer = None
+        auto_defer = None
+
+        def start_auto_defer():
+            nonlocal auto_defer
+            auto_defer = asyncio.create_task(ctx.defer())
+
+        ok = False
+        try:
+            if self.latencies.expected(spec.name) >= Config.DEFER_THRESHOLD:
+                await ctx.defer()
+            else:
+                timer = asyncio.get_running_loop().call_later(Config.AUTO_DEFER_AFTER, start_auto_defer)
+            await body(ctx)
+            ok = True
+        except CheckFailure as e:
+            await self._reply_error(ctx, f"❌ {e}")
+        except Exception as e:
+            await self._reply_error(ctx, f"❌ Failed to {spec.failure}: {str(e)}")
+            logger.error(f"{spec.name.capitalize()} error: {e}")
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if auto_defer is not None:
+                # A defer that already started is finished rather than cut off mid-request
+                try:
+                    await auto_defer
+                except discord.HTTPException as e:
+                    logger.warning(f"Auto-defer for /{spec.name} failed: {e}")
+            # Lets outer instrumentation see failures the runner already handled
+            interaction.extras['command_failed'] = not ok
+            elapsed = time.perf_counter() - started
+            self.latencies.record(spec.name, elapsed)
+            logger.debug(
+                f"/{spec.name} finished in {elapsed * 1000:.0f}ms ({'ok' if ok else 'error'})",
+                extra={'guild': interaction.guild_id, 'command': spec.name, 'latency_ms': round(elapsed * 1000, 1)}
+            )
+
+    @staticmethod
+    async def _reply_error(ctx, message):
+        try:
+            await ctx.send(message, ephemeral=True)
+        except discord.HTTPException as e:
+            # The interaction may have expired; nothing left to reply to
+            logger.warning(f"Could not deliver error reply: {e}")
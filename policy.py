@@ -0,0 +1,233 @@
+"""
+Per-guild moderation policy.
+Stores each guild's mod roles, immune roles, per-command role overrides and
+cooldowns, and compiles them, together with the guild's role hierarchy, into a
+GuildPolicy that answers "may X use this command" and "may X act on Y" without walking
+the role list. Compiled policies are rebuilt after role or guild changes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Reasons returned by GuildPolicy.may_act
+SELF = 'self'
+BOT = 'bot'
+OWNER = 'owner'
+IMMUNE = 'immune'
+ABOVE_ACTOR = 'above_actor'
+ABOVE_BOT = 'above_bot'
+
+# Permissions a configured mod role stands in for; server management stays with Discord permissions
+MOD_PERMISSIONS = frozenset({'kick_members', 'ban_members', 'moderate_members', 'manage_messages', 'manage_roles'})
+
+
+def role_ids(member):
+    """Raw role IDs of a member, without building and sorting Role objects."""
+    return member._roles
+
+
+class GuildPolicy:
+    """Compiled policy for one guild.
+
+    ``ranks`` maps role IDs to their place in the hierarchy (ties on position
+    broken by ID, as discord.py does), so a member's top role costs one dict
+    lookup per role they hold rather than a sort of the guild's roles.
+    """
+
+    __slots__ = ('guild_id', 'owner_id', 'bot_id', 'ranks', 'mod_roles', 'immune_roles', 'overrides', 'cooldowns')
+
+    def __init__(self, guild, settings=None):
+        settings = settings or {}
+        self.guild_id = guild.id
+        self.owner_id = guild.owner_id
+        self.bot_id = guild.me.id
+        # guild.roles is already in hierarchy order with @everyone first
+        self.ranks = {role.id: rank for rank, role in enumerate(guild.roles)}
+        self.mod_roles = frozenset(settings.get('mod_roles', ()))
+        self.immune_roles = frozenset(settings.get('immune_roles', ()))
+        self.overrides = {name: frozenset(ids) for name, ids in settings.get('overrides', {}).items()}
+        # command -> (seconds per use, burst); guild settings replace the defaults
+        self.cooldowns = {name: (per, Config.COOLDOWN_BURST) for name, per in Config.COOLDOWNS.items()}
+        self.cooldowns.update((name, tuple(limit)) for name, limit in settings.get('cooldowns', {}).items())
+
+    def rank(self, member) -> int:
+        """Hierarchy rank of the member's highest role (0 for @everyone only)."""
+        ranks = self.ranks
+        return max((ranks.get(role_id, 0) for role_id in role_ids(member)), default=0)
+
+    def role_rank(self, role) -> int:
+        """Hierarchy rank of a role; a role created since the last build ranks above everything."""
+        return self.ranks.get(role.id, len(self.ranks))
+
+    def may_use(self, member, command, permission) -> bool:
+        """Whether ``member`` may run ``command``, which normally needs ``permission``.
+
+        The owner and administrators always may. A command override replaces
+        the permission check with its role list; otherwise the Discord
+        permission or, for moderation permissions, a mod role is enough.
+        """
+        if member.id == self.owner_id:
+            return True
+        permissions = member.guild_permissions
+        if permissions.administrator:
+            return True
+        allowed = self.overrides.get(command)
+        if allowed is not None:
+            return not allowed.isdisjoint(role_ids(member))
+        if getattr(permissions, permission):
+            return True
+        return permission in MOD_PERMISSIONS and not self.mod_roles.isdisjoint(role_ids(member))
+
+    def may_act(self, actor, target, me):
+        """Return why ``actor`` may not moderate ``target`` (a reason constant), or None."""
+        return self.check_target(target, actor.id, self.rank(actor), self.rank(me))
+
+    def check_target(self, target, actor_id, actor_rank, bot_rank):
+        """``may_act`` with the actor's and bot's ranks resolved once for many targets."""
+        if target.id == actor_id:
+            return SELF
+        if target.id == self.bot_id:
+            return BOT
+        if target.id == self.owner_id:
+            return OWNER
+        rank = self.rank(target)
+        if actor_id != self.owner_id:
+            if not self.immune_roles.isdisjoint(role_ids(target)):
+                return IMMUNE
+            if rank >= actor_rank:
+                return ABOVE_ACTOR
+        if rank >= bot_rank:
+            return ABOVE_BOT
+        return None
+
+
+class PolicyStore:
+    """Per-guild policy settings persisted to JSON, with compiled policies cached.
+
+    ``install`` registers listeners that drop a guild's compiled policy when
+    its roles move or its owner changes; the next check rebuilds it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._settings = {}
+        self._compiled = {}
+        self.builds = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._settings = {int(guild_id): settings for guild_id, settings in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load guild policies from {self.path}: {e}")
+
+    def _dump(self, snapshot):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+
+    async def _save(self):
+        snapshot = {str(guild_id): settings for guild_id, settings in self._settings.items() if any(settings.values())}
+        await asyncio.get_running_loop().run_in_executor(None, self._dump, snapshot)
+
+    def install(self, bot):
+        bot.add_listener(self._on_role_change, 'on_guild_role_create')
+        bot.add_listener(self._on_role_change, 'on_guild_role_delete')
+        bot.add_listener(self._on_role_update, 'on_guild_role_update')
+        bot.add_listener(self._on_guild_update, 'on_guild_update')
+        bot.add_listener(self._on_guild_remove, 'on_guild_remove')
+
+    def __len__(self):
+        return len(self._compiled)
+
+    def get(self, guild) -> GuildPolicy:
+        """Return the compiled policy for a guild, building it if needed."""
+        policy = self._compiled.get(guild.id)
+        if policy is None:
+            policy = GuildPolicy(guild, self._settings.get(guild.id))
+            self._compiled[guild.id] = policy
+            self.builds += 1
+        return policy
+
+    def invalidate(self, guild_id):
+        self._compiled.pop(guild_id, None)
+
+    def settings(self, guild_id) -> dict:
+        """A copy of the guild's stored settings with every field present."""
+        settings = self._settings.get(guild_id, {})
+        return {
+            'mod_roles': list(settings.get('mod_roles', [])),
+            'immune_roles': list(settings.get('immune_roles', [])),
+            'overrides': {name: list(ids) for name, ids in settings.get('overrides', {}).items()},
+            'cooldowns': {name: list(limit) for name, limit in settings.get('cooldowns', {}).items()},
+        }
+
+    async def set_roles(self, guild_id, field, role_id, add=True) -> bool:
+        """Add or remove a role in 'mod_roles' or 'immune_roles'; returns whether anything changed."""
+        settings = self._settings.setdefault(guild_id, {})
+        roles = settings.setdefault(field, [])
+        if add == (role_id in roles):
+            return False
+        if add:
+            roles.append(role_id)
+        else:
+            roles.remove(role_id)
+        self.invalidate(guild_id)
+        await self._save()
+        return True
+
+    async def set_override(self, guild_id, command, role_id=None, add=True) -> bool:
+        """Add or remove a role in a command override, or clear the override when ``role_id`` is None."""
+        overrides = self._settings.setdefault(guild_id, {}).setdefault('overrides', {})
+        if role_id is None:
+            if overrides.pop(command, None) is None:
+                return False
+        else:
+            roles = overrides.get(command, [])
+            if add == (role_id in roles):
+                return False
+            if add:
+                overrides[command] = roles + [role_id]
+            else:
+                roles.remove(role_id)
+                # An empty list would lock everyone but admins out, so drop it instead
+                if not roles:
+                    del overrides[command]
+        self.invalidate(guild_id)
+        await self._save()
+        return True
+
+    async def set_cooldown(self, guild_id, command, per=None, burst=None) -> bool:
+        """Set a command's cooldown (``per`` 0 disables it), or restore the default when ``per`` is None."""
+        cooldowns = self._settings.setdefault(guild_id, {}).setdefault('cooldowns', {})
+        if per is None:
+            if cooldowns.pop(command, None) is None:
+                return False
+        else:
+            cooldowns[command] = [per, burst or Config.COOLDOWN_BURST]
+        self.invalidate(guild_id)
+        await self._save()
+        return True
+
+    async def _on_role_change(self, role):
+        self.invalidate(role.guild.id)
+
+    async def _on_role_update(self, before, after):
+        # Only the hierarchy is compiled; renames and colour changes keep the cache
+        if before.position != after.position:
+            self.invalidate(after.guild.id)
+
+    async def _on_guild_update(self, before, after):
+        if before.owner_id != after.owner_id:
+            self.invalidate(after.id)
+
+    async def _on_guild_remove(self, guild):
+        self.invalidate(guild.id)
@@ -0,0 +1,193 @@
+"""
+Streaming purge engine for the /clear command.
+Walks channel history page by page and deletes matching messages in two lanes:
+bulk deletes for recent messages and rate-limited single deletes for old ones.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Discord rejects bulk deletes for messages older than 14 days; keep a small margin
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=1)
+BULK_DELETE_BATCH = 100
+
+
+def _bulk_cutoff() -> datetime:
+    """Messages created at or before this can no longer be bulk deleted."""
+    return datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE
+
+
+class PurgeFilter:
+    """Predicate deciding which messages a purge should delete."""
+
+    def __init__(self, author=None, pattern=None, has_attachment=None, bots_only=False):
+        self.author_id = author.id if author is not None else None
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.has_attachment = has_attachment
+        self.bots_only = bots_only
+
+    def __call__(self, message: discord.Message) -> bool:
+        if self.author_id is not None and message.author.id != self.author_id:
+            return False
+        if self.bots_only and not message.author.bot:
+            return False
+        if self.has_attachment is not None and bool(message.attachments) != self.has_attachment:
+            return False
+        if self.pattern is not None and not self.pattern.search(message.content):
+            return False
+        return True
+
+    def describe(self) -> str:
+        """Human readable summary of the active filters."""
+        parts = []
+        if self.author_id is not None:
+            parts.append(f"author <@{self.author_id}>")
+        if self.pattern is not None:
+            parts.append(f"matching `{self.pattern.pattern}`")
+        if self.has_attachment is not None:
+            parts.append("with attachments" if self.has_attachment else "without attachments")
+        if self.bots_only:
+            parts.append("from bots")
+        return ", ".join(parts) if parts else "none"
+
+
+class PurgeResult:
+    """Running counters for a purge."""
+
+    def __init__(self):
+        self.scanned = 0
+        self.bulk_deleted = 0
+        self.single_deleted = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    @property
+    def deleted(self) -> int:
+        return self.bulk_deleted + self.single_deleted
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+class PurgeEngine:
+    """Deletes up to ``amount`` matching messages from a channel.
+
+    History is streamed (discord.py fetches it in pages of 100). The old-message
+    queue is unbounded so the slow single lane never holds up the bulk lane; it
+    is bounded by ``amount`` and ``Config.PURGE_SCAN_LIMIT`` instead.
+    """
+
+    def __init__(self, channel, amount, check=None, before=None, after=None,
+                 reason=None, progress=None):
+        self.channel = channel
+        self.amount = amount
+        self.check = check or (lambda message: True)
+        self.before = discord.Object(id=before) if before else None
+        self.after = discord.Object(id=after) if after else None
+        self.reason = reason
+        self.progress = progress
+        self.result = PurgeResult()
+        self._single_queue = asyncio.Queue()
+        self._last_progress = 0.0
+
+    async def run(self) -> PurgeResult:
+        """Run the purge to completion and return its counters."""
+        single_lane = asyncio.create_task(self._single_delete_lane())
+        try:
+            await self._scan()
+        finally:
+            await self._single_queue.put(None)
+            await single_lane
+        await self._report(force=True)
+        return self.result
+
+    async def _scan(self):
+        """Stream history, feeding the bulk lane inline and old messages to the single lane."""
+        batch = []
+        matched = 0
+        cutoff = _bulk_cutoff()
+
+        async for message in self.channel.history(
+            limit=Config.PURGE_SCAN_LIMIT, before=self.before, after=self.after
+        ):
+            self.result.scanned += 1
+            if not self.check(message):
+                continue
+
+            if message.created_at > cutoff:
+                batch.append(message)
+                if len(batch) == BULK_DELETE_BATCH:
+                    await self._bulk_delete(batch)
+                    batch = []
+                    # A purge can run for minutes, so messages age past the limit as it goes
+                    cutoff = _bulk_cutoff()
+            else:
+                self._single_queue.put_nowait(message)
+
+            matched += 1
+            if matched >= self.amount:
+                break
+            await self._report()
+
+        if batch:
+            await self._bulk_delete(batch)
+
+    async def _bulk_delete(self, batch):
+        # One message older than the limit fails the whole request, so those go to the single lane
+        cutoff = _bulk_cutoff()
+        for message in batch:
+            if message.created_at <= cutoff:
+                self._single_queue.put_nowait(message)
+        batch = [message for message in batch if message.created_at > cutoff]
+        if not batch:
+            return
+        try:
+            await self.channel.delete_messages(batch, reason=self.reason)
+            self.result.bulk_deleted += len(batch)
+        except discord.NotFound:
+            # Someone else removed part of the batch; fall back to single deletes
+            for message in batch:
+                self._single_queue.put_nowait(message)
+        except discord.HTTPException as e:
+            self.result.failed += len(batch)
+            logger.error(f"Bulk delete failed in {self.channel}: {e}")
+        await self._report()
+
+    async def _single_delete_lane(self):
+        """Delete messages one at a time, spaced to stay under the per-route limit."""
+        while True:
+            message = await self._single_queue.get()
+            if message is None:
+                return
+            try:
+                await message.delete()
+                self.result.single_deleted += 1
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                self.result.failed += 1
+                logger.error(f"Single delete failed in {self.channel}: {e}")
+            await asyncio.sleep(Config.PURGE_SINGLE_DELETE_DELAY)
+
+    async def _report(self, force=False):
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < Config.PURGE_PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        try:
+            await self.progress(self.result, force)
+        except discord.HTTPException as e:
+            # The interaction token expires after 15 minutes; keep purging regardless
+            logger.warning(f"Purge progress update failed: {e}")
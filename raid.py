@@ -0,0 +1,341 @@
+"""
+Join-rate raid detection and automatic lockdown.
+Tracks each guild's joins in fixed-size ring buffers (all joins, and joins
+that look like throwaway accounts), so handling a join costs the same however
+fast members arrive. When a threshold is crossed the guild is locked down:
+its verification level is raised, new joins are timed out or kicked in
+batches and moderators are alerted.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+import mass_actions
+
+logger = logging.getLogger(__name__)
+
+NAME_KEY_LENGTH = 16
+
+
+def name_key(name: str) -> str:
+    """Letters of a name, folded: "Raider_0412", "raider 77" and "r.a.i.d.e.r" share "raider"."""
+    return ''.join(ch for ch in name.casefold() if ch.isalpha())[:NAME_KEY_LENGTH]
+
+
+class JoinWindow:
+    """Ring of the last ``limit`` join times; exceeded when ``limit + 1`` joins fall within ``seconds``."""
+
+    __slots__ = ('limit', 'seconds', 'times', 'members', 'head')
+
+    def __init__(self, limit, seconds):
+        self.limit = limit
+        self.seconds = seconds
+        self.times = [float('-inf')] * limit
+        self.members = [None] * limit
+        self.head = 0
+
+    def add(self, now, member) -> bool:
+        exceeded = now - self.times[self.head] < self.seconds
+        self.times[self.head] = now
+        self.members[self.head] = member
+        self.head = self.head + 1 if self.head + 1 < self.limit else 0
+        return exceeded
+
+    def recent(self, now) -> list:
+        """Members whose joins are still inside the window."""
+        return [member for t, member in zip(self.times, self.members) if now - t < self.seconds and member is not None]
+
+
+class GuildJoins:
+    """Join history for one guild."""
+
+    __slots__ = ('joins', 'suspicious', 'names', 'name_counts', 'last_join')
+
+    def __init__(self, join_rate, suspicious_rate, name_window):
+        self.joins = JoinWindow(*join_rate)
+        self.suspicious = JoinWindow(*suspicious_rate)
+        self.names = deque(maxlen=name_window)
+        self.name_counts = {}
+        self.last_join = 0.0
+
+
+class RaidDetector:
+    """Per-guild join-rate detector.
+
+    A join is suspicious when it scores at least ``suspicion_score`` of three
+    signals: an account younger than ``min_account_age``, no avatar, and a
+    name sharing its letters with ``similar_names`` or more of the last
+    ``name_window`` joins. ``join`` reports a trip when either all joins
+    exceed ``join_rate`` or suspicious joins exceed ``suspicious_rate``, each
+    ``(limit, seconds)``.
+    """
+
+    def __init__(self, join_rate, suspicious_rate, min_account_age, similar_names=3, suspicion_score=2,
+                 name_window=50, idle_after=3600):
+        self.join_rate = join_rate
+        self.suspicious_rate = suspicious_rate
+        self.min_account_age = min_account_age
+        self.similar_names = similar_names
+        self.suspicion_score = suspicion_score
+        self.name_window = name_window
+        self.idle_after = idle_after
+        self._guilds = {}
+        self._next_sweep = time.monotonic() + idle_after
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def signals(self, state, member) -> list:
+        """Names of the suspicious signals ``member`` shows; also records their name."""
+        found = []
+        if datetime.now(timezone.utc) - member.created_at < self.min_account_age:
+            found.append('new account')
+        if member.avatar is None:
+            found.append('no avatar')
+
+        key = name_key(member.name)
+        if len(state.names) == state.names.maxlen:
+            oldest = state.names[0]
+            if oldest:
+                state.name_counts[oldest] -= 1
+                if not state.name_counts[oldest]:
+                    del state.name_counts[oldest]
+        state.names.append(key)
+        if key:
+            state.name_counts[key] = count = state.name_counts.get(key, 0) + 1
+            if count >= self.similar_names:
+                found.append('similar names')
+        return found
+
+    def join(self, member, now=None):
+        """Record a join and return the reason a threshold was crossed, or None."""
+        if now is None:
+            now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        guild_id = member.guild.id
+        state = self._guilds.get(guild_id)
+        if state is None:
+            state = self._guilds[guild_id] = GuildJoins(self.join_rate, self.suspicious_rate, self.name_window)
+        state.last_join = now
+
+        reason = None
+        if state.joins.add(now, member):
+            reason = f"more than {self.join_rate[0]} joins in {self.join_rate[1]}s"
+        signals = self.signals(state, member)
+        if len(signals) >= self.suspicion_score and state.suspicious.add(now, member) and reason is None:
+            reason = f"more than {self.suspicious_rate[0]} suspicious joins in {self.suspicious_rate[1]}s ({', '.join(signals)})"
+        return reason
+
+    def recent(self, guild_id, now=None) -> list:
+        """Members who joined within the join-rate window, e.g. the ones that triggered a lockdown."""
+        state = self._guilds.get(guild_id)
+        if state is None:
+            return []
+        return state.joins.recent(time.monotonic() if now is None else now)
+
+    def sweep(self, now=None):
+        """Forget guilds with no joins for ``idle_after`` seconds."""
+        now = time.monotonic() if now is None else now
+        for guild_id in [g for g, state in self._guilds.items() if now - state.last_join > self.idle_after]:
+            del self._guilds[guild_id]
+        self._next_sweep = now + self.idle_after
+
+
+class Lockdown:
+    """State of one guild's lockdown."""
+
+    __slots__ = ('reason', 'started', 'ends_at', 'previous_level', 'pending', 'wakeup', 'task',
+                 'actioned', 'failed', 'manual')
+
+    def __init__(self, reason, ends_at, manual=False):
+        self.reason = reason
+        self.started = datetime.now()
+        self.ends_at = ends_at
+        self.previous_level = None
+        self.pending = []
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.actioned = 0
+        self.failed = 0
+        self.manual = manual
+
+
+class RaidGuard:
+    """Turns detector trips into lockdowns and works through the joins they catch.
+
+    ``on_member_join`` only appends to the lockdown's pending list; a task per
+    lockdown takes whatever has accumulated every ``batch_interval`` seconds
+    and runs it through the mass action scheduler. Automatic lockdowns end
+    ``duration`` seconds after the last join that kept the rate over the
+    threshold; manual ones last until ended.
+    """
+
+    def __init__(self, detector, case_store, mod_log, action='timeout', timeout_minutes=60,
+                 verification_level=discord.VerificationLevel.high, duration=600, batch_interval=1.0, colors=None):
+        if action not in ('timeout', 'kick'):
+            raise ValueError(f"Unknown raid action '{action}' (valid: timeout, kick)")
+        self.detector = detector
+        self.case_store = case_store
+        self.mod_log = mod_log
+        self.action = action
+        self.timeout_minutes = timeout_minutes
+        self.verification_level = verification_level
+        self.duration = duration
+        self.batch_interval = batch_interval
+        self.colors = colors or {}
+        self.lockdowns = {}
+
+    def member_join(self, member, detect=True):
+        """Feed one join to the detector; starts or extends a lockdown when it trips.
+
+        With ``detect`` off (raid detection disabled) a join is only queued on
+        the guild's active lockdown, e.g. a manual one.
+        """
+        if member.bot:
+            return
+        lockdown = self.lockdowns.get(member.guild.id)
+        if not detect:
+            if lockdown is not None:
+                lockdown.pending.append(member)
+                lockdown.wakeup.set()
+            return
+        now = time.monotonic()
+        reason = self.detector.join(member, now)
+        if lockdown is None:
+            if reason is None:
+                return
+            lockdown = self.start(member.guild, reason)
+            # The joins that tripped the detector are part of the raid too
+            lockdown.pending.extend(m for m in self.detector.recent(member.guild.id, now) if m is not member)
+        elif reason is not None and not lockdown.manual:
+            lockdown.ends_at = now + self.duration
+        lockdown.pending.append(member)
+        lockdown.wakeup.set()
+
+    def start(self, guild, reason, manual=False) -> Lockdown:
+        """Lock a guild down (or return its current lockdown)."""
+        lockdown = self.lockdowns.get(guild.id)
+        if lockdown is not None:
+            return lockdown
+        lockdown = self.lockdowns[guild.id] = Lockdown(
+            reason, float('inf') if manual else time.monotonic() + self.duration, manual
+        )
+        lockdown.task = asyncio.create_task(self._run(guild, lockdown))
+        logger.warning(f"Raid lockdown started in {guild.name}: {reason}")
+        return lockdown
+
+    def end(self, guild_id) -> bool:
+        """End a lockdown early; joins already queued are still actioned."""
+        lockdown = self.lockdowns.get(guild_id)
+        if lockdown is None:
+            return False
+        lockdown.ends_at = 0
+        lockdown.wakeup.set()
+        return True
+
+    async def _run(self, guild, lockdown):
+        try:
+            await self._raise_verification(guild, lockdown)
+            await self._alert(guild, discord.Embed(
+                title="🚨 Raid Lockdown",
+                description=(
+                    f"**Trigger:** {lockdown.reason}\n"
+                    f"**Action:** new members are {'kicked' if self.action == 'kick' else f'timed out for {self.timeout_minutes} minutes'}\n"
+                    f"**Verification:** {self.verification_level if lockdown.previous_level is not None else guild.verification_level}\n"
+                    f"Use `/lockdown end` to lift it."
+                ),
+                color=self.colors.get('ERROR'),
+                timestamp=datetime.now()
+            ))
+            while True:
+                remaining = lockdown.ends_at - time.monotonic()
+                if not lockdown.pending:
+                    if remaining <= 0:
+                        break
+                    lockdown.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(lockdown.wakeup.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        continue
+                # Let a batch build up before acting on it
+                await asyncio.sleep(self.batch_interval)
+                batch, lockdown.pending = lockdown.pending, []
+                await self._act(guild, batch, lockdown)
+        except Exception as e:
+            logger.error(f"Raid lockdown error in {guild.name}: {e}")
+        finally:
+            del self.lockdowns[guild.id]
+            await self._finish(guild, lockdown)
+
+    async def _raise_verification(self, guild, lockdown):
+        if guild.verification_level >= self.verification_level:
+            return
+        try:
+            lockdown.previous_level = guild.verification_level
+            await guild.edit(verification_level=self.verification_level, reason="Raid lockdown")
+        except discord.HTTPException as e:
+            lockdown.previous_level = None
+            logger.error(f"Could not raise verification level in {guild.name}: {e}")
+
+    async def _act(self, guild, batch, lockdown):
+        reason = f"Raid lockdown: {lockdown.reason}"
+        result = mass_actions.MassActionResult()
+        if self.action == 'kick':
+            await mass_actions.mass_kick(batch, reason, result)
+        else:
+            until = datetime.now().astimezone() + timedelta(minutes=self.timeout_minutes)
+            await mass_actions.mass_timeout(batch, until, reason, result)
+        lockdown.actioned += len(result.succeeded)
+        lockdown.failed += len(result.failed)
+
+        duration = self.timeout_minutes * 60 if self.action == 'timeout' else None
+        for user_id in result.succeeded:
+            self.case_store.record(guild.id, user_id, guild.me.id, self.action, reason, duration)
+        if result.succeeded:
+            mentions = ' '.join(f"<@{user_id}>" for user_id in result.succeeded[:50])
+            more = f" and {len(result.succeeded) - 50} more" if len(result.succeeded) > 50 else ""
+            await self.mod_log.log(guild.id, discord.Embed(
+                title=f"🚨 Raid: {'Kicked' if self.action == 'kick' else 'Timed Out'} {len(result.succeeded)} Members",
+                description=f"{mentions}{more}\n**Failed:** {len(result.failed)}",
+                color=self.colors.get('WARNING'),
+                timestamp=datetime.now()
+            ))
+        logger.info(f"Raid lockdown in {guild.name}: {self.action} {len(result.succeeded)} members ({len(result.failed)} failed)")
+
+    async def _finish(self, guild, lockdown):
+        level = guild.verification_level
+        if lockdown.previous_level is not None:
+            level = lockdown.previous_level
+            try:
+                await guild.edit(verification_level=lockdown.previous_level, reason="Raid lockdown ended")
+            except discord.HTTPException as e:
+                logger.error(f"Could not restore verification level in {guild.name}: {e}")
+        await self._alert(guild, discord.Embed(
+            title="✅ Raid Lockdown Ended",
+            description=(
+                f"**Members actioned:** {lockdown.actioned}\n"
+                f"**Failed:** {lockdown.failed}\n"
+                f"**Verification:** {level}"
+            ),
+            color=self.colors.get('SUCCESS'),
+            timestamp=datetime.now()
+        ))
+        logger.warning(f"Raid lockdown ended in {guild.name} ({lockdown.actioned} actioned, {lockdown.failed} failed)")
+
+    async def _alert(self, guild, embed):
+        """Post to the mod log, or the server's system channel when there is none."""
+        if await self.mod_log.log(guild.id, embed):
+            return
+        channel = guild.system_channel
+        if channel is None:
+            return
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            logger.error(f"Could not send raid alert in {guild.name}: {e}")
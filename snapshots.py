@@ -0,0 +1,184 @@
+"""
+Compact message snapshots for the delete and edit audit log.
+Keeps only what an audit entry needs (IDs, author, content and attachment
+URLs) in slotted objects, in one insertion-ordered dict per guild. Each guild
+has a byte budget, and snapshots older than the TTL are dropped; the send
+time comes from the message ID, so it is not stored.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+
+from discord.utils import DISCORD_EPOCH
+
+# Bytes the cache adds per snapshot beyond its strings: the slotted object with
+# its GC header, the message ID key and an OrderedDict entry with its link node
+ENTRY_OVERHEAD = 225
+
+
+def snowflake_seconds(snowflake: int) -> float:
+    """Unix time a Discord ID was created, without building a datetime."""
+    return ((snowflake >> 22) + DISCORD_EPOCH) / 1000
+
+
+class MessageSnapshot:
+    """What a message said when it was last seen."""
+
+    __slots__ = ('id', 'channel_id', 'author_id', 'author', 'content', 'attachments')
+
+    def __init__(self, message_id, channel_id, author_id, author, content, attachments=()):
+        self.id = message_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.author = author
+        self.content = content
+        self.attachments = attachments
+
+    @classmethod
+    def from_message(cls, message):
+        return cls(
+            message.id,
+            message.channel.id,
+            message.author.id,
+            str(message.author),
+            message.content,
+            tuple(attachment.url for attachment in message.attachments)
+        )
+
+    @classmethod
+    def from_data(cls, data):
+        """Build a snapshot from a raw message payload, e.g. a MESSAGE_UPDATE event's data."""
+        author = data['author']
+        name = author['username']
+        if author.get('discriminator', '0') != '0':
+            name = f"{name}#{author['discriminator']}"
+        return cls(
+            int(data['id']),
+            int(data['channel_id']),
+            int(author['id']),
+            name,
+            data.get('content', ''),
+            tuple(attachment['url'] for attachment in data.get('attachments', ()))
+        )
+
+    @property
+    def created(self) -> float:
+        return snowflake_seconds(self.id)
+
+    def size(self) -> int:
+        """Approximate bytes this snapshot holds in the cache."""
+        size = ENTRY_OVERHEAD + sys.getsizeof(self.content) + sys.getsizeof(self.author)
+        if self.attachments:
+            size += sys.getsizeof(self.attachments) + sum(sys.getsizeof(url) for url in self.attachments)
+        return size
+
+
+class GuildSnapshots:
+    __slots__ = ('messages', 'bytes')
+
+    def __init__(self):
+        self.messages = OrderedDict()
+        self.bytes = 0
+
+
+class SnapshotCache:
+    """Per-guild message snapshots, bounded by ``guild_budget`` bytes and ``ttl`` seconds.
+
+    Messages arrive in about ID order, so the oldest snapshot is first in its
+    guild's dict and both limits evict from the front. Expiry is checked when
+    a guild adds a message and by ``expire`` for guilds that went quiet.
+    """
+
+    def __init__(self, guild_budget, ttl, expire_interval=300):
+        self.guild_budget = guild_budget
+        self.ttl = ttl
+        self.expire_interval = expire_interval
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._guilds = {}
+        self._next_expire = time.monotonic() + expire_interval
+
+    def __len__(self):
+        return sum(len(guild.messages) for guild in self._guilds.values())
+
+    @property
+    def bytes(self) -> int:
+        return sum(guild.bytes for guild in self._guilds.values())
+
+    def add(self, guild_id, snapshot: MessageSnapshot, now=None):
+        now = time.time() if now is None else now
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = GuildSnapshots()
+        size = snapshot.size()
+        if size > self.guild_budget or snapshot.created < now - self.ttl:
+            return
+        old = guild.messages.pop(snapshot.id, None)
+        if old is not None:
+            guild.bytes -= old.size()
+        guild.messages[snapshot.id] = snapshot
+        guild.bytes += size
+        self._trim(guild, now)
+        if time.monotonic() >= self._next_expire:
+            self.expire(now)
+
+    def _trim(self, guild, now):
+        messages = guild.messages
+        oldest = now - self.ttl
+        while messages:
+            message_id, snapshot = next(iter(messages.items()))
+            if guild.bytes <= self.guild_budget and snowflake_seconds(message_id) >= oldest:
+                break
+            del messages[message_id]
+            guild.bytes -= snapshot.size()
+            self.evicted += 1
+
+    def get(self, guild_id, message_id):
+        guild = self._guilds.get(guild_id)
+        snapshot = guild.messages.get(message_id) if guild is not None else None
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return snapshot
+
+    def pop(self, guild_id, message_id):
+        """Remove and return a deleted message's snapshot, or None if it was never seen or has aged out."""
+        guild = self._guilds.get(guild_id)
+        snapshot = guild.messages.pop(message_id, None) if guild is not None else None
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        guild.bytes -= snapshot.size()
+        return snapshot
+
+    def pop_many(self, guild_id, message_ids) -> list:
+        """Snapshots of a bulk delete that are still cached, oldest first."""
+        snapshots = [self.pop(guild_id, message_id) for message_id in sorted(message_ids)]
+        return [snapshot for snapshot in snapshots if snapshot is not None]
+
+    def edit(self, guild_id, message_id, content):
+        """Record an edit; return the previous content, or None if the message is not cached."""
+        guild = self._guilds.get(guild_id)
+        snapshot = guild.messages.get(message_id) if guild is not None else None
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        before = snapshot.content
+        guild.bytes -= snapshot.size()
+        snapshot.content = content
+        guild.bytes += snapshot.size()
+        return before
+
+    def expire(self, now=None):
+        """Drop expired snapshots in every guild, and guilds left empty."""
+        now = time.time() if now is None else now
+        for guild_id, guild in list(self._guilds.items()):
+            self._trim(guild, now)
+            if not guild.messages:
+                del self._guilds[guild_id]
+        self._next_expire = time.monotonic() + self.expire_interval
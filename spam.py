@@ -0,0 +1,121 @@
+"""
+Sliding-window flood and spam detection.
+Keeps a small ring buffer of timestamps per (guild, user) and counter type, so
+checking a message costs O(1) and memory is bounded by an LRU of tracked users.
+"""
+
+import re
+import time
+from array import array
+from collections import OrderedDict
+
+URL_RE = re.compile(r'https?://\S+', re.IGNORECASE)
+
+# Counter order inside a tracked entry's timestamp array
+COUNTERS = ('messages', 'mentions', 'links', 'attachments')
+
+
+class SpamEntry:
+    """Counters for one member.
+
+    All counters share one flat array of timestamps; counter ``i`` owns a ring of
+    ``limit_i`` slots starting at its offset, and ``heads[i]`` is its next slot.
+    The window is exceeded when the slot about to be overwritten (the event
+    ``limit`` events ago) is less than ``seconds`` old.
+    """
+
+    __slots__ = ('times', 'heads', 'last_seen')
+
+    def __init__(self, template, now):
+        self.times = array('d', template)
+        self.heads = [0] * len(COUNTERS)
+        self.last_seen = now
+
+
+class SpamDetector:
+    """Per-(guild, user) flood detector with LRU and idle-time eviction.
+
+    ``thresholds`` maps each counter name to ``(limit, seconds)``: more than
+    ``limit`` events within ``seconds`` trips the detector.
+    """
+
+    def __init__(self, thresholds, max_tracked=50000):
+        self.thresholds = thresholds
+        self.max_tracked = max_tracked
+        self.ttl = max(seconds for _, seconds in thresholds.values())
+        self._layout = []
+        offset = 0
+        for name in COUNTERS:
+            limit, seconds = thresholds[name]
+            self._layout.append((offset, limit, seconds))
+            offset += limit
+        self._template = array('d', [float('-inf')]) * offset
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, guild_id, user_id, mentions=0, links=0, attachments=0, now=None):
+        """Record one message and return the name of the tripped counter, if any."""
+        if now is None:
+            now = time.monotonic()
+        key = (guild_id, user_id)
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None:
+            self._evict(now)
+            entry = entries[key] = SpamEntry(self._template, now)
+        else:
+            entries.move_to_end(key)
+            entry.last_seen = now
+
+        tripped = None
+        if self._add(entry, 0, now, 1):
+            tripped = 'messages'
+        # Most messages carry no mentions, links or attachments
+        if mentions and self._add(entry, 1, now, mentions) and tripped is None:
+            tripped = 'mentions'
+        if links and self._add(entry, 2, now, links) and tripped is None:
+            tripped = 'links'
+        if attachments and self._add(entry, 3, now, attachments) and tripped is None:
+            tripped = 'attachments'
+        return tripped
+
+    def _add(self, entry, slot, now, count):
+        offset, size, seconds = self._layout[slot]
+        times = entry.times
+        head = entry.heads[slot]
+        exceeded = False
+        # A single message can carry many mentions; more than ``size`` adds nothing new
+        for _ in range(min(count, size)):
+            if now - times[offset + head] < seconds:
+                exceeded = True
+            times[offset + head] = now
+            head = head + 1 if head + 1 < size else 0
+        entry.heads[slot] = head
+        return exceeded
+
+    def record_message(self, message, now=None):
+        """Record a discord.py message and return the tripped counter, if any."""
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + (5 if message.mention_everyone else 0)
+        return self.record(
+            message.guild.id,
+            message.author.id,
+            mentions=mentions,
+            links=len(URL_RE.findall(message.content)),
+            attachments=len(message.attachments),
+            now=now
+        )
+
+    def reset(self, guild_id, user_id):
+        """Forget a member's counters, e.g. after they have been actioned."""
+        self._entries.pop((guild_id, user_id), None)
+
+    def _evict(self, now):
+        """Drop idle entries from the LRU end and make room for one more entry."""
+        entries = self._entries
+        while entries:
+            key, oldest = next(iter(entries.items()))
+            if now - oldest.last_seen <= self.ttl and len(entries) < self.max_tracked:
+                break
+            del entries[key]
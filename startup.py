@@ -0,0 +1,38 @@
+"""
+Startup phase timing.
+Records how long each stage of bringing the bot online takes and logs it.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """Named checkpoints measured from process start."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.details = []
+
+    def mark(self, phase: str):
+        """Close the current phase under ``phase`` and log its duration."""
+        now = time.perf_counter()
+        duration = now - self.last
+        self.last = now
+        self.phases.append((phase, duration))
+        logger.info(f"Startup: {phase} took {duration * 1000:.0f}ms ({(now - self.started) * 1000:.0f}ms total)")
+
+    def record(self, name: str, duration: float):
+        """Log a step inside the current phase, e.g. one of several extensions loading concurrently."""
+        self.details.append((name, duration))
+        logger.info(f"Startup: {name} took {duration * 1000:.0f}ms")
+
+    def summary(self) -> str:
+        return ", ".join(f"{phase}={duration * 1000:.0f}ms" for phase, duration in self.phases)
+
+
+profile = StartupProfile()
@@ -0,0 +1,95 @@
+"""
+Incrementally maintained guild statistics.
+Counters are built from the cache when a guild becomes available or finishes
+chunking and are then kept current from gateway events, so /serverinfo never
+has to walk the member list.
+"""
+
+import discord
+
+
+class GuildStats:
+    """Precomputed counters for one guild."""
+
+    __slots__ = ('online', 'text_channels', 'voice_channels', 'roles', 'emojis')
+
+    def __init__(self, guild: discord.Guild):
+        self.online = sum(1 for m in guild.members if m.status != discord.Status.offline)
+        self.text_channels = len(guild.text_channels)
+        self.voice_channels = len(guild.voice_channels)
+        self.roles = len(guild.roles)
+        self.emojis = len(guild.emojis)
+
+    def channel_delta(self, channel, delta):
+        if isinstance(channel, discord.TextChannel):
+            self.text_channels += delta
+        elif isinstance(channel, discord.VoiceChannel):
+            self.voice_channels += delta
+
+
+class StatsTracker:
+    """Per-guild statistics, rebuilt from guild events and updated incrementally.
+
+    ``get`` only builds counters itself for a guild that arrived before the
+    tracker existed; events for guilds without counters are ignored.
+    """
+
+    def __init__(self):
+        self._stats = {}
+
+    def get(self, guild: discord.Guild) -> GuildStats:
+        stats = self._stats.get(guild.id)
+        if stats is None:
+            stats = self.rebuild(guild)
+        return stats
+
+    def rebuild(self, guild: discord.Guild) -> GuildStats:
+        """Recount a guild from the cache."""
+        stats = self._stats[guild.id] = GuildStats(guild)
+        return stats
+
+    def invalidate(self, guild_id=None):
+        """Forget one guild's counters, or every guild's when no ID is given."""
+        if guild_id is None:
+            self._stats.clear()
+        else:
+            self._stats.pop(guild_id, None)
+
+    def member_join(self, member):
+        stats = self._stats.get(member.guild.id)
+        if stats is not None and member.status != discord.Status.offline:
+            stats.online += 1
+
+    def member_remove(self, member):
+        stats = self._stats.get(member.guild.id)
+        if stats is not None and member.status != discord.Status.offline:
+            stats.online -= 1
+
+    def presence_update(self, before, after):
+        stats = self._stats.get(after.guild.id)
+        if stats is None:
+            return
+        was_online = before.status != discord.Status.offline
+        is_online = after.status != discord.Status.offline
+        if was_online != is_online:
+            stats.online += 1 if is_online else -1
+
+    def channel_create(self, channel):
+        stats = self._stats.get(channel.guild.id)
+        if stats is not None:
+            stats.channel_delta(channel, 1)
+
+    def channel_delete(self, channel):
+        stats = self._stats.get(channel.guild.id)
+        if stats is not None:
+            stats.channel_delta(channel, -1)
+
+    def role_delta(self, role, delta):
+        stats = self._stats.get(role.guild.id)
+        if stats is not None:
+            stats.roles += delta
+
+    def emojis_update(self, guild, emojis):
+        stats = self._stats.get(guild.id)
+        if stats is not None:
+            stats.emojis = len(emojis)